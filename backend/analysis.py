@@ -1,14 +1,18 @@
 import sys
 import os
+import io
 import traceback
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
 
 # Add the parent directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import RAW_DATA_DIR, VISUALIZATION_DIR  # Ensure these paths are correctly defined in config.py
+from config import VISUALIZATION_DIR  # Ensure these paths are correctly defined in config.py
+from backend.checkpoints import atomic_write
+from backend.dataset_registry import get_dataset
+from backend.mentions import reddit_mention_counter
 
 def normalize(series):
     """
@@ -19,44 +23,80 @@ def normalize(series):
         return series
     return (series - series.min()) / (series.max() - series.min())
 
-def get_trending_coins():
+def reddit_mention_counts(df_geo):
     """
-    Loads CoinGecko data and Reddit posts data to compute a composite score for each coin.
+    Return a frame of `id` / reddit_count with how many Reddit posts mention each coin,
+    as extracted by backend/mentions.py. Falls back to counting posts per search keyword
+    (matched on the coin name) when no mention counts have been extracted yet.
+    """
+    try:
+        mentions = get_dataset("mentions")
+        reddit = mentions[mentions["source"] == "reddit"]
+        counts = reddit.groupby("asset_id", observed=True)["mentions"].sum()
+        return counts.rename("reddit_count").rename_axis("id").reset_index()
+    except FileNotFoundError:
+        print("No mention counts found; counting Reddit posts per search keyword instead.")
+
+    df_reddit = get_dataset("reddit")
+    keyword_lower = df_reddit["keyword"].astype(str).str.lower().str.strip().rename("keyword_lower")
+    # Count Reddit posts per keyword
+    reddit_counts = keyword_lower.groupby(keyword_lower).size().reset_index(name="reddit_count")
+    names = pd.DataFrame({"id": df_geo["id"], "keyword_lower": df_geo["name"].str.lower().str.strip()})
+    return names.merge(reddit_counts, on="keyword_lower")[["id", "reddit_count"]]
+
+def get_top_mentioned(k=10, counter=None):
+    """
+    Returns the `k` coins most mentioned on Reddit within the current sliding window,
+    with estimated mention counts and unique authors. The ranking is served from the
+    streaming counter's cached top-k, so repeated calls do not rescan any posts.
+    """
+    counter = counter or reddit_mention_counter()
+    top = counter.top(k)
+    return pd.DataFrame({
+        "id": [asset for asset, _ in top],
+        "mentions": [count for _, count in top],
+        "unique_authors": [counter.unique_authors(asset) for asset, _ in top],
+    })
+
+def window_mention_counts(counter):
+    """Returns a frame of `id` / reddit_count / reddit_authors for every heavy hitter in the counter's window."""
+    top = get_top_mentioned(counter.settings["heavy_hitters"], counter)
+    return top.rename(columns={"mentions": "reddit_count", "unique_authors": "reddit_authors"})
+
+def get_trending_coins(top_n=5, counter=None):
+    """
+    Loads CoinGecko data and Reddit mention counts to compute a composite score for each coin.
     The composite score is defined as the sum of the normalized 24h price change percentage
-    and normalized Reddit post count.
+    and normalized number of Reddit posts mentioning the coin.
     
-    Returns the top 5 coins ranked by composite score.
+    Returns the top `top_n` coins ranked by composite score (all of them if `top_n` is None).
+    When a SlidingMentionCounter is passed as `counter`, the Reddit counts are the
+    approximate mentions within its current window instead of the full history.
     """
-    # Load CoinGecko market data
-    coingecko_path = os.path.join(RAW_DATA_DIR, "coingecko_prices.csv")
+    # Load the validated CoinGecko market data (shared registry copy; do not modify in place)
     try:
-        df_geo = pd.read_csv(coingecko_path)
+        df_geo = get_dataset("coingecko")
     except Exception as e:
-        print(f"Error loading {coingecko_path}: {e}")
+        print(f"Error loading CoinGecko data: {e}")
         return None
 
     # Drop rows missing a valid 24h price change and keep only coins with positive changes
     df_geo = df_geo.dropna(subset=["price_change_percentage_24h"])
-    df_geo = df_geo[df_geo["price_change_percentage_24h"] > 0].copy()
-    # Normalize coin names: lower-case and remove extraneous whitespace
-    df_geo["name_lower"] = df_geo["name"].str.lower().str.strip()
+    df_geo = df_geo[df_geo["price_change_percentage_24h"] > 0]
 
-    # Load Reddit posts data
-    reddit_path = os.path.join(RAW_DATA_DIR, "reddit_posts.csv")
+    # Count the Reddit posts mentioning each coin
     try:
-        df_reddit = pd.read_csv(reddit_path)
+        reddit_counts = reddit_mention_counts(df_geo) if counter is None else window_mention_counts(counter)
     except Exception as e:
-        print(f"Error loading {reddit_path}: {e}")
+        print(f"Error loading Reddit data: {e}")
         return None
 
-    df_reddit["keyword_lower"] = df_reddit["keyword"].str.lower().str.strip()
-    # Count Reddit posts per keyword
-    reddit_counts = df_reddit.groupby("keyword_lower").size().reset_index(name="reddit_count")
-
-    # Merge market data with Reddit counts on the normalized coin name / keyword
-    df_merged = pd.merge(df_geo, reddit_counts, how="left", left_on="name_lower", right_on="keyword_lower")
-    # Convert reddit_count to numeric and fill missing counts with 0
-    df_merged["reddit_count"] = pd.to_numeric(df_merged["reddit_count"], errors="coerce").fillna(0)
+    # Merge market data with Reddit counts on the CoinGecko coin id
+    df_merged = pd.merge(df_geo, reddit_counts, how="left", on="id")
+    # Coins without any Reddit posts get a count of 0
+    df_merged["reddit_count"] = df_merged["reddit_count"].fillna(0)
+    if "reddit_authors" in df_merged.columns:
+        df_merged["reddit_authors"] = df_merged["reddit_authors"].fillna(0)
 
     # Normalize the key metrics
     df_merged["norm_price_change"] = normalize(df_merged["price_change_percentage_24h"])
@@ -65,12 +105,62 @@ def get_trending_coins():
     # Calculate the composite score as the sum of the normalized price change and Reddit count
     df_merged["composite_score"] = df_merged["norm_price_change"] + df_merged["norm_reddit_count"]
 
-    # Sort by composite score (highest first) and take the top 5 coins
+    # Sort by composite score (highest first) and take the top coins
     df_sorted = df_merged.sort_values("composite_score", ascending=False)
-    trending_coins = df_sorted.head(5)
+    trending_coins = df_sorted if top_n is None else df_sorted.head(top_n)
 
     return trending_coins
 
+def trending_bar_figure(trending_coins):
+    """Bar plot of the composite scores of the trending coins."""
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    # Sort so that the coin with the lowest composite score appears at the bottom
+    trending_sorted = trending_coins.sort_values("composite_score", ascending=True)
+    # Use the "name" column as both y and hue (required by Seaborn) and then remove the legend.
+    sns.barplot(x="composite_score", y="name", data=trending_sorted,
+                hue="name", palette="viridis", dodge=False, ax=ax)
+    legend = ax.get_legend()
+    if legend is not None:
+        legend.remove()
+    ax.set_xlabel("Composite Score")
+    ax.set_ylabel("Coin")
+    ax.set_title("Trending Coins by Composite Score")
+    fig.tight_layout()
+    return fig
+
+def trending_pie_figure(trending_coins):
+    """Pie chart of the Reddit post distribution among the trending coins, or None if there are no posts."""
+    if trending_coins["reddit_count"].sum() <= 0:
+        return None
+    fig = Figure(figsize=(8, 8))
+    ax = fig.subplots()
+    ax.pie(trending_coins["reddit_count"],
+           labels=trending_coins["name"],
+           autopct="%1.1f%%",
+           startangle=140)
+    ax.set_title("Reddit Post Distribution among Trending Coins")
+    fig.tight_layout()
+    return fig
+
+def figure_png(fig):
+    """Render a Figure to PNG bytes."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    return buffer.getvalue()
+
+def render_trending_charts(trending_coins):
+    """
+    Render the trending charts to PNG bytes, keyed by file name. Figures are built with
+    the object-oriented Figure API rather than pyplot's global state, so several threads
+    can render at the same time.
+    """
+    charts = {"trending_coins_bar.png": figure_png(trending_bar_figure(trending_coins))}
+    pie = trending_pie_figure(trending_coins)
+    if pie is not None:
+        charts["trending_coins_reddit_pie.png"] = figure_png(pie)
+    return charts
+
 def create_trending_visualizations(trending_coins):
     """
     Creates two visualizations and saves them to VISUALIZATION_DIR:
@@ -83,22 +173,9 @@ def create_trending_visualizations(trending_coins):
 
     # Visualization 1: Bar plot for composite scores
     try:
-        plt.figure(figsize=(10, 6))
-        # Sort so that the coin with the lowest composite score appears at the bottom
-        trending_sorted = trending_coins.sort_values("composite_score", ascending=True)
-        # Use the "name" column as both y and hue (required by Seaborn) and then remove the legend.
-        ax = sns.barplot(x="composite_score", y="name", data=trending_sorted,
-                         hue="name", palette="viridis", dodge=False)
-        legend = ax.get_legend()
-        if legend is not None:
-            legend.remove()
-        plt.xlabel("Composite Score")
-        plt.ylabel("Coin")
-        plt.title("Trending Coins by Composite Score")
-        plt.tight_layout()
         bar_plot_path = os.path.join(VISUALIZATION_DIR, "trending_coins_bar.png")
-        plt.savefig(bar_plot_path)
-        plt.close()
+        with atomic_write(bar_plot_path, "wb") as f:
+            f.write(figure_png(trending_bar_figure(trending_coins)))
         print(f"Trending coins bar plot saved to: {bar_plot_path}")
     except Exception as e:
         print("Error creating bar plot visualization:")
@@ -106,32 +183,31 @@ def create_trending_visualizations(trending_coins):
 
     # Visualization 2: Pie chart for Reddit post distribution
     try:
-        # Ensure no NaN values remain
-        trending_coins["reddit_count"] = pd.to_numeric(trending_coins["reddit_count"], errors="coerce").fillna(0)
-        total_reddit = trending_coins["reddit_count"].sum()
-        if total_reddit <= 0:
+        pie = trending_pie_figure(trending_coins)
+        if pie is None:
             print("Warning: Sum of reddit_count values is zero. Skipping pie chart visualization.")
         else:
-            plt.figure(figsize=(8, 8))
-            plt.pie(trending_coins["reddit_count"],
-                    labels=trending_coins["name"],
-                    autopct="%1.1f%%",
-                    startangle=140)
-            plt.title("Reddit Post Distribution among Trending Coins")
-            plt.tight_layout()
             pie_chart_path = os.path.join(VISUALIZATION_DIR, "trending_coins_reddit_pie.png")
-            plt.savefig(pie_chart_path)
-            plt.close()
+            with atomic_write(pie_chart_path, "wb") as f:
+                f.write(figure_png(pie))
             print(f"Trending coins Reddit distribution pie chart saved to: {pie_chart_path}")
     except Exception as e:
         print("Error creating pie chart visualization:")
         print(traceback.format_exc())
 
-if __name__ == "__main__":
+def main():
+    """
+    Computes the trending coins and renders their visualizations.
+    Returns False when there is no trending coins data.
+    """
     trending_coins = get_trending_coins()
     if trending_coins is not None and not trending_coins.empty:
         print("Trending coins data collected:")
         print(trending_coins[['name', 'price_change_percentage_24h', 'reddit_count', 'composite_score']])
         create_trending_visualizations(trending_coins)
-    else:
-        print("No trending coins data available.")
\ No newline at end of file
+        return True
+    print("No trending coins data available.")
+    return False
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
\ No newline at end of file
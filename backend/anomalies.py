@@ -0,0 +1,234 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import time
+import logging
+import threading
+from collections import deque
+import numpy as np
+import pandas as pd
+from config import ANOMALY_SETTINGS
+
+logger = logging.getLogger("cryptotrend.anomalies")
+
+# Scale factor turning a mean absolute deviation into a standard deviation for normal data.
+MAD_TO_STD = 1.2533
+
+
+def to_timestamp(value):
+    """UTC Timestamp from epoch seconds, a datetime-like value or None (now)."""
+    if value is None:
+        value = time.time()
+    if isinstance(value, (int, float)):
+        return pd.Timestamp(value, unit="s", tz="UTC")
+    value = pd.Timestamp(value)
+    return value.tz_localize("UTC") if value.tzinfo is None else value.tz_convert("UTC")
+
+
+class StreamDetector:
+    """
+    Online per-asset spike detector for one metric.
+
+    Every asset keeps an exponentially weighted mean and variance (for a classic z-score)
+    and a Huber-style robust location and mean absolute deviation (for a robust z-score
+    that a single earlier spike does not inflate). State lives in NumPy arrays indexed by
+    asset, so update() costs O(1) per observation and a whole snapshot of hundreds of
+    assets is processed with a handful of vector operations.
+
+    `transform` turns raw values into the series that is tested: None uses the values as
+    they are, "log" their logarithm (volumes) and "log_return" the log change since the
+    asset's previous observation (prices). `min_scale` floors the robust standard
+    deviation, so that near-constant series (stablecoins, rarely mentioned coins) do not
+    alert on tiny moves.
+    """
+
+    def __init__(self, metric, alpha=0.05, threshold=4.0, warmup=30, transform=None, min_scale=0.0):
+        self.metric = metric
+        self.min_scale = min_scale
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.transform = transform
+        self.index = {}
+        self.assets = []
+        size = 64
+        self.count = np.zeros(size, dtype=np.int64)
+        self.mean = np.zeros(size)
+        self.var = np.zeros(size)
+        self.location = np.zeros(size)
+        self.mad = np.zeros(size)
+        self.last_raw = np.full(size, np.nan)
+
+    def positions(self, keys):
+        """Map asset keys to state positions, growing the state arrays for new assets."""
+        positions = np.empty(len(keys), dtype=np.int64)
+        for i, key in enumerate(keys):
+            position = self.index.get(key)
+            if position is None:
+                position = self.index[key] = len(self.assets)
+                self.assets.append(key)
+            positions[i] = position
+        if len(self.assets) > len(self.count):
+            grow = max(len(self.assets), 2 * len(self.count)) - len(self.count)
+            self.count = np.concatenate([self.count, np.zeros(grow, dtype=np.int64)])
+            for name in ("mean", "var", "location", "mad"):
+                setattr(self, name, np.concatenate([getattr(self, name), np.zeros(grow)]))
+            self.last_raw = np.concatenate([self.last_raw, np.full(grow, np.nan)])
+        return positions
+
+    def prepare(self, positions, raw):
+        if self.transform == "log_return":
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = np.log(raw / self.last_raw[positions])
+            self.last_raw[positions] = np.where(raw > 0, raw, np.nan)
+            return values
+        if self.transform == "log":
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return np.where(raw > 0, np.log(raw), np.nan)
+        return raw
+
+    def update(self, keys, values, timestamp=None):
+        """
+        Feed one observation per key and return the alerts (dicts) raised by the values
+        that deviate more than `threshold` robust standard deviations from their history.
+        """
+        keys = list(keys)
+        raw = np.asarray(values, dtype=float)
+        if not keys:
+            return []
+        positions = self.positions(keys)
+        x = self.prepare(positions, raw)
+        valid = np.isfinite(x)
+        positions, x, raw = positions[valid], x[valid], raw[valid]
+        keys = [key for key, ok in zip(keys, valid) if ok]
+
+        count = self.count[positions]
+        first = count == 0
+        mean, var = self.mean[positions], self.var[positions]
+        location, mad = self.location[positions], self.mad[positions]
+
+        # Score against the state before this observation.
+        deviation = x - mean
+        robust_deviation = x - location
+        with np.errstate(divide="ignore", invalid="ignore"):
+            zscore = np.where(var > 0, deviation / np.sqrt(var), 0.0)
+            scale = np.maximum(MAD_TO_STD * mad, self.min_scale)
+            robust_z = np.where(scale > 0, robust_deviation / scale, 0.0)
+
+        a = self.alpha
+        new_mean = mean + a * deviation
+        new_var = (1 - a) * (var + a * deviation ** 2)
+        # Past the warm-up, clip the step so that one outlier barely moves the robust state.
+        limit = np.where(count >= self.warmup, self.threshold * scale, np.inf)
+        clipped = np.clip(robust_deviation, -limit, limit)
+        new_location = location + a * clipped
+        new_mad = mad + a * (np.abs(clipped) - mad)
+
+        self.mean[positions] = np.where(first, x, new_mean)
+        self.var[positions] = np.where(first, 0.0, new_var)
+        self.location[positions] = np.where(first, x, new_location)
+        self.mad[positions] = np.where(first, 0.0, new_mad)
+        self.count[positions] = count + 1
+
+        flagged = np.flatnonzero((count >= self.warmup) & (np.abs(robust_z) >= self.threshold))
+        if not len(flagged):
+            return []
+        when = to_timestamp(timestamp).isoformat()
+        return [{
+            "time": when,
+            "metric": self.metric,
+            "asset": keys[i],
+            "value": float(raw[i]),
+            "robust_z": round(float(robust_z[i]), 2),
+            "zscore": round(float(zscore[i]), 2),
+            "direction": "spike" if robust_z[i] > 0 else "drop",
+        } for i in flagged]
+
+
+# Metric name -> (transform applied before scoring, minimum robust standard deviation).
+# Price moves below 0.1% and mention bursts of a single post are never alerted on.
+METRICS = {
+    "binance_price": ("log_return", 0.001),
+    "coingecko_price": ("log_return", 0.001),
+    "coingecko_volume": ("log", 0.01),
+    "reddit_mentions": (None, 1.0),
+    "news_mentions": (None, 1.0),
+}
+
+
+class AnomalyMonitor:
+    """
+    Runs one StreamDetector per metric, writes every alert to the anomalies logger and
+    keeps the most recent `max_alerts` of them in memory for the web UI.
+
+    Attach it to a LivePriceFeed with `feed.add_listener(monitor.on_snapshot)` to check
+    every poll of the live prices and volumes.
+    """
+
+    def __init__(self, settings=ANOMALY_SETTINGS, max_alerts=500):
+        self.detectors = {metric: StreamDetector(metric, settings["alpha"], settings["threshold"],
+                                                 settings["warmup"], transform, min_scale)
+                          for metric, (transform, min_scale) in METRICS.items()}
+        self.alerts = deque(maxlen=max_alerts)
+        self.lock = threading.Lock()
+        # Metric -> newest mention bucket fed so far.
+        self.mention_buckets = {}
+
+    def observe(self, metric, values, timestamp=None):
+        """Feed a {asset: value} snapshot of `metric` and return the alerts it raised."""
+        with self.lock:
+            alerts = self.detectors[metric].update(values.keys(), list(values.values()), timestamp)
+            self.alerts.extend(alerts)
+        for alert in alerts:
+            logger.warning("%s %s of %s: %s (robust z %.1f)", alert["metric"], alert["direction"],
+                           alert["asset"], alert["value"], alert["robust_z"])
+        return alerts
+
+    def on_snapshot(self, source, snapshot, timestamp=None):
+        """LivePriceFeed listener: check the prices (and CoinGecko volumes) of a new poll."""
+        if source == "binance":
+            self.observe("binance_price", snapshot, timestamp)
+        elif source == "coingecko":
+            self.observe("coingecko_price", {coin: fields.get("current_price") for coin, fields in snapshot.items()
+                                             if fields.get("current_price") is not None}, timestamp)
+            self.observe("coingecko_volume", {coin: fields.get("total_volume") for coin, fields in snapshot.items()
+                                              if fields.get("total_volume") is not None}, timestamp)
+
+    def observe_mentions(self, counts):
+        """
+        Feed mention counts (bucket, asset_id, source, mentions rows) bucket by bucket.
+        Assets already seen that have no row in a bucket count as zero mentions there.
+
+        Call it again whenever the counts are re-extracted: only buckets newer than the
+        last one fed are observed. The newest bucket of each source is held back until a
+        later one appears, because it may still be filling up.
+        """
+        raised = []
+        for source, rows in counts.groupby("source", observed=True):
+            metric = f"{source}_mentions"
+            if metric not in self.detectors:
+                continue
+            table = rows.pivot_table(index="bucket", columns="asset_id", values="mentions",
+                                     aggfunc="sum", fill_value=0, observed=True).sort_index()
+            last = self.mention_buckets.get(metric)
+            complete = table.iloc[:-1]
+            if last is not None:
+                complete = complete[complete.index > last]
+            if complete.empty:
+                continue
+            assets = [str(asset) for asset in complete.columns]
+            for bucket, row in zip(complete.index, complete.to_numpy(dtype=float)):
+                raised.extend(self.observe(metric, dict(zip(assets, row)), bucket))
+            self.mention_buckets[metric] = complete.index[-1]
+        return raised
+
+    def recent(self, limit=100):
+        """Return up to `limit` most recent alerts, newest first."""
+        with self.lock:
+            return list(self.alerts)[::-1][:limit]
+
+
+# Process-wide monitor shared by the live feed listener and the web UI.
+monitor = AnomalyMonitor()
@@ -0,0 +1,244 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import itertools
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import config
+from backend.checkpoints import write_csv
+from backend.dataset_registry import get_dataset
+
+
+class MarketHistory:
+    """
+    Replayable market snapshots as aligned T x N matrices: `times` holds the T snapshot
+    times (datetime64[ns], ascending), `assets` the N CoinGecko ids, and `price` /
+    `change` the price and 24h change percentage of every asset at every snapshot
+    (NaN where an asset was not in that snapshot).
+    """
+
+    def __init__(self, times, assets, price, change):
+        self.times = times
+        self.assets = assets
+        self.price = price
+        self.change = change
+
+
+def load_history(path=None):
+    """
+    Load the snapshot history appended by collect_coingecko.py into a MarketHistory.
+    """
+    path = path or os.path.join(config.HISTORY_DIR, "coingecko_history.csv")
+    df = pd.read_csv(path, usecols=["snapshot_time", "id", "current_price", "price_change_percentage_24h"])
+    df["snapshot_time"] = pd.to_datetime(df["snapshot_time"], utc=True, format="ISO8601")
+    df = df.dropna(subset=["snapshot_time", "id"]).drop_duplicates(subset=["snapshot_time", "id"], keep="last")
+    # One pivot for the whole history instead of a merge per snapshot.
+    times, time_index = np.unique(df["snapshot_time"].to_numpy(dtype="datetime64[ns]"), return_inverse=True)
+    assets, asset_index = np.unique(df["id"].astype(str).to_numpy(), return_inverse=True)
+    price = np.full((len(times), len(assets)), np.nan)
+    change = np.full((len(times), len(assets)), np.nan)
+    price[time_index, asset_index] = pd.to_numeric(df["current_price"], errors="coerce").to_numpy(dtype=float)
+    change[time_index, asset_index] = pd.to_numeric(df["price_change_percentage_24h"], errors="coerce").to_numpy(dtype=float)
+    return MarketHistory(times, list(assets), price, change)
+
+
+def social_matrix(history, mentions, window=pd.Timedelta(days=1)):
+    """
+    Return a T x N matrix with the mentions of each asset in the `window` before each
+    snapshot. Only buckets that ended by the snapshot time count, so the score never
+    sees mentions from the future. `mentions` has bucket, asset_id and mentions columns.
+    """
+    counts = np.zeros((len(history.times), len(history.assets)))
+    if mentions is None or mentions.empty:
+        return counts
+    column = {asset: i for i, asset in enumerate(history.assets)}
+    asset_index = mentions["asset_id"].astype(str).map(column)
+    known = asset_index.notna().to_numpy()
+    buckets = pd.to_datetime(mentions["bucket"], utc=True).to_numpy(dtype="datetime64[ns]")[known]
+    starts, bucket_index = np.unique(buckets, return_inverse=True)
+    per_bucket = np.zeros((len(starts) + 1, len(history.assets)))
+    np.add.at(per_bucket, (bucket_index + 1, asset_index[known].to_numpy(dtype=int)),
+              mentions["mentions"].to_numpy(dtype=float)[known])
+    cumulative = np.cumsum(per_bucket, axis=0)
+    # Buckets are assumed to be as long as the gap to the next one (one day for the default extraction).
+    length = np.diff(starts).min() if len(starts) > 1 else np.timedelta64(1, "D")
+    ends = starts + length
+    window = np.timedelta64(window)
+    hi = np.searchsorted(ends, history.times, side="right")
+    lo = np.searchsorted(ends, history.times - window, side="right")
+    return cumulative[hi] - cumulative[lo]
+
+
+def load_social(history, source="reddit", window=pd.Timedelta(days=1)):
+    """Load the extracted mention counts of `source` and align them with the history."""
+    try:
+        mentions = get_dataset("mentions")
+    except FileNotFoundError:
+        print("No mention counts found; backtesting on price change only.")
+        return np.zeros((len(history.times), len(history.assets)))
+    return social_matrix(history, mentions[mentions["source"] == source], window)
+
+
+def normalize_rows(values, eligible):
+    """
+    Row-wise min-max normalization over the eligible entries, like analysis.normalize:
+    a row whose eligible values are all equal is returned unchanged.
+    """
+    masked = np.where(eligible, values, np.nan)
+    with warnings.catch_warnings():
+        # Rows without any eligible asset are all-NaN; they stay NaN.
+        warnings.simplefilter("ignore", RuntimeWarning)
+        lo = np.nanmin(masked, axis=1, keepdims=True)
+        hi = np.nanmax(masked, axis=1, keepdims=True)
+    span = hi - lo
+    return np.where(span > 0, (masked - lo) / np.where(span > 0, span, 1.0), masked)
+
+
+def composite_scores(change, social, price_weight=1.0, social_weight=1.0):
+    """
+    Score every asset at every step the way get_trending_coins does: only coins with a
+    positive 24h change are eligible, and the score is the weighted sum of the normalized
+    change and normalized mention count. Ineligible entries score -inf.
+    """
+    eligible = np.isfinite(change) & (change > 0)
+    scores = price_weight * normalize_rows(change, eligible) + social_weight * normalize_rows(social, eligible)
+    return np.where(eligible, scores, -np.inf)
+
+
+def top_k_mask(scores, k):
+    """Boolean T x N mask of the `k` best-scoring eligible assets at each step."""
+    k = min(k, scores.shape[1])
+    picks = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    mask = np.zeros(scores.shape, dtype=bool)
+    np.put_along_axis(mask, picks, True, axis=1)
+    return mask & np.isfinite(scores)
+
+
+def forward_returns(history, horizon):
+    """
+    T x N matrix of returns from each snapshot to the first snapshot at least `horizon`
+    later (NaN when there is no such snapshot or a price is missing).
+    """
+    target = np.searchsorted(history.times, history.times + np.timedelta64(horizon), side="left")
+    valid = target < len(history.times)
+    returns = np.full(history.price.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[valid] = history.price[target[valid]] / history.price[valid] - 1.0
+    return returns
+
+
+def rebalance_steps(times, every):
+    """Indices of the first snapshot at or after each multiple of `every` since the start."""
+    if len(times) == 0:
+        return np.empty(0, dtype=int)
+    grid = np.arange(times[0], times[-1] + np.timedelta64(1, "ns"), np.timedelta64(every))
+    return np.unique(np.searchsorted(times, grid, side="left"))
+
+
+def evaluate(picks, returns):
+    """
+    Summarize a T x N pick mask against forward returns.
+
+    mean_return / universe_return: average equal-weighted forward return of the picks
+    and of every asset with a known return; hit_rate: share of picks beating the
+    cross-sectional median; turnover: average share of the picks replaced each step.
+    """
+    known = np.isfinite(returns)
+    held = picks & known
+    steps = held.any(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pick_return = np.where(held, returns, 0.0).sum(axis=1) / held.sum(axis=1)
+        universe_return = np.where(known, returns, 0.0).sum(axis=1) / known.sum(axis=1)
+        median = np.nanmedian(np.where(known, returns, np.nan)[steps], axis=1) if steps.any() else np.empty(0)
+    hits = (returns[steps] > median[:, None]) & held[steps]
+    sizes = picks.sum(axis=1)
+    kept = (picks[1:] & picks[:-1]).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        turnover = np.where(sizes[1:] > 0, 1.0 - kept / sizes[1:], np.nan)
+    return {
+        "steps": int(steps.sum()),
+        "mean_return": float(np.mean(pick_return[steps])) if steps.any() else np.nan,
+        "universe_return": float(np.mean(universe_return[steps])) if steps.any() else np.nan,
+        "hit_rate": float(hits.sum() / held[steps].sum()) if steps.any() else np.nan,
+        "turnover": float(np.nanmean(turnover)) if np.isfinite(turnover).any() else np.nan,
+    }
+
+
+def run_backtest(history, social, price_weight=1.0, social_weight=1.0, top_k=5,
+                 horizon=pd.Timedelta(days=1), rebalance=None):
+    """
+    Rank the assets at every rebalance step (every `horizon` by default) and measure the
+    top `top_k` against their forward returns over `horizon`. Returns a metrics dict.
+    """
+    steps = rebalance_steps(history.times, rebalance or horizon)
+    scores = composite_scores(history.change[steps], social[steps], price_weight, social_weight)
+    picks = top_k_mask(scores, top_k)
+    metrics = evaluate(picks, forward_returns(history, horizon)[steps])
+    metrics["excess_return"] = metrics["mean_return"] - metrics["universe_return"]
+    return dict(price_weight=price_weight, social_weight=social_weight, top_k=top_k, **metrics)
+
+
+# Set in each worker process by init_worker so the matrices are pickled once per worker.
+worker_state = None
+
+
+def init_worker(history, social, options):
+    global worker_state
+    worker_state = (history, social, options)
+
+
+def run_weights(weights):
+    history, social, options = worker_state
+    return run_backtest(history, social, weights[0], weights[1], **options)
+
+
+def sweep(history, social, weight_grid, processes=None, **options):
+    """
+    Backtest every (price_weight, social_weight) pair of `weight_grid` in parallel and
+    return the results as a frame sorted by excess return. `options` are passed on to
+    run_backtest (top_k, horizon, rebalance).
+    """
+    weight_grid = list(weight_grid)
+    if processes == 1 or len(weight_grid) < 2:
+        init_worker(history, social, options)
+        results = [run_weights(weights) for weights in weight_grid]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=init_worker,
+                                 initargs=(history, social, options)) as pool:
+            results = list(pool.map(run_weights, weight_grid))
+    return pd.DataFrame(results).sort_values("excess_return", ascending=False, na_position="last")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the trending composite score on the snapshot history.")
+    parser.add_argument("--top-k", type=int, default=5, help="Number of coins picked at each step.")
+    parser.add_argument("--horizon", default="1D", help="Holding period, e.g. 4h or 1D.")
+    parser.add_argument("--social-window", default="1D", help="Mentions counted before each step.")
+    parser.add_argument("--weights", type=float, nargs="+", default=[0.0, 0.25, 0.5, 1.0, 2.0],
+                        help="Values tried for each of the price and social weights.")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes for the sweep.")
+    args = parser.parse_args()
+
+    try:
+        history = load_history()
+    except FileNotFoundError:
+        print("No snapshot history found. Collect CoinGecko data a few times first.")
+        return
+    print(f"Loaded {len(history.times)} snapshots of {len(history.assets)} assets.")
+    social = load_social(history, window=pd.Timedelta(args.social_window))
+    grid = [w for w in itertools.product(args.weights, args.weights) if w != (0.0, 0.0)]
+    results = sweep(history, social, grid, processes=args.processes,
+                    top_k=args.top_k, horizon=pd.Timedelta(args.horizon))
+    output_file = os.path.join(config.PROCESSED_DATA_DIR, "backtest_results.csv")
+    write_csv(results, output_file)
+    print(results.to_string(index=False))
+    print(f"Backtest results saved to {output_file}")
+
+
+if __name__ == "__main__":
+    main()
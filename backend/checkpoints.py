@@ -0,0 +1,178 @@
+import os
+import json
+import stat
+import time
+import hashlib
+import tempfile
+import contextlib
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+# The process umask, read once at import (os.umask can only be read by setting it).
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+
+def file_mode(path):
+    """Permission bits for a rewrite of `path`: those of the existing file, else 0o666 minus the umask."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~UMASK
+
+
+@contextlib.contextmanager
+def atomic_write(path, mode="w", encoding="utf-8"):
+    """
+    Open a temporary file next to `path` for writing and atomically rename it over
+    `path` once the block finishes, so readers only ever see the old or the complete
+    new file. If the block raises, the temporary file is removed and `path` is untouched.
+    The new file keeps the permissions of the one it replaces (mkstemp creates it 0600).
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, **({} if "b" in mode else {"encoding": encoding, "newline": ""})) as f:
+            yield f
+            f.flush()
+            os.fchmod(f.fileno(), file_mode(path))
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def format_utc(values):
+    """
+    The text DataFrame.to_csv writes for a UTC datetime Series ("2024-01-01 00:00:00+00:00",
+    fractional seconds only on the values that have them, "" for NaT), built with NumPy
+    instead of pandas' Timestamp-by-Timestamp formatting, which is several times slower.
+    """
+    naive = values.dt.tz_localize(None).to_numpy()
+    missing = np.isnat(naive)
+    text = np.datetime_as_string(naive, unit="s").astype(object)
+    # Like str(Timestamp): microseconds when there is a fraction, nanoseconds only when needed.
+    for unit in ("s", "us"):
+        finer = ~missing & (naive != naive.astype(f"datetime64[{unit}]"))
+        if finer.any():
+            text[finer] = np.datetime_as_string(naive[finer], unit="us" if unit == "s" else "ns")
+    text = np.strings.replace(text.astype(str), "T", " ")
+    text = np.strings.add(text, "+00:00").astype(object)
+    text[missing] = ""
+    return pd.Series(text, index=values.index, dtype=object)
+
+
+def format_float(values):
+    """
+    The text DataFrame.to_csv writes for a float64 Series (repr of every value, "" for
+    NaN). pyarrow prints the same shortest round-trip digits several times faster than
+    NumPy; where repr uses positional notation (1e-4 <= |x| < 1e16) and pyarrow did too,
+    the two only differ by the ".0" of whole numbers. Every other value is left to NumPy.
+    """
+    x = values.to_numpy()
+    text = pc.cast(pa.array(x), pa.string())
+    magnitude = np.abs(x)
+    positional = (magnitude >= 1e-4) & (magnitude < 1e16) & ~pc.match_substring(text, "e").to_numpy(zero_copy_only=False)
+    whole = pa.array(~pc.match_substring(text, ".").to_numpy(zero_copy_only=False))
+    text = pc.if_else(whole, pc.binary_join_element_wise(text, ".0", ""), text).to_numpy(zero_copy_only=False)
+    if not positional.all():
+        text[~positional] = x[~positional].astype(str)
+    text[np.isnan(x)] = ""
+    return pd.Series(text, index=values.index, dtype=object)
+
+
+def write_csv(df, path, **kwargs):
+    """
+    DataFrame.to_csv through atomic_write (index=False unless given). UTC datetime
+    columns are formatted with format_utc and, with pyarrow installed, float64 columns
+    with format_float first; the file is the same either way.
+    """
+    kwargs.setdefault("index", False)
+    formatters = {}
+    if "date_format" not in kwargs:
+        formatters.update({i: format_utc for i, dtype in enumerate(df.dtypes)
+                           if isinstance(dtype, pd.DatetimeTZDtype) and str(dtype.tz) == "UTC"})
+    if pa is not None and "float_format" not in kwargs:
+        formatters.update({i: format_float for i, dtype in enumerate(df.dtypes) if dtype == np.float64})
+    if formatters and "na_rep" not in kwargs:
+        df = df.copy(deep=False)
+        for i, formatter in formatters.items():
+            df.isetitem(i, formatter(df.iloc[:, i]))
+    with atomic_write(path) as f:
+        df.to_csv(f, **kwargs)
+
+
+def write_json(data, path):
+    with atomic_write(path) as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def file_hash(path):
+    """SHA-256 of a file's contents, or None if it does not exist."""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CheckpointManifest:
+    """
+    JSON record of every pipeline stage: its status ("running", "completed", "failed" or
+    "blocked"), the hashes of the inputs it read and of the outputs it produced, and when
+    it ran. A completed stage is fresh as long as its inputs and outputs still hash to
+    the recorded values; anything else is stale and has to run again.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.stages = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.stages = json.load(f).get("stages", {})
+
+    def save(self):
+        write_json({"stages": self.stages}, self.path)
+
+    def status(self, stage):
+        return self.stages.get(stage, {}).get("status")
+
+    def is_fresh(self, stage, inputs, outputs):
+        """True if `stage` completed and none of its inputs or outputs changed since."""
+        entry = self.stages.get(stage)
+        if entry is None or entry.get("status") != "completed":
+            return False
+        recorded_inputs, recorded_outputs = entry.get("inputs", {}), entry.get("outputs", {})
+        if any(file_hash(path) != recorded_inputs.get(path) for path in inputs):
+            return False
+        # A missing output hashes to None, which never counts as unchanged.
+        return all(recorded_outputs.get(path) is not None and file_hash(path) == recorded_outputs[path]
+                   for path in outputs)
+
+    def start(self, stage, inputs):
+        self.stages[stage] = {"status": "running", "started": time.time(),
+                              "inputs": {path: file_hash(path) for path in inputs}, "outputs": {}}
+        self.save()
+
+    def complete(self, stage, outputs):
+        entry = self.stages[stage]
+        entry.update(status="completed", finished=time.time(),
+                     outputs={path: file_hash(path) for path in outputs})
+        entry.pop("error", None)
+        self.save()
+
+    def fail(self, stage, error, status="failed"):
+        entry = self.stages.setdefault(stage, {"inputs": {}, "outputs": {}})
+        entry.update(status=status, finished=time.time(), error=error)
+        self.save()
@@ -6,7 +6,10 @@ import pandas as pd
 # Add the parent directory (project root) to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from config import BINANCE_API_URL, RAW_DATA_DIR
+from config import API_ENDPOINTS, RAW_DATA_DIR
+from backend.checkpoints import write_csv
+
+BINANCE_API_URL = API_ENDPOINTS["binance"]
 
 # Rest of your code here...
 print("BINANCE_API_URL:", BINANCE_API_URL)
@@ -16,6 +19,7 @@ print("RAW_DATA_DIR:", RAW_DATA_DIR)
 def fetch_binance_prices():
     """
     Fetch Binance price data from the API and save it as a CSV file.
+    Returns True on success, False on failure.
     """
     try:
         response = requests.get(BINANCE_API_URL, timeout=10)
@@ -24,10 +28,12 @@ def fetch_binance_prices():
         df = pd.DataFrame(data)
         
         output_path = os.path.join(RAW_DATA_DIR, "binance_prices.csv")
-        df.to_csv(output_path, index=False)
+        write_csv(df, output_path)
         print(f"Binance prices saved to: {output_path}")
+        return True
     except Exception as e:
         print(f"Error fetching Binance prices: {e}")
+        return False
 
 if __name__ == "__main__":
-    fetch_binance_prices()
\ No newline at end of file
+    sys.exit(0 if fetch_binance_prices() else 1)
\ No newline at end of file
@@ -3,13 +3,41 @@ import os
 # Add the project root (parent directory) to sys.path so that config.py can be found.
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+import shutil
 import requests
 import pandas as pd
-from config import COINGECKO_API_URL, RAW_DATA_DIR
+from config import API_ENDPOINTS, RAW_DATA_DIR, HISTORY_DIR
+from backend.checkpoints import atomic_write, write_csv
+
+COINGECKO_API_URL = API_ENDPOINTS["coingecko"]
+
+# Fields appended to the snapshot history on every collection.
+HISTORY_FIELDS = ["id", "current_price", "price_change_percentage_24h", "total_volume", "market_cap"]
+
+def append_snapshot_history(df, snapshot_time):
+    """
+    Append the market fields of one collection, stamped with `snapshot_time`, to
+    HISTORY_DIR/coingecko_history.csv so that the backtester can replay past rankings.
+
+    Like every other data file, the history is replaced atomically: the existing rows
+    are copied into a temporary file with the new ones after them, which is then
+    renamed over the old file. A crash mid-append therefore never leaves a torn row, at
+    the cost of one sequential copy of the history per collection.
+    """
+    history_path = os.path.join(HISTORY_DIR, "coingecko_history.csv")
+    snapshot = df.reindex(columns=HISTORY_FIELDS)
+    snapshot.insert(0, "snapshot_time", snapshot_time.isoformat())
+    exists = os.path.exists(history_path)
+    with atomic_write(history_path, "wb") as f:
+        if exists:
+            with open(history_path, "rb") as existing:
+                shutil.copyfileobj(existing, f, 1 << 20)
+        f.write(snapshot.to_csv(index=False, header=not exists).encode("utf-8"))
 
 def fetch_coingecko_data():
     """
     Fetch CoinGecko data and save it as a CSV file in the raw data directory.
+    Returns True on success, False on failure.
     """
     params = {
         "vs_currency": "usd",
@@ -29,14 +57,17 @@ def fetch_coingecko_data():
         
         if not all_data:
             print("No data fetched from the CoinGecko API.")
-            return
+            return False
         
         df = pd.DataFrame(all_data)
         output_path = os.path.join(RAW_DATA_DIR, "coingecko_prices.csv")
-        df.to_csv(output_path, index=False)
+        write_csv(df, output_path)
         print(f"CoinGecko data saved to: {output_path}")
+        append_snapshot_history(df, pd.Timestamp.now(tz="UTC").floor("s"))
+        return True
     except Exception as e:
         print(f"Error fetching CoinGecko data: {e}")
+        return False
 
 if __name__ == "__main__":
-    fetch_coingecko_data()
\ No newline at end of file
+    sys.exit(0 if fetch_coingecko_data() else 1)
\ No newline at end of file
@@ -4,11 +4,15 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import requests
 import pandas as pd
-from config import FEAR_GREED_API_URL, RAW_DATA_DIR
+from config import API_ENDPOINTS, RAW_DATA_DIR
+from backend.checkpoints import write_csv
+
+FEAR_GREED_API_URL = API_ENDPOINTS["fear_greed"]
 
 def fetch_fear_greed_index():
     """
     Fetch the Fear & Greed Index data and save it as a CSV file in the raw data directory.
+    Returns True on success, False on failure.
     """
     try:
         response = requests.get(FEAR_GREED_API_URL, timeout=10)
@@ -18,10 +22,12 @@ def fetch_fear_greed_index():
         index_data = data.get("data", data)
         df = pd.DataFrame(index_data)
         output_path = os.path.join(RAW_DATA_DIR, "fear_greed_index.csv")
-        df.to_csv(output_path, index=False)
+        write_csv(df, output_path)
         print(f"Fear & Greed Index data saved to: {output_path}")
+        return True
     except Exception as e:
         print(f"Error fetching Fear & Greed data: {e}")
+        return False
 
 if __name__ == "__main__":
-    fetch_fear_greed_index()
\ No newline at end of file
+    sys.exit(0 if fetch_fear_greed_index() else 1)
\ No newline at end of file
@@ -6,6 +6,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 import requests
 import pandas as pd
 from config import NEWSAPI_KEY, RAW_DATA_DIR
+from backend.checkpoints import write_csv
 
 # Define keywords to search for (adjust as needed)
 KEYWORDS = ["bitcoin", "crypto", "ethereum"]
@@ -35,7 +36,7 @@ def fetch_crypto_news(keyword="crypto"):
         df = pd.DataFrame(articles)
         # Save each keyword's news to a separate file to prevent overwriting.
         output_path = os.path.join(RAW_DATA_DIR, f"news_articles_{keyword}.csv")
-        df.to_csv(output_path, index=False)
+        write_csv(df, output_path)
         print(f"News articles for '{keyword}' saved to: {output_path}")
         return df
 
@@ -53,6 +54,10 @@ if __name__ == "__main__":
 
     if combined_dfs:
         combined_df = pd.concat(combined_dfs, ignore_index=True)
-        combined_output_path = os.path.join(RAW_DATA_DIR, "news_articles_combined.csv")
-        combined_df.to_csv(combined_output_path, index=False)
-        print(f"Combined news articles saved to: {combined_output_path}")
\ No newline at end of file
+        # preprocess_news reads the combined articles from news_articles.csv.
+        combined_output_path = os.path.join(RAW_DATA_DIR, "news_articles.csv")
+        write_csv(combined_df, combined_output_path)
+        print(f"Combined news articles saved to: {combined_output_path}")
+    else:
+        print("No news articles fetched for any keyword.")
+        sys.exit(1)
\ No newline at end of file
@@ -5,7 +5,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import pandas as pd
 import praw
-from config import RAW_DATA_DIR, REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET, REDDIT_USER_AGENT
+from config import RAW_DATA_DIR, REDDIT_API_CREDENTIALS
+from backend.checkpoints import write_csv
 
 def fetch_reddit_posts(subreddit="cryptocurrency", limit=1000, queries=None):
     """
@@ -17,17 +18,15 @@ def fetch_reddit_posts(subreddit="cryptocurrency", limit=1000, queries=None):
         subreddit (str): The subreddit to search in.
         limit (int): The maximum number of posts to fetch per query.
         queries (list): A list of keywords to search for. Defaults to a predefined list if None.
+
+    Returns True on success, False on failure.
     """
     if queries is None:
         # Default list of keywords; feel free to modify this list.
         queries = ["bitcoin", "ethereum", "ripple", "litecoin", "cardano"]
 
     try:
-        reddit = praw.Reddit(
-            client_id=REDDIT_CLIENT_ID,
-            client_secret=REDDIT_CLIENT_SECRET,
-            user_agent=REDDIT_USER_AGENT
-        )
+        reddit = praw.Reddit(**REDDIT_API_CREDENTIALS)
         records = []
         for query in queries:
             print(f"Fetching posts for keyword: {query}")
@@ -45,10 +44,12 @@ def fetch_reddit_posts(subreddit="cryptocurrency", limit=1000, queries=None):
                 })
         df = pd.DataFrame(records)
         output_path = os.path.join(RAW_DATA_DIR, "reddit_posts.csv")
-        df.to_csv(output_path, index=False)
+        write_csv(df, output_path)
         print(f"Reddit posts saved to: {output_path}")
+        return True
     except Exception as e:
         print(f"Error fetching Reddit posts: {e}")
+        return False
 
 if __name__ == "__main__":
-    fetch_reddit_posts()
\ No newline at end of file
+    sys.exit(0 if fetch_reddit_posts() else 1)
\ No newline at end of file
@@ -5,23 +5,27 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import pandas as pd
 import yfinance as yf
-from config import RAW_DATA_DIR
+from config import RAW_DATA_DIR, YAHOO_TICKER
+from backend.checkpoints import write_csv
 
-def fetch_yahoo_data(ticker="BTC-USD", period="max"):
+def fetch_yahoo_data(ticker=YAHOO_TICKER, period="max"):
     """
     Fetch Yahoo Finance data for a given ticker and save it as a CSV file.
+    Returns True on success, False on failure.
     """
     try:
         df = yf.download(ticker, period=period)
         if df.empty:
             print(f"No data fetched for ticker: {ticker}")
-            return
+            return False
         df.reset_index(inplace=True)
         output_path = os.path.join(RAW_DATA_DIR, "yahoo_crypto.csv")
-        df.to_csv(output_path, index=False)
+        write_csv(df, output_path)
         print(f"Yahoo Finance data for {ticker} saved to: {output_path}")
+        return True
     except Exception as e:
         print(f"Error fetching Yahoo Finance data: {e}")
+        return False
 
 if __name__ == "__main__":
-    fetch_yahoo_data()
\ No newline at end of file
+    sys.exit(0 if fetch_yahoo_data() else 1)
\ No newline at end of file
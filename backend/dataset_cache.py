@@ -0,0 +1,61 @@
+import os
+import threading
+
+
+def file_signature(paths):
+    """
+    Return a tuple of (mtime_ns, size) for each path. Raises FileNotFoundError if any
+    path is missing, so callers can tell "no data yet" apart from "stale data".
+    """
+    signature = []
+    for path in paths:
+        stat = os.stat(path)
+        signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+class DatasetCache:
+    """
+    In-memory cache of loaded datasets, invalidated when any of the files a dataset was
+    built from changes on disk. Loading happens at most once per file version, so
+    repeated reads never re-parse the CSVs.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, key, paths, loader):
+        """
+        Return the cached value for `key`, calling `loader()` to rebuild it if it has never
+        been loaded or if the signature of `paths` changed since the last load.
+        """
+        signature = file_signature(paths)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        with self.lock:
+            # Another thread may have reloaded the dataset while we waited for the lock.
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == signature:
+                return entry[1]
+            value = loader()
+            self.entries[key] = (signature, value)
+            return value
+
+    def put(self, key, paths, value):
+        """
+        Store `value` as the current version of `key`, e.g. a frame that was just written
+        to `paths`, so the next get() returns it without calling a loader.
+        """
+        signature = file_signature(paths)
+        with self.lock:
+            self.entries[key] = (signature, value)
+
+    def invalidate(self, key=None):
+        """Drop one cached dataset, or all of them when `key` is None."""
+        with self.lock:
+            if key is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(key, None)
@@ -0,0 +1,274 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import logging
+import pandas as pd
+import config
+from backend.schema import SCHEMAS, downcast, read_validated
+from backend.dataset_cache import DatasetCache, file_signature
+from backend.checkpoints import atomic_write, write_csv
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+
+# Undeclared text columns whose distinct values make up less than this share of the
+# rows are stored as categories.
+CATEGORY_MAX_RATIO = 0.5
+# Source tag of Arrow files published without a CSV: they are the dataset itself rather
+# than a cached copy of its CSV.
+PUBLISHED = "published"
+
+
+class DatasetSpec:
+    """
+    Where a dataset lives and how to read it. `file_name` is resolved at load time
+    against the config directory named by `directory` (PROCESSED_DATA_DIR by default),
+    `schema` gives the column dtypes and `time_column` (if any) is parsed as UTC
+    datetimes and sorted ascending.
+    """
+
+    def __init__(self, name, file_name, schema=None, time_column=None, directory="PROCESSED_DATA_DIR"):
+        self.name = name
+        self.file_name = file_name
+        self.schema = schema
+        self.time_column = time_column
+        self.directory = directory
+
+    def path(self):
+        return os.path.join(getattr(config, self.directory), self.file_name)
+
+
+DATASETS = {
+    "binance": DatasetSpec("binance", "binance_prices_cleaned.csv", SCHEMAS["binance"]),
+    "coingecko": DatasetSpec("coingecko", "coingecko_prices_cleaned.csv", SCHEMAS["coingecko"]),
+    "features": DatasetSpec("features", "crypto_combined.csv", SCHEMAS["features"], time_column="bucket",
+                            directory="COMBINED_DATA_DIR"),
+    "fear_greed": DatasetSpec("fear_greed", "fear_greed_index_cleaned.csv", SCHEMAS["fear_greed"]),
+    "mentions": DatasetSpec("mentions", "mention_counts.csv", SCHEMAS["mentions"], time_column="bucket"),
+    "news": DatasetSpec("news", "news_articles_cleaned.csv", SCHEMAS["news"], time_column="publishedAt"),
+    "reddit": DatasetSpec("reddit", "reddit_posts_cleaned.csv", SCHEMAS["reddit"], time_column="created"),
+    "yahoo": DatasetSpec("yahoo", "yahoo_crypto_cleaned.csv", SCHEMAS["yahoo"], time_column="Date"),
+    "yahoo_fgi": DatasetSpec("yahoo_fgi", "yahoo_fgi_merged.csv", SCHEMAS["yahoo"], time_column="Date_x"),
+}
+
+
+def compact_frame(df, declared=()):
+    """
+    Shrink the columns a schema did not declare: low-cardinality text becomes a category,
+    float64 columns that round-trip through float32 are downcast and integers are narrowed.
+    """
+    for name in df.columns:
+        if name in declared:
+            continue
+        values = df[name]
+        if pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values):
+            if len(values) and values.nunique(dropna=True) / len(values) < CATEGORY_MAX_RATIO:
+                df[name] = values.astype("category")
+        elif pd.api.types.is_integer_dtype(values):
+            df[name] = pd.to_numeric(values, downcast="integer")
+        elif pd.api.types.is_float_dtype(values):
+            narrowed = values.astype("float32")
+            if (narrowed.astype("float64") == values).sum() == values.notna().sum():
+                df[name] = narrowed
+    return df
+
+
+def declared_columns(spec):
+    return {column.name for column in spec.schema.columns} if spec.schema is not None else set()
+
+
+def finish_frame(spec, df):
+    """Sort a dataset by its time column and compact the columns its schema does not declare."""
+    declared = declared_columns(spec)
+    if spec.time_column is not None:
+        if not pd.api.types.is_datetime64_any_dtype(df[spec.time_column]):
+            df[spec.time_column] = pd.to_datetime(df[spec.time_column], utc=True, errors="coerce")
+        df = df.sort_values(spec.time_column, kind="stable").reset_index(drop=True)
+        declared.add(spec.time_column)
+    return compact_frame(df, declared)
+
+
+def load_csv(spec):
+    """Parse a dataset's CSV with its schema dtypes and compact the remaining columns."""
+    path = spec.path()
+    df = read_validated(path, spec.schema) if spec.schema is not None else pd.read_csv(path)
+    return finish_frame(spec, df)
+
+
+class DatasetRegistry:
+    """
+    Process-wide registry that keeps exactly one compact, read-only copy of each dataset.
+
+    A dataset is parsed on first use and kept until its source file changes (checked with
+    a cheap stat on every get). When pyarrow is available and `arrow_cache_dir` is set,
+    the compact frame is also written once as an uncompressed Arrow IPC file and later
+    loads memory-map it instead of re-parsing the CSV, so several worker processes share
+    the same pages through the OS page cache.
+
+    Pipeline stages hand their outputs over with publish() instead of writing a CSV for
+    the next stage to parse: the frame becomes the current copy in this process and the
+    Arrow file is what other processes map. The processed CSV is an optional sink.
+
+    Callers must treat the returned frames as read-only; copy before modifying.
+    """
+
+    def __init__(self, datasets=DATASETS, arrow_cache_dir=None):
+        self.datasets = datasets
+        self.arrow_cache_dir = arrow_cache_dir if pa is not None else None
+        self.cache = DatasetCache()
+
+    def get(self, name):
+        """Return the dataset `name`, loading or reloading it if its file changed."""
+        spec = self.datasets[name]
+        return self.cache.get((name, spec.path()), [self.source_path(name)], lambda: self.load(spec))
+
+    def arrow_path(self, spec):
+        return os.path.join(self.arrow_cache_dir, f"{spec.name}.arrow")
+
+    def source_path(self, name):
+        """
+        The file dataset `name` is loaded from: its processed CSV or, when it was published
+        without the CSV sink, its Arrow file.
+        """
+        spec = self.datasets[name]
+        if not os.path.exists(spec.path()) and self.arrow_cache_dir is not None \
+                and os.path.exists(self.arrow_path(spec)):
+            return self.arrow_path(spec)
+        return spec.path()
+
+    def published_path(self, name, sink=None):
+        """
+        The file publish() leaves dataset `name` in: its processed CSV with the CSV sink
+        (PROCESSED_CSV_SINK unless `sink` is given) or without an Arrow cache, its Arrow
+        file otherwise.
+        """
+        spec = self.datasets[name]
+        sink = config.PROCESSED_CSV_SINK if sink is None else sink
+        if sink or self.arrow_cache_dir is None:
+            return spec.path()
+        return self.arrow_path(spec)
+
+    @staticmethod
+    def csv_signature(spec):
+        return json.dumps([spec.path(), file_signature([spec.path()])])
+
+    def load(self, spec):
+        if self.arrow_cache_dir is None:
+            return load_csv(spec)
+        arrow_path = self.arrow_path(spec)
+        if not os.path.exists(spec.path()):
+            df = self.read_arrow(arrow_path, PUBLISHED)
+            # No published Arrow file either: load_csv raises FileNotFoundError.
+            return df if df is not None else load_csv(spec)
+        signature = self.csv_signature(spec)
+        df = self.read_arrow(arrow_path, signature)
+        if df is None:
+            df = load_csv(spec)
+            self.write_arrow(df, arrow_path, signature)
+        return df
+
+    def publish(self, name, df, sink=None):
+        """
+        Make `df` the current version of dataset `name` and return the shared copy.
+
+        The frame is finished like a loaded dataset (schema dtypes, sorted by time,
+        compacted) and the registry takes ownership of it. Later get(name) calls in this process return it
+        without touching the disk; with the Arrow cache enabled it is also written as an
+        Arrow file that other processes memory-map instead of parsing a CSV. `sink`
+        (PROCESSED_CSV_SINK by default) also writes the processed CSV. Without the sink the
+        Arrow file is the dataset and a stale CSV is removed, unless the Arrow file cannot
+        be written, in which case the CSV is written anyway.
+        """
+        spec = self.datasets[name]
+        if spec.schema is not None:
+            # Stage outputs that never went through validate() get the declared dtypes too.
+            df = downcast(df, spec.schema)
+        df = finish_frame(spec, df)
+        path = spec.path()
+        sink = config.PROCESSED_CSV_SINK if sink is None else sink
+        signature = PUBLISHED
+        if sink or self.arrow_cache_dir is None:
+            write_csv(df, path)
+            signature = self.csv_signature(spec)
+        if self.arrow_cache_dir is not None:
+            written = self.write_arrow(df, self.arrow_path(spec), signature)
+            if signature == PUBLISHED:
+                if not written:
+                    write_csv(df, path)
+                elif os.path.exists(path):
+                    os.remove(path)
+        self.cache.put((name, path), [self.source_path(name)], df)
+        return df
+
+    def iter_batches(self, name, columns, batch_size):
+        """
+        Yield the `columns` of dataset `name` (those it has) as frames of at most
+        `batch_size` rows, reading the CSV in chunks or the memory-mapped Arrow file batch
+        by batch, so large datasets are never materialized whole.
+        """
+        path = self.source_path(name)
+        if path.endswith(".arrow"):
+            table = feather.read_table(path, memory_map=True)
+            table = table.select([column for column in columns if column in table.column_names])
+            for batch in table.to_batches(max_chunksize=batch_size):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(path, usecols=lambda column: column in columns, chunksize=batch_size)
+
+    @staticmethod
+    def read_arrow(arrow_path, signature):
+        """Memory-map a cached Arrow file, or return None if it is missing or stale."""
+        if not os.path.exists(arrow_path):
+            return None
+        try:
+            table = feather.read_table(arrow_path, memory_map=True)
+        except Exception as e:
+            logging.warning("Ignoring unreadable Arrow cache %s: %s", arrow_path, e)
+            return None
+        metadata = table.schema.metadata or {}
+        if metadata.get(b"cryptotrend_source") != signature.encode("utf-8"):
+            return None
+        # Separate blocks let numeric columns without nulls point straight at the mapped pages.
+        return table.to_pandas(split_blocks=True)
+
+    @staticmethod
+    def write_arrow(df, arrow_path, signature):
+        """
+        Write the compact frame as an uncompressed Arrow file tagged with its source
+        signature. Returns False if it could not be written.
+        """
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[b"cryptotrend_source"] = signature.encode("utf-8")
+        table = table.replace_schema_metadata(metadata)
+        try:
+            with atomic_write(arrow_path, "wb") as f:
+                feather.write_feather(table, f, compression="uncompressed")
+            return True
+        except Exception as e:
+            logging.warning("Could not write Arrow cache %s: %s", arrow_path, e)
+            return False
+
+    def memory_usage(self):
+        """Return {dataset: bytes} for every dataset currently held in memory."""
+        return {key[0]: int(entry[1].memory_usage(deep=True).sum())
+                for key, entry in self.cache.entries.items()}
+
+
+registry = DatasetRegistry(arrow_cache_dir=config.DATASET_CACHE_DIR if config.DATASET_ARROW_CACHE else None)
+
+
+def get_dataset(name):
+    """Return the shared, read-only copy of a processed dataset from the process-wide registry."""
+    return registry.get(name)
+
+
+def publish_dataset(name, df, sink=None):
+    """Hand a stage's output to later stages through the process-wide registry (see DatasetRegistry.publish)."""
+    return registry.publish(name, df, sink)
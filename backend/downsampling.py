@@ -0,0 +1,47 @@
+import numpy as np
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Returns the sorted indices of at most `n_out` points of the series (x, y) that best
+    preserve its visual shape. The first and last points are always kept; every bucket
+    in between contributes the point forming the largest triangle with the previously
+    selected point and the average of the next bucket. `x` must be sorted ascending.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])[:max(n_out, 0)]
+
+    # Bucket boundaries for the n - 2 interior points split into n_out - 2 buckets.
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(int)
+    # Precompute each bucket's average point, used as the third triangle vertex.
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[-1])
+    avg_y = np.append(sums_y / counts, y[-1])
+
+    selected = np.empty(n_out, dtype=int)
+    selected[0] = 0
+    previous = 0
+    for bucket in range(n_out - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        px, py = x[previous], y[previous]
+        # Twice the triangle area; the constant factor does not change the argmax.
+        areas = np.abs((px - avg_x[bucket + 1]) * (y[lo:hi] - py) - (px - x[lo:hi]) * (avg_y[bucket + 1] - py))
+        previous = lo + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    selected[-1] = n - 1
+    return selected
+
+
+def lttb(x, y, n_out):
+    """Return the (x, y) arrays downsampled to at most `n_out` points with LTTB."""
+    idx = lttb_indices(x, y, n_out)
+    return np.asarray(x)[idx], np.asarray(y)[idx]
@@ -0,0 +1,281 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import argparse
+import threading
+import numpy as np
+import pandas as pd
+import config
+from backend.checkpoints import file_hash, write_csv, write_json
+from backend.dataset_cache import DatasetCache
+from backend.dataset_registry import get_dataset, registry
+from backend.mentions import MENTION_SOURCES
+
+KEYS = ["asset_id", "bucket"]
+
+
+def interval_length(interval):
+    """Fixed length of a pandas frequency such as "D" or "4h" as a Timedelta."""
+    return pd.Timedelta(pd.tseries.frequencies.to_offset(interval).nanos, unit="ns")
+
+
+class FeatureGroup:
+    """
+    The feature columns derived from one source. `inputs()` returns the files they are
+    built from and `build(interval)` a frame keyed by asset_id and bucket (or by bucket
+    alone for market-wide features such as the Fear & Greed Index, which apply to every
+    asset).
+    """
+
+    def __init__(self, name, inputs, build, per_asset=True):
+        self.name = name
+        self.inputs = inputs
+        self.build = build
+        self.per_asset = per_asset
+
+
+def history_path():
+    return os.path.join(config.HISTORY_DIR, "coingecko_history.csv")
+
+
+def price_features(interval):
+    """
+    Last price, 24h change, volume and market cap of every asset in each bucket from the
+    CoinGecko snapshot history, with the processed Yahoo candles filling in the history
+    of YAHOO_ASSET_ID. log_return is the log change from the previous bucket.
+    """
+    frames = []
+    if os.path.exists(history_path()):
+        history = pd.read_csv(history_path(), usecols=["snapshot_time", "id", "current_price",
+                                                       "price_change_percentage_24h", "total_volume", "market_cap"])
+        history["bucket"] = pd.to_datetime(history["snapshot_time"], utc=True, format="ISO8601").dt.floor(interval)
+        history = history.dropna(subset=["id", "bucket"]).sort_values("bucket", kind="stable")
+        history = history.rename(columns={"id": "asset_id", "current_price": "price",
+                                          "price_change_percentage_24h": "change_24h_pct", "total_volume": "volume"})
+        frames.append(history.groupby(KEYS, sort=False)[["price", "change_24h_pct", "volume", "market_cap"]].last())
+    if os.path.exists(registry.source_path("yahoo")):
+        yahoo = get_dataset("yahoo")[["Date", "Close", "Volume"]]
+        yahoo = yahoo.assign(asset_id=config.YAHOO_ASSET_ID, bucket=yahoo["Date"].dt.floor(interval))
+        yahoo = yahoo.sort_values("Date", kind="stable").rename(columns={"Close": "price", "Volume": "volume"})
+        frames.append(yahoo.groupby(KEYS, sort=False)[["price", "volume"]].last())
+    if not frames:
+        return None
+    # Snapshot history first: Yahoo only fills buckets the history does not cover.
+    prices = frames[0]
+    for frame in frames[1:]:
+        prices = prices.combine_first(frame)
+    prices = prices.reset_index().sort_values(KEYS, kind="stable").reset_index(drop=True)
+    previous = prices.groupby("asset_id", sort=False)[["bucket", "price"]].shift()
+    consecutive = (prices["bucket"] - previous["bucket"]) == interval_length(interval)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_return = np.log(prices["price"].to_numpy(dtype=float) / previous["price"].to_numpy(dtype=float))
+    prices["log_return"] = np.where(consecutive.to_numpy() & np.isfinite(log_return), log_return, np.nan)
+    return prices
+
+
+def fear_greed_features(interval):
+    """Fear & Greed Index value per bucket (market-wide)."""
+    fgi = get_dataset("fear_greed")[["value", "timestamp"]].copy()
+    fgi["bucket"] = pd.to_datetime(fgi["timestamp"], unit="s", utc=True).dt.floor(interval)
+    fgi = fgi.sort_values("timestamp", kind="stable").groupby("bucket")["value"].last()
+    return fgi.rename("fgi_value").reset_index()
+
+
+def mention_features(interval):
+    """
+    Mentions and mean sentiment per source, asset and bucket from mention_counts.csv.
+    Buckets after a source's first extracted bucket count as zero mentions for assets
+    that were not mentioned.
+    """
+    mentions = get_dataset("mentions").copy()
+    if "sentiment" not in mentions.columns:
+        mentions["sentiment"] = np.nan
+    mentions["bucket"] = mentions["bucket"].dt.floor(interval)
+    mentions["asset_id"] = mentions["asset_id"].astype(str)
+    scored = mentions["sentiment"].notna()
+    mentions["weighted"] = (mentions["sentiment"] * mentions["mentions"]).where(scored)
+    mentions["scored"] = mentions["mentions"].where(scored, 0)
+    columns = {}
+    first_bucket = {}
+    for source in MENTION_SOURCES:
+        rows = mentions[mentions["source"] == source]
+        if rows.empty:
+            continue
+        grouped = rows.groupby(KEYS)[["mentions", "weighted", "scored"]].sum(min_count=1)
+        columns[f"{source}_mentions"] = grouped["mentions"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            columns[f"{source}_sentiment"] = grouped["weighted"] / grouped["scored"].where(grouped["scored"] > 0)
+        first_bucket[source] = rows["bucket"].min()
+    if not columns:
+        return None
+    features = pd.DataFrame(columns)
+    # Every mentioned asset gets a row in every bucket the extraction covers, so the
+    # buckets where it went unmentioned can count as zero.
+    buckets = pd.date_range(mentions["bucket"].min(), mentions["bucket"].max(), freq=interval)
+    features = features.reindex(pd.MultiIndex.from_product(
+        [features.index.unique("asset_id"), buckets], names=KEYS)).reset_index()
+    for source, first in first_bucket.items():
+        column = f"{source}_mentions"
+        features[column] = features[column].where(features[column].notna() | (features["bucket"] < first), 0)
+    return features
+
+
+GROUPS = [
+    FeatureGroup("prices", lambda: [history_path(), registry.source_path("yahoo")], price_features),
+    FeatureGroup("fear_greed", lambda: [registry.source_path("fear_greed")], fear_greed_features, per_asset=False),
+    FeatureGroup("mentions", lambda: [registry.source_path("mentions")], mention_features),
+]
+
+# Column order of the combined table.
+COLUMNS = KEYS + ["price", "change_24h_pct", "volume", "market_cap", "log_return", "fgi_value"] + \
+    [f"{source}_{kind}" for source in MENTION_SOURCES for kind in ("mentions", "sentiment")]
+
+
+class FeatureStore:
+    """
+    Materialized per-asset, per-interval feature table at COMBINED_DATA_DIR/crypto_combined.csv.
+
+    Every FeatureGroup is built from its own source into a part file under
+    `directory`/features/, and features.json records the hashes of the inputs each part
+    was built from. update() rebuilds only the parts whose source changed and then joins
+    the parts into the wide table, so a new Reddit or FGI file never reprocesses the
+    price history (and vice versa). Consumers read the table through the dataset
+    registry ("features") or features_as_of() instead of merging raw files themselves.
+
+    Parts are cached in memory and only re-read when their file changes, so in a
+    long-running process (the --daemon scheduler) an update parses just the rebuilt parts.
+    """
+
+    def __init__(self, directory=None, interval=None):
+        self.directory = directory
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.cache = DatasetCache()
+
+    def root(self):
+        return self.directory or config.COMBINED_DATA_DIR
+
+    def table_path(self):
+        return os.path.join(self.root(), "crypto_combined.csv")
+
+    def part_path(self, group):
+        return os.path.join(self.root(), "features", f"{group.name}.csv")
+
+    def state_path(self):
+        return os.path.join(self.root(), "features", "features.json")
+
+    def load_state(self):
+        if os.path.exists(self.state_path()):
+            with open(self.state_path()) as f:
+                return json.load(f)
+        return {}
+
+    def read_part(self, group):
+        part = pd.read_csv(self.part_path(group))
+        part["bucket"] = pd.to_datetime(part["bucket"], utc=True, format="ISO8601")
+        if group.per_asset:
+            part["asset_id"] = part["asset_id"].astype(str)
+        return part
+
+    def part(self, group):
+        """Return the stored part of `group`, re-reading it only when its file changes."""
+        path = self.part_path(group)
+        return self.cache.get(path, [path], lambda: self.read_part(group))
+
+    def update(self, force=False):
+        """
+        Rebuild the parts whose inputs changed (all of them with `force`) and rewrite the
+        combined table if anything changed. Returns the names of the rebuilt groups.
+        """
+        interval = self.interval or config.FEATURE_INTERVAL
+        with self.lock:
+            state = self.load_state()
+            rebuilt = []
+            for group in GROUPS:
+                signature = {"interval": interval, "inputs": [file_hash(path) for path in group.inputs()]}
+                if not force and state.get(group.name) == signature and os.path.exists(self.part_path(group)):
+                    continue
+                try:
+                    part = group.build(interval)
+                except FileNotFoundError:
+                    part = None
+                if part is None:
+                    if os.path.exists(self.part_path(group)):
+                        os.remove(self.part_path(group))
+                else:
+                    write_csv(part, self.part_path(group))
+                state[group.name] = signature
+                rebuilt.append(group.name)
+            if rebuilt or not os.path.exists(self.table_path()):
+                write_csv(self.combine(), self.table_path())
+                write_json(state, self.state_path())
+            return rebuilt
+
+    def combine(self):
+        """
+        Join the stored parts into the wide table, sorted by bucket and asset.
+
+        The join always covers every part, not just the rebuilt one: the table holds the
+        union of the per-asset parts' keys, so swapping one group's columns in place
+        would keep rows that only its previous version had. Joining keyed frames that
+        are already in memory costs a fraction of building or parsing a part, which is
+        the work update() avoids.
+        """
+        parts = [(group, self.part(group)) for group in GROUPS if os.path.exists(self.part_path(group))]
+        table = None
+        for group, part in parts:
+            if group.per_asset:
+                table = part if table is None else table.merge(part, on=KEYS, how="outer")
+        if table is None:
+            table = pd.DataFrame({"asset_id": pd.Series(dtype=str), "bucket": pd.Series(dtype="datetime64[ns, UTC]")})
+        for group, part in parts:
+            if not group.per_asset:
+                table = table.merge(part, on="bucket", how="left")
+        table = table.reindex(columns=COLUMNS)
+        return table.sort_values(["bucket", "asset_id"], kind="stable").reset_index(drop=True)
+
+
+# Process-wide store maintained by the pipeline.
+store = FeatureStore()
+
+
+def update_features(force=False):
+    """Bring the combined feature table up to date; returns False if it cannot be built."""
+    rebuilt = store.update(force)
+    if not os.path.exists(store.table_path()):
+        print("No feature table could be built.")
+        return False
+    print(f"Feature table saved to {store.table_path()} (rebuilt: {', '.join(rebuilt) or 'nothing'})")
+    return True
+
+
+def features_as_of(when, assets=None, columns=None, interval=None):
+    """
+    Point-in-time lookup: the latest complete bucket of every asset (or of `assets`) as
+    it was known at `when`. A bucket is complete once its end lies at or before `when`,
+    so a backtest or model never sees values from later in the same bucket.
+    """
+    when = pd.Timestamp(when)
+    when = when.tz_localize("UTC") if when.tzinfo is None else when.tz_convert("UTC")
+    table = get_dataset("features")
+    cutoff = when - interval_length(interval or config.FEATURE_INTERVAL)
+    known = table.iloc[:table["bucket"].searchsorted(cutoff, side="right")]
+    if assets is not None:
+        known = known[known["asset_id"].isin(list(assets))]
+    latest = known.groupby("asset_id", observed=True, sort=True).tail(1)
+    if columns is not None:
+        unknown = [column for column in columns if column not in table.columns]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        latest = latest[KEYS + [column for column in columns if column not in KEYS]]
+    return latest.sort_values("asset_id").reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Update the combined per-asset feature table.")
+    parser.add_argument("--force", action="store_true", help="Rebuild every feature group.")
+    args = parser.parse_args()
+    sys.exit(0 if update_features(args.force) else 1)
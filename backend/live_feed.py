@@ -0,0 +1,241 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import time
+import queue
+import logging
+import threading
+import numpy as np
+import pandas as pd
+import requests
+from config import API_ENDPOINTS, RAW_DATA_DIR, LIVE_FEED_INTERVALS
+
+# CoinGecko fields kept in the live snapshot; everything else changes too rarely to stream.
+COINGECKO_LIVE_FIELDS = ["current_price", "price_change_percentage_24h", "total_volume", "market_cap"]
+
+
+def fetch_binance_snapshot():
+    """
+    Fetch the current Binance ticker prices as a {symbol: price} dict.
+    """
+    response = requests.get(API_ENDPOINTS["binance"], timeout=10)
+    response.raise_for_status()
+    return {item["symbol"]: float(item["price"]) for item in response.json()}
+
+
+def fetch_coingecko_snapshot():
+    """
+    Fetch the first page of CoinGecko markets as a {coin_id: {field: value}} dict.
+    """
+    params = {"vs_currency": "usd", "order": "market_cap_desc", "per_page": 250, "page": 1, "sparkline": "false"}
+    response = requests.get(API_ENDPOINTS["coingecko"], params=params, timeout=10)
+    response.raise_for_status()
+    return {
+        coin["id"]: {field: coin.get(field) for field in COINGECKO_LIVE_FIELDS}
+        for coin in response.json()
+    }
+
+
+class StubPriceFeed:
+    """
+    Offline stand-in for the Binance and CoinGecko APIs. Prices start from the last
+    collected CSVs in RAW_DATA_DIR (or a small built-in set) and follow a random walk,
+    so the live page and the poller can be exercised without network access.
+    """
+
+    def __init__(self, seed=0, volatility=0.001, max_symbols=200):
+        self.rng = np.random.default_rng(seed)
+        self.volatility = volatility
+        self.binance_prices = self._load_binance(max_symbols)
+        self.coingecko_markets = self._load_coingecko(max_symbols)
+
+    @staticmethod
+    def _load_binance(max_symbols):
+        path = os.path.join(RAW_DATA_DIR, "binance_prices.csv")
+        if os.path.exists(path):
+            df = pd.read_csv(path).dropna().head(max_symbols)
+            return dict(zip(df["symbol"], df["price"].astype(float)))
+        return {"BTCUSDT": 95000.0, "ETHUSDT": 2700.0, "XRPUSDT": 2.6, "LTCUSDT": 125.0, "ADAUSDT": 0.78}
+
+    @staticmethod
+    def _load_coingecko(max_symbols):
+        path = os.path.join(RAW_DATA_DIR, "coingecko_prices.csv")
+        if os.path.exists(path):
+            df = pd.read_csv(path, usecols=["id"] + COINGECKO_LIVE_FIELDS).head(max_symbols)
+            df = df.astype(object).where(df.notna(), None)
+            return {row["id"]: {field: row[field] for field in COINGECKO_LIVE_FIELDS} for _, row in df.iterrows()}
+        return {"bitcoin": {"current_price": 95000.0, "price_change_percentage_24h": 0.0,
+                            "total_volume": 2.5e10, "market_cap": 1.9e12}}
+
+    def _step(self, n):
+        return np.exp(self.rng.normal(0.0, self.volatility, size=n))
+
+    def binance(self):
+        """Advance every Binance price one step and return the snapshot."""
+        factors = self._step(len(self.binance_prices))
+        for factor, symbol in zip(factors, list(self.binance_prices)):
+            self.binance_prices[symbol] *= float(factor)
+        return dict(self.binance_prices)
+
+    def coingecko(self):
+        """Advance every CoinGecko price one step and return the snapshot."""
+        factors = self._step(len(self.coingecko_markets))
+        for factor, coin in zip(factors, self.coingecko_markets.values()):
+            if coin["current_price"] is not None:
+                coin["current_price"] *= float(factor)
+        return {coin_id: dict(fields) for coin_id, fields in self.coingecko_markets.items()}
+
+
+def diff_snapshot(previous, current):
+    """
+    Compare two {key: value} snapshots and return (changed, removed), where `changed`
+    holds new or updated keys with their current value and `removed` lists dropped keys.
+    """
+    changed = {key: value for key, value in current.items() if previous.get(key) != value}
+    removed = [key for key in previous if key not in current]
+    return changed, removed
+
+
+def format_sse(data, event=None, event_id=None):
+    """Serialize one Server-Sent Events message."""
+    message = ""
+    if event_id is not None:
+        message += f"id: {event_id}\n"
+    if event is not None:
+        message += f"event: {event}\n"
+    message += f"data: {json.dumps(data, separators=(',', ':'))}\n\n"
+    return message
+
+
+class LivePriceFeed:
+    """
+    Background poller that keeps the latest snapshot of each source in memory and pushes
+    the differences between consecutive polls to subscribers. Listeners registered with
+    add_listener(callback) are called as callback(source, snapshot, timestamp) after
+    every successful poll, on the polling thread.
+
+    `sources` maps a source name to a (fetch_function, interval_seconds) pair. Each
+    subscriber gets its own bounded queue; a subscriber that falls behind is resynced
+    with a full snapshot instead of blocking the poller.
+    """
+
+    def __init__(self, sources, queue_size=256):
+        self.sources = sources
+        self.queue_size = queue_size
+        self.snapshots = {name: {} for name in sources}
+        self.version = 0
+        self.subscribers = []
+        self.listeners = []
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def snapshot(self):
+        """Return a copy of the latest snapshot of every source with the current version."""
+        with self.lock:
+            return {"version": self.version, "sources": {name: dict(s) for name, s in self.snapshots.items()}}
+
+    def subscribe(self):
+        """Register a new subscriber and return its queue."""
+        q = queue.Queue(maxsize=self.queue_size)
+        with self.lock:
+            self.subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self.lock:
+            if q in self.subscribers:
+                self.subscribers.remove(q)
+
+    def add_listener(self, callback):
+        with self.lock:
+            self.listeners.append(callback)
+
+    def _publish(self, event):
+        for q in list(self.subscribers):
+            try:
+                q.put_nowait(event)
+            except queue.Full:
+                # The client fell behind: drop its backlog and let it resync from a full snapshot.
+                with q.mutex:
+                    q.queue.clear()
+                q.put_nowait({"type": "snapshot", "version": self.version,
+                              "sources": {name: dict(s) for name, s in self.snapshots.items()}})
+
+    def poll_source(self, name):
+        """
+        Fetch one source, update its snapshot and publish the delta.
+        Returns the number of changed keys, or None if the fetch failed.
+        """
+        fetch, _ = self.sources[name]
+        try:
+            current = fetch()
+        except Exception as e:
+            logging.warning("Live feed poll of %s failed: %s", name, e)
+            return None
+        with self.lock:
+            changed, removed = diff_snapshot(self.snapshots[name], current)
+            self.snapshots[name] = current
+            if changed or removed:
+                self.version += 1
+                self._publish({"type": "delta", "version": self.version, "source": name,
+                               "changed": changed, "removed": removed, "ts": time.time()})
+        for listener in list(self.listeners):
+            try:
+                listener(name, current, time.time())
+            except Exception:
+                logging.exception("Live feed listener failed for %s", name)
+        return len(changed) + len(removed)
+
+    def run(self):
+        """Poll every source on its own interval until stop() is called."""
+        next_due = {name: 0.0 for name in self.sources}
+        while not self.stop_event.is_set():
+            now = time.monotonic()
+            for name, (_, interval) in self.sources.items():
+                if now >= next_due[name]:
+                    self.poll_source(name)
+                    next_due[name] = now + interval
+            wait = max(0.0, min(next_due.values()) - time.monotonic())
+            self.stop_event.wait(wait)
+
+    def start(self):
+        """Start polling in a daemon thread (no-op if already running)."""
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name="live-price-feed", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+
+
+def build_live_feed(source="api"):
+    """
+    Create a LivePriceFeed for the real APIs (`source="api"`) or the offline stub (`source="stub"`),
+    using the per-source intervals from config.LIVE_FEED_INTERVALS.
+    """
+    if source == "stub":
+        stub = StubPriceFeed()
+        fetchers = {"binance": stub.binance, "coingecko": stub.coingecko}
+    else:
+        fetchers = {"binance": fetch_binance_snapshot, "coingecko": fetch_coingecko_snapshot}
+    return LivePriceFeed({name: (fetch, LIVE_FEED_INTERVALS[name]) for name, fetch in fetchers.items()})
+
+
+if __name__ == "__main__":
+    feed = build_live_feed(sys.argv[1] if len(sys.argv) > 1 else "api")
+    q = feed.subscribe()
+    feed.start()
+    try:
+        while True:
+            event = q.get()
+            print(f"v{event['version']} {event.get('source', 'all')}: {len(event.get('changed', {}))} changed")
+    except KeyboardInterrupt:
+        feed.stop()
@@ -0,0 +1,343 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from config import MENTION_WINDOW
+from backend.dataset_cache import DatasetCache
+from backend.dataset_registry import get_dataset, publish_dataset, registry
+from backend.sketches import SlidingMentionCounter
+
+try:
+    from nltk.sentiment.vader import SentimentIntensityAnalyzer
+except ImportError:
+    SentimentIntensityAnalyzer = None
+
+# Names and symbols that are ordinary words in crypto headlines and would drown the
+# real mentions in false positives.
+STOPWORDS = {
+    "a", "ai", "all", "and", "are", "at", "ath", "be", "best", "big", "bit", "can", "dao",
+    "defi", "edu", "for", "get", "gas", "go", "gpu", "hot", "id", "in", "io", "ip", "is", "it",
+    "just", "key", "max", "me", "meme", "more", "new", "nft", "not", "now", "of", "on", "one",
+    "op", "or", "out", "pay", "pro", "real", "so", "the", "to", "token", "up", "us", "usd",
+    "vr", "we", "win", "would", "you",
+}
+
+# Asset names that are also ordinary English words. They only count as mentions when
+# capitalised ("Status") or cashtagged ("$status").
+DICTIONARY_NAMES = {
+    "amp", "anvil", "apex", "aurora", "avail", "avalon", "badger", "beam", "blast", "blur",
+    "bounce", "civic", "comedian", "compound", "constellation", "core", "cortex", "cyber",
+    "dash", "dent", "dogs", "flare", "flow", "fluid", "flux", "gate", "gravity", "grass",
+    "harmony", "helium", "hive", "honey", "hunt", "icon", "immutable", "insurance", "maker",
+    "mantle", "mantra", "maple", "marlin", "meow", "movement", "nano", "neutron", "oasis",
+    "optimism", "phoenix", "pixels", "plume", "quant", "radix", "render", "request", "safe",
+    "saga", "scroll", "secret", "shuffle", "solar", "spell", "status", "story", "strike",
+    "stronghold", "synapse", "tensor", "terra", "test", "treasure", "tribe", "turbo",
+    "usual", "venom", "venus", "verge", "vine", "waves", "wax",
+}
+
+# Kinds of patterns: names match case-insensitively, names that are dictionary words
+# must start with a capital, and tickers must be written in capitals ("ETH"); a cashtag
+# ("$eth") always counts. This keeps short symbols and common words out of prose.
+NAME, SYMBOL, WORD = 0, 1, 2
+
+# Documents per task sent to a worker process.
+CHUNK_SIZE = 5000
+# Below this many documents the pool start-up costs more than it saves.
+MIN_PARALLEL_DOCUMENTS = 20000
+
+
+class MentionAutomaton:
+    """
+    Aho-Corasick automaton over lower-cased asset names and symbols.
+
+    `scan(text)` walks the text once, following goto/failure links, and reports every
+    pattern occurrence that sits on word boundaries, so the cost per document is linear
+    in its length no matter how many assets are tracked.
+    """
+
+    def __init__(self, asset_ids, patterns):
+        # patterns: iterable of (term, asset_index, kind)
+        self.asset_ids = list(asset_ids)
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for term, asset_index, kind in patterns:
+            self.add(term, asset_index, kind)
+        self.build_failure_links()
+
+    def add(self, term, asset_index, kind):
+        state = 0
+        for ch in term:
+            next_state = self.goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][ch] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        entry = (len(term), asset_index, kind)
+        if entry not in self.output[state]:
+            self.output[state].append(entry)
+
+    def build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(ch, 0)
+                if self.fail[child] == child:
+                    self.fail[child] = 0
+                # Inherit the matches of the longest proper suffix.
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def scan(self, text):
+        """Return the set of asset indices mentioned in `text`."""
+        found = set()
+        if not isinstance(text, str) or not text:
+            return found
+        lowered = text.lower()
+        # Lower-casing can change the length of a few exotic characters; skip the case check then.
+        same_length = len(lowered) == len(text)
+        goto, fail, output = self.goto, self.fail, self.output
+        n = len(lowered)
+        state = 0
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not output[state]:
+                continue
+            for length, asset_index, kind in output[state]:
+                start = i - length + 1
+                if start > 0 and lowered[start - 1].isalnum():
+                    continue
+                if i + 1 < n and lowered[i + 1].isalnum():
+                    continue
+                if kind != NAME:
+                    cashtag = start > 0 and lowered[start - 1] == "$"
+                    written = text[start:i + 1] if kind == SYMBOL else text[start]
+                    if not cashtag and not (same_length and written.isupper()):
+                        continue
+                found.add(asset_index)
+        return found
+
+
+def build_automaton(coins):
+    """
+    Build a MentionAutomaton from a CoinGecko frame with `id`, `name` and `symbol` columns.
+    A name or symbol shared by several coins (wrapped and bridged tokens reuse "ETH",
+    for instance) is attributed to the one with the best market cap rank.
+    """
+    coins = coins.dropna(subset=["id"]).drop_duplicates(subset=["id"])
+    if "market_cap_rank" in coins.columns:
+        coins = coins.sort_values("market_cap_rank", kind="stable", na_position="last")
+    asset_ids = coins["id"].astype(str).tolist()
+    patterns = []
+    claimed = set()
+    for index, (name, symbol) in enumerate(zip(coins["name"].astype(str), coins["symbol"].astype(str))):
+        name = name.strip().lower()
+        symbol = symbol.strip().lower()
+        if len(name) >= 3 and name not in STOPWORDS and (name, NAME) not in claimed:
+            claimed.add((name, NAME))
+            patterns.append((name, index, WORD if name in DICTIONARY_NAMES else NAME))
+        if len(symbol) >= 2 and symbol not in STOPWORDS and (symbol, SYMBOL) not in claimed:
+            claimed.add((symbol, SYMBOL))
+            patterns.append((symbol, index, SYMBOL))
+    return MentionAutomaton(asset_ids, patterns)
+
+
+# Set in each worker process by init_worker so the automaton is pickled once per worker.
+worker_automaton = None
+
+
+def init_worker(automaton):
+    global worker_automaton
+    worker_automaton = automaton
+
+
+def scan_chunk(args):
+    """Scan a chunk of documents; returns (document_offsets, asset_indices) arrays."""
+    offset, texts = args
+    rows, assets = [], []
+    for position, text in enumerate(texts):
+        for asset_index in worker_automaton.scan(text):
+            rows.append(offset + position)
+            assets.append(asset_index)
+    return np.asarray(rows, dtype=np.int64), np.asarray(assets, dtype=np.int32)
+
+
+def scan_documents(automaton, texts, processes=None):
+    """
+    Scan every document and return (document_index, asset_index) arrays with one entry
+    per asset mentioned in a document. Large inputs are split across a process pool.
+    """
+    texts = list(texts)
+    chunks = [(start, texts[start:start + CHUNK_SIZE]) for start in range(0, len(texts), CHUNK_SIZE)]
+    if processes == 1 or len(texts) < MIN_PARALLEL_DOCUMENTS:
+        init_worker(automaton)
+        results = [scan_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=init_worker, initargs=(automaton,)) as pool:
+            results = list(pool.map(scan_chunk, chunks))
+    if not results:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32)
+    return np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results])
+
+
+def document_text(df, text_columns):
+    """Join the available text columns of each document into one string."""
+    columns = [c for c in text_columns if c in df.columns]
+    text = df[columns[0]].astype("string").fillna("")
+    for column in columns[1:]:
+        text = text + "\n" + df[column].astype("string").fillna("")
+    return text
+
+
+def sentiment_analyzer():
+    """
+    Return an nltk VADER analyzer, or None when nltk or its vader_lexicon data is not
+    installed (`python -m nltk.downloader vader_lexicon`).
+    """
+    if SentimentIntensityAnalyzer is None:
+        return None
+    try:
+        return SentimentIntensityAnalyzer()
+    except LookupError:
+        print("nltk vader_lexicon not found; mention sentiment is left empty.")
+        return None
+
+
+def document_sentiment(texts, rows, analyzer):
+    """VADER compound score (-1 to 1) of the documents at `rows`, scoring each document once."""
+    unique_rows, inverse = np.unique(rows, return_inverse=True)
+    scores = np.array([analyzer.polarity_scores(texts[row])["compound"] for row in unique_rows.tolist()])
+    return scores[inverse] if len(scores) else np.empty(0)
+
+
+def count_mentions(automaton, df, time_column, text_columns, freq="D", source=None, processes=None, analyzer=None):
+    """
+    Count, per time bucket and asset, how many documents of `df` mention the asset.
+    With a VADER `analyzer`, `sentiment` is the mean compound score of those documents
+    (NaN otherwise). Returns a frame with bucket, asset_id, source, mentions and
+    sentiment columns.
+    """
+    texts = document_text(df, text_columns)
+    rows, assets = scan_documents(automaton, texts, processes=processes)
+    times = pd.to_datetime(df[time_column], utc=True).to_numpy()[rows]
+    hits = pd.DataFrame({"bucket": pd.DatetimeIndex(times).floor(freq), "asset_index": assets,
+                         "sentiment": document_sentiment(texts.tolist(), rows, analyzer) if analyzer else np.nan})
+    counts = hits.groupby(["bucket", "asset_index"]).agg(mentions=("asset_index", "size"), sentiment=("sentiment", "mean"))
+    counts = counts.reset_index()
+    counts["asset_id"] = np.asarray(automaton.asset_ids, dtype=object)[counts["asset_index"].to_numpy()]
+    counts["source"] = source
+    return counts[["bucket", "asset_id", "source", "mentions", "sentiment"]]
+
+
+# Source name -> (registry dataset, time column, text columns) scanned for mentions.
+MENTION_SOURCES = {
+    "reddit": ("reddit", "created", ["title"]),
+    "news": ("news", "publishedAt", ["title", "description", "content"]),
+}
+
+
+def extract_mention_counts(freq="D", processes=None, sink=None):
+    """
+    Build the automaton from the full CoinGecko list, count daily asset mentions (and,
+    when nltk is installed, their mean VADER sentiment) in the processed Reddit posts
+    and news articles, and publish them as the "mentions" dataset (mention_counts.csv
+    when the CSV sink is on). Returns the counts, or None on failure.
+    """
+    try:
+        coins = get_dataset("coingecko")
+    except Exception as e:
+        print(f"Error loading CoinGecko data: {e}")
+        return None
+    automaton = build_automaton(coins)
+    analyzer = sentiment_analyzer()
+    frames = []
+    for source, (dataset, time_column, text_columns) in MENTION_SOURCES.items():
+        try:
+            df = get_dataset(dataset)
+        except Exception as e:
+            print(f"Skipping {source} mentions: {e}")
+            continue
+        frames.append(count_mentions(automaton, df, time_column, text_columns, freq=freq,
+                                     source=source, processes=processes, analyzer=analyzer))
+    if not frames:
+        return None
+    counts = publish_dataset("mentions", pd.concat(frames, ignore_index=True), sink)
+    print(f"Mention counts for {counts['asset_id'].nunique()} assets saved to {registry.source_path('mentions')}")
+    return counts
+
+
+def count_chunk(args):
+    """Scan a chunk of documents into a fresh SlidingMentionCounter (runs in a worker)."""
+    settings, texts, timestamps, authors = args
+    counter = SlidingMentionCounter(settings)
+    rows, assets = scan_chunk((0, texts))
+    asset_ids = worker_automaton.asset_ids
+    for row, asset_index in zip(rows.tolist(), assets.tolist()):
+        counter.add(timestamps[row], asset_ids[asset_index], authors[row] if authors is not None else None)
+    if timestamps:
+        counter.advance(max(timestamps))
+    return counter
+
+
+def stream_mentions(automaton, df, time_column, text_columns, author_column=None, settings=None, processes=None):
+    """
+    Feed the documents of `df` through the automaton into a SlidingMentionCounter.
+    Large inputs are split into chunks that worker processes count into their own
+    counters, which are then merged.
+    """
+    texts = document_text(df, text_columns).tolist()
+    times = pd.to_datetime(df[time_column], utc=True)
+    timestamps = ((times - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)).tolist()
+    authors = None
+    if author_column is not None and author_column in df.columns:
+        authors = df[author_column].astype(object).where(df[author_column].notna(), None).tolist()
+    chunks = [(settings, texts[start:start + CHUNK_SIZE], timestamps[start:start + CHUNK_SIZE],
+               authors[start:start + CHUNK_SIZE] if authors is not None else None)
+              for start in range(0, len(texts), CHUNK_SIZE)]
+    if processes == 1 or len(texts) < MIN_PARALLEL_DOCUMENTS:
+        init_worker(automaton)
+        counters = [count_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=init_worker, initargs=(automaton,)) as pool:
+            counters = list(pool.map(count_chunk, chunks))
+    counter = SlidingMentionCounter(settings)
+    for partial in counters:
+        counter.merge(partial)
+    return counter
+
+
+# Counters derived from the processed files, rebuilt only when those files change.
+counter_cache = DatasetCache()
+
+
+def reddit_mention_counter(settings=MENTION_WINDOW):
+    """
+    Return the shared SlidingMentionCounter over the latest window of processed Reddit
+    posts, with unique authors per asset.
+    """
+    def build():
+        automaton = build_automaton(get_dataset("coingecko"))
+        return stream_mentions(automaton, get_dataset("reddit"), "created", ["title"],
+                               author_column="author", settings=settings)
+
+    paths = [registry.source_path("coingecko"), registry.source_path("reddit")]
+    return counter_cache.get(("reddit", tuple(sorted(settings.items()))), paths, build)
+
+
+if __name__ == "__main__":
+    extract_mention_counts()
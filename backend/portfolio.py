@@ -0,0 +1,221 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+from scipy.cluster.hierarchy import linkage, leaves_list, fcluster
+from scipy.spatial.distance import squareform
+import config
+from backend.checkpoints import atomic_write, write_csv
+from backend.backtest import load_history
+from backend.dataset_registry import get_dataset
+
+# Rows of the returns matrix processed per block when accumulating the cross products.
+BLOCK_ROWS = 2048
+
+
+def returns_matrix(history, assets=None, interval="1D"):
+    """
+    Build an aligned T x N matrix of log returns from a MarketHistory, sampling the last
+    snapshot within each `interval` step. Steps without a snapshot and missing prices
+    give NaN returns rather than carrying an older price forward, which would add fake
+    zero returns; the pairwise-complete estimators skip the gaps.
+    Returns (times, assets, returns).
+    """
+    if assets is not None:
+        column = {asset: i for i, asset in enumerate(history.assets)}
+        assets = [asset for asset in assets if asset in column]
+        price = history.price[:, [column[asset] for asset in assets]]
+    else:
+        assets, price = list(history.assets), history.price
+    step = np.timedelta64(pd.Timedelta(interval))
+    grid = np.arange(history.times[0], history.times[-1] + step, step)
+    rows = np.searchsorted(history.times, grid, side="right") - 1
+    sampled = price[rows]
+    sampled[history.times[rows] <= grid - step] = np.nan
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(np.log(np.where(sampled > 0, sampled, np.nan)), axis=0)
+    return grid[1:], assets, returns
+
+
+def top_assets(n):
+    """CoinGecko ids of the `n` coins with the best market cap rank in the latest snapshot."""
+    coins = get_dataset("coingecko").dropna(subset=["market_cap_rank"])
+    return coins.sort_values("market_cap_rank")["id"].astype(str).head(n).tolist()
+
+
+def pairwise_moments(returns, block_rows=BLOCK_ROWS):
+    """
+    Accumulate the pairwise-complete sums needed for covariance and correlation with
+    masked matrix products over blocks of rows, so temporaries stay at block_rows x N.
+
+    Returns (n, sx, sxx, sxy): n[i, j] is the number of rows where both i and j are
+    present; sx[i, j] and sxx[i, j] are the sum and sum of squares of asset i over those
+    rows; sxy[i, j] is the sum of products.
+    """
+    _, n_assets = returns.shape
+    n = np.zeros((n_assets, n_assets))
+    sx = np.zeros((n_assets, n_assets))
+    sxx = np.zeros((n_assets, n_assets))
+    sxy = np.zeros((n_assets, n_assets))
+    for start in range(0, len(returns), block_rows):
+        block = returns[start:start + block_rows]
+        present = np.isfinite(block)
+        mask = present.astype(float)
+        x = np.where(present, block, 0.0)
+        n += mask.T @ mask
+        sx += x.T @ mask
+        sxx += (x * x).T @ mask
+        sxy += x.T @ x
+    return n, sx, sxx, sxy
+
+
+def pairwise_covariance(returns, min_periods=30, block_rows=BLOCK_ROWS):
+    """
+    Pairwise-complete covariance and correlation matrices (the same definition as
+    pandas' DataFrame.cov/corr) computed with blocked matrix products. Pairs with fewer
+    than `min_periods` common observations are NaN. Returns (cov, corr, n).
+    """
+    n, sx, sxx, sxy = pairwise_moments(returns, block_rows)
+    sy = sx.T
+    syy = sxx.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = (sxy - sx * sy / n) / (n - 1)
+        var_x = (sxx - sx * sx / n) / (n - 1)
+        var_y = (syy - sy * sy / n) / (n - 1)
+        corr = cov / np.sqrt(var_x * var_y)
+    enough = n >= max(min_periods, 2)
+    cov = np.where(enough, cov, np.nan)
+    corr = np.clip(np.where(enough, corr, np.nan), -1.0, 1.0)
+    np.fill_diagonal(corr, np.where(np.diag(enough), 1.0, np.nan))
+    return cov, corr, n
+
+
+def ledoit_wolf(returns, cov):
+    """
+    Shrink a covariance matrix towards a scaled identity with the Ledoit-Wolf intensity.
+
+    The intensity is estimated from the column-demeaned returns with missing values set
+    to zero, which is how pairwise-complete data enter the shrinkage formula. Returns
+    (shrunk_covariance, intensity).
+    """
+    present = np.isfinite(returns)
+    counts = np.maximum(present.sum(axis=0), 1)
+    means = np.where(present, returns, 0.0).sum(axis=0) / counts
+    x = np.where(present, returns - means, 0.0)
+    t, p = x.shape
+    x2 = x * x
+    variances = x2.sum(axis=0) / t
+    mu = variances.sum() / p
+    gram = x.T @ x
+    delta_ = (gram ** 2).sum() / t ** 2
+    beta_ = (x2.T @ x2).sum()
+    beta = (beta_ / t - delta_) / (p * t)
+    delta = (delta_ - 2 * mu * variances.sum() + p * mu ** 2) / p
+    intensity = 0.0 if delta <= 0 else float(min(max(beta, 0.0), delta) / delta)
+    target = np.nanmean(np.diag(cov))
+    base = np.where(np.isfinite(cov), cov, 0.0)
+    shrunk = (1 - intensity) * base
+    shrunk[np.diag_indices_from(shrunk)] += intensity * target
+    return shrunk, intensity
+
+
+def covariance_to_correlation(cov):
+    std = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / np.outer(std, std)
+    corr = np.clip(np.nan_to_num(corr, nan=0.0), -1.0, 1.0)
+    np.fill_diagonal(corr, 1.0)
+    return corr
+
+
+def cluster_assets(corr, n_clusters=8, method="average"):
+    """
+    Hierarchical clustering on the correlation distance sqrt((1 - corr) / 2). Pairs
+    without a correlation count as uncorrelated. Returns (order, labels): the leaf order
+    for plotting and a cluster label per asset.
+    """
+    filled = np.nan_to_num(corr, nan=0.0)
+    np.fill_diagonal(filled, 1.0)
+    distance = np.sqrt(np.clip((1.0 - filled) / 2.0, 0.0, None))
+    distance = (distance + distance.T) / 2
+    np.fill_diagonal(distance, 0.0)
+    tree = linkage(squareform(distance, checks=False), method=method)
+    return leaves_list(tree), fcluster(tree, t=n_clusters, criterion="maxclust")
+
+
+def plot_clustered_heatmap(corr, assets, order, output_path, title="Return correlation (clustered)"):
+    """Render the correlation matrix in cluster order; asset labels are shown for small universes."""
+    fig = Figure(figsize=(12, 10))
+    ax = fig.subplots()
+    ordered = corr[np.ix_(order, order)]
+    image = ax.imshow(ordered, cmap="RdBu_r", vmin=-1, vmax=1, interpolation="nearest")
+    fig.colorbar(image, ax=ax, fraction=0.046, pad=0.04)
+    if len(assets) <= 60:
+        labels = [assets[i] for i in order]
+        ax.set_xticks(range(len(labels)), labels, rotation=90, fontsize=7)
+        ax.set_yticks(range(len(labels)), labels, fontsize=7)
+    else:
+        ax.set_xticks([])
+        ax.set_yticks([])
+    ax.set_title(f"{title}, {len(assets)} assets")
+    fig.tight_layout()
+    with atomic_write(output_path, "wb") as f:
+        fig.savefig(f, format="png", dpi=120)
+    return output_path
+
+
+def analyze_portfolio(top_n=750, interval="1D", min_periods=30, n_clusters=8):
+    """
+    Correlate the top `top_n` CoinGecko assets over the snapshot history: writes the
+    clustered heatmap to VISUALIZATION_DIR and the cluster of each asset to
+    PROCESSED_DATA_DIR/asset_clusters.csv. Returns the clusters frame, or None.
+    """
+    try:
+        history = load_history()
+    except FileNotFoundError:
+        print("No snapshot history found. Collect CoinGecko data a few times first.")
+        return None
+    try:
+        universe = top_assets(top_n)
+    except FileNotFoundError:
+        universe = None
+    _, assets, returns = returns_matrix(history, universe, interval)
+    if returns.shape[0] < 2 or not assets:
+        print("Not enough history to correlate returns.")
+        return None
+    cov, _, n = pairwise_covariance(returns, min_periods)
+    # Assets with too little data to pair with anything are left out of the plot.
+    keep = np.flatnonzero((n >= min_periods).sum(axis=1) > 1)
+    if len(keep) < 2:
+        print(f"Fewer than two assets have {min_periods} overlapping returns.")
+        return None
+    assets = [assets[i] for i in keep]
+    cov, returns = cov[np.ix_(keep, keep)], returns[:, keep]
+    shrunk, intensity = ledoit_wolf(returns, cov)
+    corr = covariance_to_correlation(shrunk)
+    order, labels = cluster_assets(corr, n_clusters)
+
+    os.makedirs(config.VISUALIZATION_DIR, exist_ok=True)
+    heatmap = plot_clustered_heatmap(corr, assets, order, os.path.join(config.VISUALIZATION_DIR, "correlation_clusters.png"))
+    clusters = pd.DataFrame({"id": assets, "cluster": labels, "volatility": np.sqrt(np.diag(shrunk))})
+    clusters = clusters.iloc[order].reset_index(drop=True)
+    output_file = os.path.join(config.PROCESSED_DATA_DIR, "asset_clusters.csv")
+    write_csv(clusters, output_file)
+    print(f"Correlated {len(assets)} assets over {returns.shape[0]} {interval} returns (shrinkage {intensity:.2f}).")
+    print(f"Clustered heatmap saved to {heatmap}; clusters saved to {output_file}")
+    return clusters
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Correlate and cluster CoinGecko asset returns.")
+    parser.add_argument("--top-n", type=int, default=750, help="Number of coins by market cap rank.")
+    parser.add_argument("--interval", default="1D", help="Return sampling interval, e.g. 1h or 1D.")
+    parser.add_argument("--min-periods", type=int, default=30, help="Minimum overlapping returns per pair.")
+    parser.add_argument("--clusters", type=int, default=8, help="Number of clusters to cut the tree into.")
+    args = parser.parse_args()
+    analyze_portfolio(args.top_n, args.interval, args.min_periods, args.clusters)
@@ -1,135 +1,185 @@
 import os
+import sys
+import argparse
 import pandas as pd
-from config import RAW_DATA_DIR, PROCESSED_DATA_DIR
+from config import RAW_DATA_DIR, PROCESSED_DATA_DIR, QUARANTINE_DIR, YAHOO_TICKER
+from backend.schema import SCHEMAS, validate, write_quarantine
+from backend.mentions import extract_mention_counts
+from backend.rollups import store as rollup_store
+from backend.dataset_registry import get_dataset, publish_dataset, registry
 
 # Ensure the processed data directory exists
 os.makedirs(PROCESSED_DATA_DIR, exist_ok=True)
 
-def preprocess_yahoo():
+def validate_and_quarantine(df, name):
+    """
+    Validate a raw frame against its schema, save any rejected rows to the quarantine
+    folder and return the clean, downcast frame.
+    """
+    clean, quarantined = validate(df, SCHEMAS[name])
+    write_quarantine(quarantined, name, QUARANTINE_DIR)
+    return clean
+
+def read_raw(file_name):
+    """Read a raw CSV from RAW_DATA_DIR, or return None (after reporting why) if it cannot be read."""
+    raw_file = os.path.join(RAW_DATA_DIR, file_name)
+    try:
+        return pd.read_csv(raw_file)
+    except Exception as e:
+        print(f"Failed to read {raw_file}: {e}")
+        return None
+
+def publish(name, df, label, sink=None):
+    """
+    Hand a stage's output to the later stages through the dataset registry (in memory,
+    and as a memory-mapped Arrow file for stages in other processes) and report where it
+    was persisted. Returns the published frame.
+    """
+    df = publish_dataset(name, df, sink)
+    print(f"{label} saved to {registry.source_path(name)}")
+    return df
+
+# Every step takes its input frame(s) (read from disk when omitted) and an optional `sink`
+# flag overriding PROCESSED_CSV_SINK, and returns its output frame, or None on failure.
+
+def preprocess_yahoo(yahoo_df=None, sink=None):
     """
     Preprocess the Yahoo Finance crypto data:
-    - Convert 'Date' to datetime.
+    - Validate against the schema (parses 'Date', quarantines the yfinance ticker row
+      and any other invalid rows).
     - Create 'Date_only' for merging.
-    - Drop invalid rows.
-    - Save cleaned data.
+    - Publish the cleaned data.
+    """
+    if yahoo_df is None:
+        yahoo_df = read_raw("yahoo_crypto.csv")
+        if yahoo_df is None:
+            return None
+    yahoo_df = validate_and_quarantine(yahoo_df, "yahoo")
+    yahoo_df['Date_only'] = yahoo_df['Date'].dt.date
+    return publish("yahoo", yahoo_df, "Cleaned Yahoo Finance data", sink)
+
+def update_rollups(yahoo_df=None):
+    """
+    Fold the cleaned Yahoo candles newer than the last rolled-up one into the OHLCV
+    rollups. The input defaults to the frame preprocess_yahoo published. Returns the
+    number of new candles.
     """
-    yahoo_file = os.path.join(RAW_DATA_DIR, "yahoo_crypto.csv")
     try:
-        yahoo_df = pd.read_csv(yahoo_file)
+        yahoo_df = get_dataset("yahoo") if yahoo_df is None else yahoo_df
     except Exception as e:
-        print(f"Failed to read {yahoo_file}: {e}")
-        return
-    yahoo_df['Date'] = pd.to_datetime(yahoo_df['Date'], utc=True, errors='coerce')
-    yahoo_df['Date_only'] = yahoo_df['Date'].dt.date
-    yahoo_df = yahoo_df.dropna(subset=['Date'])
-    output_file = os.path.join(PROCESSED_DATA_DIR, "yahoo_crypto_cleaned.csv")
-    yahoo_df.to_csv(output_file, index=False)
-    print(f"Cleaned Yahoo Finance data saved to {output_file}")
+        print(f"Error reading cleaned Yahoo data: {e}")
+        return None
+    added = rollup_store.append(YAHOO_TICKER, yahoo_df)
+    print(f"Rolled up {added} new {YAHOO_TICKER} candle(s)")
+    return added
 
-def preprocess_fear_greed():
+def preprocess_fear_greed(fgi_df=None, sink=None):
     """
     Preprocess the Fear & Greed Index data:
+    - Validate against the schema.
     - Convert timestamp using unit 's'.
     - Create a date column.
-    - Save cleaned data.
+    - Publish the cleaned data.
     """
-    fgi_file = os.path.join(RAW_DATA_DIR, "fear_greed_index.csv")
-    try:
-        fgi_df = pd.read_csv(fgi_file)
-    except Exception as e:
-        print(f"Failed to read {fgi_file}: {e}")
-        return
-    fgi_df['datetime'] = pd.to_datetime(fgi_df['timestamp'], unit='s', errors='coerce')
+    if fgi_df is None:
+        fgi_df = read_raw("fear_greed_index.csv")
+        if fgi_df is None:
+            return None
+    fgi_df = validate_and_quarantine(fgi_df, "fear_greed")
+    fgi_df['datetime'] = pd.to_datetime(fgi_df['timestamp'], unit='s')
     fgi_df['Date'] = fgi_df['datetime'].dt.date
-    output_file = os.path.join(PROCESSED_DATA_DIR, "fear_greed_index_cleaned.csv")
-    fgi_df.to_csv(output_file, index=False)
-    print(f"Cleaned Fear & Greed data saved to {output_file}")
+    return publish("fear_greed", fgi_df, "Cleaned Fear & Greed data", sink)
 
-def merge_yahoo_fgi():
+def merge_yahoo_fgi(yahoo_df=None, fgi_df=None, sink=None):
     """
-    Merge cleaned Yahoo Finance and Fear & Greed data on the date column.
+    Merge cleaned Yahoo Finance and Fear & Greed data on the date column. The inputs
+    default to the frames the preprocessing steps published.
     """
-    yahoo_file = os.path.join(PROCESSED_DATA_DIR, "yahoo_crypto_cleaned.csv")
-    fgi_file = os.path.join(PROCESSED_DATA_DIR, "fear_greed_index_cleaned.csv")
     try:
-        yahoo_df = pd.read_csv(yahoo_file)
-        fgi_df = pd.read_csv(fgi_file)
+        yahoo_df = get_dataset("yahoo") if yahoo_df is None else yahoo_df
+        fgi_df = get_dataset("fear_greed") if fgi_df is None else fgi_df
     except Exception as e:
         print(f"Error reading cleaned files: {e}")
-        return
+        return None
+    # The dates are date objects in a published frame and strings once read back from a
+    # CSV; compare them as ISO strings either way.
+    yahoo_df = yahoo_df.assign(Date_only=yahoo_df['Date_only'].astype(str))
+    fgi_df = fgi_df.assign(Date=fgi_df['Date'].astype(str))
     merged_df = pd.merge(yahoo_df, fgi_df, left_on='Date_only', right_on='Date', how='left')
-    output_file = os.path.join(PROCESSED_DATA_DIR, "yahoo_fgi_merged.csv")
-    merged_df.to_csv(output_file, index=False)
-    print(f"Merged data saved to {output_file}")
+    return publish("yahoo_fgi", merged_df, "Merged data", sink)
 
-def preprocess_binance():
+def preprocess_binance(binance_df=None, sink=None):
     """
-    Read Binance prices CSV and save a cleaned copy.
+    Validate the Binance prices against the schema and publish the cleaned data.
     """
-    binance_file = os.path.join(RAW_DATA_DIR, "binance_prices.csv")
-    try:
-        binance_df = pd.read_csv(binance_file)
-    except Exception as e:
-        print(f"Failed to read {binance_file}: {e}")
-        return
-    output_file = os.path.join(PROCESSED_DATA_DIR, "binance_prices_cleaned.csv")
-    binance_df.to_csv(output_file, index=False)
-    print(f"Cleaned Binance data saved to {output_file}")
+    if binance_df is None:
+        binance_df = read_raw("binance_prices.csv")
+        if binance_df is None:
+            return None
+    binance_df = validate_and_quarantine(binance_df, "binance")
+    return publish("binance", binance_df, "Cleaned Binance data", sink)
 
-def preprocess_coingecko():
+def preprocess_coingecko(cg_df=None, sink=None):
     """
-    Read CoinGecko prices CSV and save a cleaned copy.
+    Validate the CoinGecko prices against the schema (which also flattens the stringified
+    'roi' dicts into roi_* columns) and publish the cleaned data.
     """
-    coingecko_file = os.path.join(RAW_DATA_DIR, "coingecko_prices.csv")
-    try:
-        cg_df = pd.read_csv(coingecko_file)
-    except Exception as e:
-        print(f"Failed to read {coingecko_file}: {e}")
-        return
-    output_file = os.path.join(PROCESSED_DATA_DIR, "coingecko_prices_cleaned.csv")
-    cg_df.to_csv(output_file, index=False)
-    print(f"Cleaned CoinGecko data saved to {output_file}")
+    if cg_df is None:
+        cg_df = read_raw("coingecko_prices.csv")
+        if cg_df is None:
+            return None
+    cg_df = validate_and_quarantine(cg_df, "coingecko")
+    return publish("coingecko", cg_df, "Cleaned CoinGecko data", sink)
 
-def preprocess_news():
+def preprocess_news(news_df=None, sink=None):
     """
     Preprocess news articles data:
-    - Convert 'publishedAt' to datetime.
-    - Save cleaned data.
+    - Validate against the schema (parses 'publishedAt' as UTC datetimes).
+    - Publish the cleaned data.
     """
-    news_file = os.path.join(RAW_DATA_DIR, "news_articles.csv")
-    try:
-        news_df = pd.read_csv(news_file)
-    except Exception as e:
-        print(f"Failed to read {news_file}: {e}")
-        return
-    news_df['publishedAt'] = pd.to_datetime(news_df['publishedAt'], errors='coerce')
-    output_file = os.path.join(PROCESSED_DATA_DIR, "news_articles_cleaned.csv")
-    news_df.to_csv(output_file, index=False)
-    print(f"Cleaned news data saved to {output_file}")
+    if news_df is None:
+        news_df = read_raw("news_articles.csv")
+        if news_df is None:
+            return None
+    news_df = validate_and_quarantine(news_df, "news")
+    return publish("news", news_df, "Cleaned news data", sink)
 
-def preprocess_reddit():
+def preprocess_reddit(reddit_df=None, sink=None):
     """
     Preprocess Reddit posts data:
-    - Convert 'created' to datetime.
-    - Save cleaned data.
+    - Validate against the schema (parses the epoch-seconds 'created' as UTC datetimes).
+    - Publish the cleaned data.
     """
-    reddit_file = os.path.join(RAW_DATA_DIR, "reddit_posts.csv")
-    try:
-        reddit_df = pd.read_csv(reddit_file)
-    except Exception as e:
-        print(f"Failed to read {reddit_file}: {e}")
-        return
-    reddit_df['created'] = pd.to_datetime(reddit_df['created'], errors='coerce')
-    output_file = os.path.join(PROCESSED_DATA_DIR, "reddit_posts_cleaned.csv")
-    reddit_df.to_csv(output_file, index=False)
-    print(f"Cleaned Reddit posts data saved to {output_file}")
+    if reddit_df is None:
+        reddit_df = read_raw("reddit_posts.csv")
+        if reddit_df is None:
+            return None
+    reddit_df = validate_and_quarantine(reddit_df, "reddit")
+    return publish("reddit", reddit_df, "Cleaned Reddit posts data", sink)
+
+# Preprocessing steps in the order they have to run; each returns None on failure.
+STEPS = {
+    "preprocess_yahoo": preprocess_yahoo,
+    "rollups": update_rollups,
+    "preprocess_fear_greed": preprocess_fear_greed,
+    "merge_yahoo_fgi": merge_yahoo_fgi,
+    "preprocess_binance": preprocess_binance,
+    "preprocess_coingecko": preprocess_coingecko,
+    "preprocess_news": preprocess_news,
+    "preprocess_reddit": preprocess_reddit,
+    "mentions": extract_mention_counts,
+}
 
 if __name__ == "__main__":
-    preprocess_yahoo()
-    preprocess_fear_greed()
-    merge_yahoo_fgi()
-    preprocess_binance()
-    preprocess_coingecko()
-    preprocess_news()
-    preprocess_reddit()
-    print("All preprocessing complete.")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Clean the raw data into PROCESSED_DATA_DIR.")
+    parser.add_argument("steps", nargs="*", metavar="step",
+                        help=f"Steps to run (default: all, handing frames over in memory). Choices: {', '.join(STEPS)}.")
+    args = parser.parse_args()
+    unknown = [name for name in args.steps if name not in STEPS]
+    if unknown:
+        parser.error(f"unknown step(s): {', '.join(unknown)}")
+    failed = [name for name in args.steps or STEPS if STEPS[name]() is None]
+    if failed:
+        print(f"Preprocessing failed: {', '.join(failed)}")
+        sys.exit(1)
+    print("All preprocessing complete.")
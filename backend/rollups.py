@@ -0,0 +1,266 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import argparse
+import threading
+import numpy as np
+import pandas as pd
+import config
+from backend.checkpoints import write_csv, write_json
+from backend.dataset_cache import DatasetCache
+from backend.dataset_registry import get_dataset
+
+# Rollup levels from finest to coarsest: name -> (nominal duration, level it is built from).
+# Weeks start on Monday and do not nest in months, so both are built from the daily level.
+LEVELS = {
+    "1h": (pd.Timedelta(hours=1), None),
+    "4h": (pd.Timedelta(hours=4), "1h"),
+    "1d": (pd.Timedelta(days=1), "4h"),
+    "1w": (pd.Timedelta(weeks=1), "1d"),
+    "1M": (pd.Timedelta(days=28), "1d"),
+}
+
+OHLCV = ["Open", "High", "Low", "Close", "Volume"]
+COLUMNS = ["bucket"] + OHLCV + ["count"]
+
+
+def bucket_starts(times, level):
+    """Start of the `level` bucket containing each UTC timestamp in the Series `times`."""
+    if level in ("1h", "4h", "1d"):
+        return times.dt.floor(level.replace("d", "D"))
+    days = times.dt.floor("D")
+    if level == "1w":
+        return days - pd.to_timedelta(days.dt.weekday, unit="D")
+    return days - pd.to_timedelta(days.dt.day - 1, unit="D")
+
+
+def aggregate(rows, level):
+    """
+    Roll rows with a `bucket` time (base candles or finer rollups, both with OHLCV and
+    count columns) up to `level`. Rows must be non-empty and sorted by time, so every
+    bucket is a run of consecutive rows, reduced with one NumPy reduceat per column
+    instead of a pandas groupby, whose fixed cost dominates the few rows an append touches.
+    """
+    starts = bucket_starts(rows["bucket"], level)
+    keys = starts.array.asi8
+    first = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+    last = np.append(first[1:], len(keys)) - 1
+    return pd.DataFrame({
+        "bucket": starts.array[first],
+        "Open": rows["Open"].to_numpy()[first],
+        "High": np.maximum.reduceat(rows["High"].to_numpy(), first),
+        "Low": np.minimum.reduceat(rows["Low"].to_numpy(), first),
+        "Close": rows["Close"].to_numpy()[last],
+        "Volume": np.add.reduceat(rows["Volume"].to_numpy(), first),
+        "count": np.add.reduceat(rows["count"].to_numpy(), first),
+    }, columns=COLUMNS)
+
+
+def base_rows(df, time_column="Date"):
+    """Turn a base OHLCV frame into sorted aggregate rows (count 1 per candle)."""
+    rows = pd.DataFrame({"bucket": pd.to_datetime(df[time_column], utc=True)})
+    for column in OHLCV:
+        rows[column] = df[column].to_numpy()
+    rows["count"] = 1
+    return rows.dropna(subset=["bucket"]).sort_values("bucket", kind="stable").reset_index(drop=True)
+
+
+def replace_tail(path, removed, tail):
+    """
+    Drop the last `removed` rows of a CSV file and append `tail` (without header) in
+    place, reading only the end of the file.
+    """
+    with open(path, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        # The file ends with a newline, so the removed rows start after the
+        # (removed + 1)-th newline from the end.
+        while position > 0 and data[:-1].count(b"\n") < removed:
+            step = min(1 << 16, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+        cut = len(data)
+        for _ in range(removed):
+            cut = data.rindex(b"\n", 0, cut - 1) + 1
+        f.truncate(position + cut)
+        f.seek(position + cut)
+        f.write(tail.to_csv(header=False, index=False).encode("utf-8"))
+
+
+class RollupStore:
+    """
+    Precomputed OHLCV rollups per asset, persisted as one CSV per asset and level under
+    `directory` with a small rollups.json recording the last base candle folded in.
+
+    Levels finer than the spacing of an asset's base candles are not stored (daily Yahoo
+    candles get 1d, 1w and 1M). append() only recomputes the trailing buckets touched by
+    the new candles, and query() slices a level already close to the number of points
+    requested, so neither depends on the length of the raw history.
+
+    The state and level frames are cached in memory and re-read when their files change
+    on disk, so a long-running web process sees the candles the pipeline appends.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.cache = DatasetCache()
+        self.lock = threading.Lock()
+
+    def root(self):
+        return self.directory or config.ROLLUP_DIR
+
+    def state_path(self):
+        return os.path.join(self.root(), "rollups.json")
+
+    def level_path(self, asset, level):
+        return os.path.join(self.root(), f"{asset}_{level}.csv")
+
+    @staticmethod
+    def read_state(path):
+        with open(path) as f:
+            return json.load(f)
+
+    @staticmethod
+    def read_level(path):
+        df = pd.read_csv(path)
+        df["bucket"] = pd.to_datetime(df["bucket"], utc=True, format="ISO8601")
+        return df
+
+    def load_state(self):
+        """Return the rollups.json contents ({} before the first rollup), re-reading it when it changes."""
+        path = self.state_path()
+        try:
+            return self.cache.get(path, [path], lambda: self.read_state(path))
+        except FileNotFoundError:
+            return {}
+
+    def save_state(self, state):
+        path = self.state_path()
+        write_json(state, path)
+        self.cache.put(path, [path], state)
+
+    def levels(self, asset):
+        return self.load_state().get(asset, {}).get("levels", [])
+
+    def frame(self, asset, level):
+        """Return the rollup of `asset` at `level`, re-reading it only when its CSV changes."""
+        path = self.level_path(asset, level)
+        return self.cache.get(path, [path], lambda: self.read_level(path))
+
+    def write(self, asset, level, df):
+        os.makedirs(self.root(), exist_ok=True)
+        path = self.level_path(asset, level)
+        write_csv(df, path)
+        self.cache.put(path, [path], df)
+
+    def rebuild(self, asset, df, time_column="Date"):
+        """Recompute every rollup of `asset` from its full base OHLCV frame."""
+        rows = base_rows(df, time_column)
+        if rows.empty:
+            return
+        spacing = rows["bucket"].diff().median() if len(rows) > 1 else pd.Timedelta(days=1)
+        stored = [level for level, (duration, _) in LEVELS.items() if duration >= spacing]
+        with self.lock:
+            built = {}
+            for level in stored:
+                source = LEVELS[level][1]
+                built[level] = aggregate(built[source] if source in built else rows, level)
+                self.write(asset, level, built[level])
+            state = self.load_state()
+            state[asset] = {"last_time": rows["bucket"].iloc[-1].isoformat(), "levels": stored}
+            self.save_state(state)
+
+    def append(self, asset, df, time_column="Date"):
+        """
+        Fold base candles newer than the last one already rolled up into every level,
+        recomputing only the trailing buckets they fall into. Unknown assets are rebuilt.
+        Returns the number of new candles.
+        """
+        state = self.load_state()
+        info = state.get(asset)
+        if info is None:
+            self.rebuild(asset, df, time_column)
+            return len(df)
+        times = pd.to_datetime(df[time_column], utc=True)
+        rows = base_rows(df[(times > pd.Timestamp(info["last_time"])).to_numpy()], time_column)
+        if rows.empty:
+            return 0
+        with self.lock:
+            updated = {}
+            for level in info["levels"]:
+                source = LEVELS[level][1]
+                existing = self.frame(asset, level)
+                first = bucket_starts(rows["bucket"].iloc[:1], level).iloc[0]
+                keep = existing[existing["bucket"] < first]
+                if source in updated:
+                    # Rebuild the affected buckets from the already updated finer level.
+                    finer = updated[source]
+                    tail = aggregate(finer[finer["bucket"] >= first], level)
+                else:
+                    # Finest stored level: merge its partial trailing bucket with the new candles.
+                    tail = aggregate(pd.concat([existing[existing["bucket"] >= first], rows], ignore_index=True), level)
+                updated[level] = pd.concat([keep, tail], ignore_index=True)
+                path = self.level_path(asset, level)
+                replace_tail(path, len(existing) - len(keep), tail)
+                self.cache.put(path, [path], updated[level])
+            info["last_time"] = rows["bucket"].iloc[-1].isoformat()
+            self.save_state(state)
+        return len(rows)
+
+    def choose_level(self, asset, start, end, max_points):
+        """
+        Finest stored level with at most about `max_points` buckets over [start, end]; any
+        finer level would only have to be downsampled again.
+        """
+        levels = self.levels(asset)
+        if not levels:
+            raise FileNotFoundError(f"No rollups for {asset}")
+        span = end - start
+        for level in levels:
+            if span / LEVELS[level][0] <= max_points:
+                return level
+        return levels[-1]
+
+    def query(self, asset, start=None, end=None, level=None, max_points=1000):
+        """
+        Return (level, rows) for `asset` between `start` and `end` (inclusive, UTC). When
+        `level` is None, the finest level with at most about `max_points` buckets in the
+        range is used, so multi-year queries are served from weekly or monthly rollups.
+        """
+        levels = self.levels(asset)
+        if not levels:
+            raise FileNotFoundError(f"No rollups for {asset}")
+        if level is None:
+            finest = self.frame(asset, levels[0])
+            lo = start if start is not None else finest["bucket"].iloc[0]
+            hi = end if end is not None else finest["bucket"].iloc[-1]
+            level = self.choose_level(asset, lo, hi, max_points)
+        elif level not in levels:
+            raise ValueError(f"Level '{level}' is not stored for {asset}; available: {', '.join(levels)}")
+        df = self.frame(asset, level)
+        times = df["bucket"]
+        first = 0 if start is None else times.searchsorted(start, side="left")
+        last = len(df) if end is None else times.searchsorted(end, side="right")
+        return level, df.iloc[first:last]
+
+
+# Process-wide store used by preprocessing, analysis and the API.
+store = RollupStore()
+
+
+def get_ohlcv(asset, level, start=None, end=None):
+    """Return the `level` OHLCV rollup of `asset`, optionally limited to [start, end]."""
+    return store.query(asset, start, end, level=level)[1]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the OHLCV rollups from the processed Yahoo data.")
+    parser.add_argument("--asset", default=config.YAHOO_TICKER)
+    args = parser.parse_args()
+    store.rebuild(args.asset, get_dataset("yahoo"))
+    print(f"Rollups for {args.asset} saved to {store.root()}: {', '.join(store.levels(args.asset))}")
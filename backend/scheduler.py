@@ -0,0 +1,328 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import heapq
+import random
+import asyncio
+import hashlib
+import logging
+from config import BASE_DIR, RAW_DATA_DIR, COLLECTION_SCHEDULE, LOG_LEVEL
+
+SCRIPTS_DIR = os.path.join(BASE_DIR, "backend")
+
+# Collector script and raw output files for each source.
+COLLECTORS = {
+    "binance": ("collect_binance.py", ["binance_prices.csv"]),
+    "coingecko": ("collect_coingecko.py", ["coingecko_prices.csv"]),
+    "fear_greed": ("collect_fear_greed.py", ["fear_greed_index.csv"]),
+    "news": ("collect_news.py", ["news_articles.csv"]),
+    "reddit": ("collect_reddit.py", ["reddit_posts.csv"]),
+    "yahoo": ("collect_yahoo.py", ["yahoo_crypto.csv"]),
+}
+
+# Downstream steps to rerun when a source's raw data changes.
+DOWNSTREAM = {
+    "binance": ["preprocess_binance"],
+    "coingecko": ["preprocess_coingecko", "mentions", "features", "analysis"],
+    "fear_greed": ["preprocess_fear_greed", "merge_yahoo_fgi", "features"],
+    "news": ["preprocess_news", "mentions", "features", "search"],
+    "reddit": ["preprocess_reddit", "mentions", "features", "search", "analysis"],
+    "yahoo": ["preprocess_yahoo", "rollups", "merge_yahoo_fgi", "features"],
+}
+
+# Pipeline steps each step reads the output of. A step whose upstream failed (or was
+# itself blocked) in the same pass is blocked instead of running on stale inputs.
+STEP_DEPENDENCIES = {
+    "rollups": ["preprocess_yahoo"],
+    "merge_yahoo_fgi": ["preprocess_yahoo", "preprocess_fear_greed"],
+    "mentions": ["preprocess_coingecko", "preprocess_news", "preprocess_reddit"],
+    "features": ["preprocess_yahoo", "preprocess_fear_greed", "mentions"],
+    "search": ["preprocess_news", "preprocess_reddit"],
+    "analysis": ["preprocess_coingecko", "preprocess_reddit", "mentions"],
+}
+
+
+class SystemClock:
+    """Clock backed by the running event loop."""
+
+    def now(self):
+        return asyncio.get_running_loop().time()
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(seconds)
+
+
+class FakeClock:
+    """
+    Manually advanced clock for tests. Coroutines sleeping on it only wake up when
+    advance() moves the time past their deadline, so hours of schedule can be
+    simulated instantly and deterministically.
+    """
+
+    def __init__(self, start=0.0):
+        self.current = start
+        self.sleepers = []
+        self.counter = 0
+
+    def now(self):
+        return self.current
+
+    async def sleep(self, seconds):
+        future = asyncio.get_running_loop().create_future()
+        self.counter += 1
+        heapq.heappush(self.sleepers, (self.current + max(seconds, 0.0), self.counter, future))
+        await future
+
+    async def settle(self, rounds=20):
+        """Let ready tasks run until they block again."""
+        for _ in range(rounds):
+            await asyncio.sleep(0)
+
+    async def advance(self, seconds):
+        """Move the clock forward, waking every sleeper whose deadline is reached in order."""
+        target = self.current + seconds
+        await self.settle()
+        while self.sleepers and self.sleepers[0][0] <= target:
+            deadline, _, future = heapq.heappop(self.sleepers)
+            self.current = max(self.current, deadline)
+            if not future.done():
+                future.set_result(None)
+            await self.settle()
+        self.current = target
+        await self.settle()
+
+
+class Source:
+    """
+    One collector on its own schedule.
+
+    `collect` is an async callable that raises on failure. `fingerprint` returns a value
+    that changes whenever the collected data changes (by default, a hash of `outputs`).
+    After a failure the source is retried after `retry_delay` seconds, doubling on each
+    consecutive failure up to `max_backoff`, before it returns to its normal interval.
+    """
+
+    def __init__(self, name, collect, interval, jitter=0.0, outputs=None, fingerprint=None,
+                 retry_delay=30.0, max_backoff=3600.0):
+        self.name = name
+        self.collect = collect
+        self.interval = interval
+        self.jitter = jitter
+        self.outputs = outputs or []
+        self.fingerprint = fingerprint or (lambda: hash_files(self.outputs))
+        self.retry_delay = retry_delay
+        self.max_backoff = max_backoff
+        self.failures = 0
+        self.runs = 0
+
+    def next_delay(self, rng):
+        """Seconds to wait before the next run, given the outcome of the last one."""
+        if self.failures:
+            return min(self.max_backoff, self.retry_delay * 2 ** (self.failures - 1))
+        return max(0.0, self.interval + rng.uniform(-self.jitter, self.jitter))
+
+
+def hash_files(paths):
+    """Return a SHA-256 digest over the contents of `paths` (missing files hash as empty)."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.encode("utf-8"))
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+    return digest.hexdigest()
+
+
+def script_collector(script_name, project_root=BASE_DIR):
+    """
+    Return an async callable that runs a collector script in a subprocess, the same way
+    main.py does, and raises RuntimeError if it exits with a non-zero status.
+    """
+    script_path = os.path.join(SCRIPTS_DIR, script_name)
+
+    async def collect():
+        env = os.environ.copy()
+        current_pythonpath = env.get("PYTHONPATH", "")
+        env["PYTHONPATH"] = project_root + (os.pathsep + current_pythonpath if current_pythonpath else "")
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, script_path, cwd=project_root, env=env,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise RuntimeError(f"{script_name} exited with {process.returncode}: {stderr.decode(errors='replace')}")
+
+    return collect
+
+
+def default_pipeline_steps():
+    """
+    Return the ordered {step_name: callable} mapping of downstream steps. Order matters:
+    rollups folds in the candles preprocess_yahoo published, merge_yahoo_fgi reads the
+    outputs of preprocess_yahoo and preprocess_fear_greed, mentions reads the processed
+    CoinGecko, news and Reddit files that analysis relies on, features folds the snapshot
+    history, Yahoo, FGI and mention counts into the combined feature table, and search
+    indexes the new news articles and Reddit posts.
+    """
+    from backend import preprocess_data, mentions, features, search, analysis
+    return {
+        "preprocess_yahoo": preprocess_data.preprocess_yahoo,
+        "rollups": preprocess_data.update_rollups,
+        "preprocess_fear_greed": preprocess_data.preprocess_fear_greed,
+        "merge_yahoo_fgi": preprocess_data.merge_yahoo_fgi,
+        "preprocess_binance": preprocess_data.preprocess_binance,
+        "preprocess_coingecko": preprocess_data.preprocess_coingecko,
+        "preprocess_news": preprocess_data.preprocess_news,
+        "preprocess_reddit": preprocess_data.preprocess_reddit,
+        "mentions": mentions.extract_mention_counts,
+        "features": features.update_features,
+        "search": search.update_search_index,
+        "analysis": analysis.main,
+    }
+
+
+def default_sources(schedule=COLLECTION_SCHEDULE):
+    """Build a Source for every collector from the per-source settings in config.COLLECTION_SCHEDULE."""
+    sources = []
+    for name, (script_name, outputs) in COLLECTORS.items():
+        settings = schedule[name]
+        sources.append(Source(
+            name,
+            script_collector(script_name),
+            interval=settings["interval"],
+            jitter=settings.get("jitter", 0.0),
+            outputs=[os.path.join(RAW_DATA_DIR, output) for output in outputs],
+            retry_delay=settings.get("retry_delay", 30.0),
+            max_backoff=settings.get("max_backoff", 3600.0),
+        ))
+    return sources
+
+
+class Scheduler:
+    """
+    Single-process collection daemon. Every source runs in its own asyncio task on its
+    own interval; when a run changes a source's data, the source's downstream steps are
+    marked dirty and a single pipeline task runs the dirty steps in pipeline order.
+    Changes that arrive while the pipeline is busy are coalesced into the next pass.
+
+    `pipeline_steps` maps step names to synchronous callables that signal failure by
+    raising or by returning None or False. A failed step blocks the steps that depend on
+    it (`dependencies`) for the rest of the pass; both stay dirty and are retried with
+    the next pass. With `offload=True` they
+    (and file fingerprinting) run in a worker thread so that slow preprocessing never
+    delays the collectors' timers; tests driving a FakeClock pass `offload=False` so
+    that everything runs inline on the event loop.
+    """
+
+    def __init__(self, sources, pipeline_steps, downstream=DOWNSTREAM, dependencies=STEP_DEPENDENCIES,
+                 clock=None, seed=None, offload=True):
+        self.sources = sources
+        self.pipeline_steps = pipeline_steps
+        self.downstream = downstream
+        self.dependencies = dependencies
+        self.clock = clock or SystemClock()
+        self.rng = random.Random(seed)
+        self.fingerprints = {}
+        self.dirty = set()
+        self.dirty_event = None
+        self.history = []
+        self.offload = offload
+
+    async def run_blocking(self, func):
+        if self.offload:
+            return await asyncio.to_thread(func)
+        return func()
+
+    def mark_dirty(self, source_name):
+        self.dirty.update(self.downstream.get(source_name, []))
+        self.dirty_event.set()
+
+    async def collect_once(self, source):
+        """
+        Run one collection for `source`. Returns True if its data changed.
+        Failures are logged and counted towards the source's backoff.
+        """
+        source.runs += 1
+        try:
+            await source.collect()
+        except Exception as e:
+            source.failures += 1
+            logging.warning("Collector %s failed (%d in a row): %s", source.name, source.failures, e)
+            self.history.append((self.clock.now(), source.name, "failed"))
+            return False
+        source.failures = 0
+        fingerprint = await self.run_blocking(source.fingerprint)
+        changed = self.fingerprints.get(source.name) != fingerprint
+        self.fingerprints[source.name] = fingerprint
+        self.history.append((self.clock.now(), source.name, "changed" if changed else "unchanged"))
+        if changed:
+            logging.info("Source %s changed; scheduling %s", source.name, self.downstream.get(source.name, []))
+            self.mark_dirty(source.name)
+        return changed
+
+    async def run_source(self, source):
+        while True:
+            await self.collect_once(source)
+            await self.clock.sleep(source.next_delay(self.rng))
+
+    async def run_pipeline(self):
+        while True:
+            await self.dirty_event.wait()
+            self.dirty_event.clear()
+            steps = [name for name in self.pipeline_steps if name in self.dirty]
+            self.dirty.difference_update(steps)
+            unsuccessful = set()
+            for name in steps:
+                upstream = sorted(set(self.dependencies.get(name, [])) & unsuccessful)
+                if upstream:
+                    logging.warning("Pipeline step %s blocked by %s", name, ", ".join(upstream))
+                    outcome = "blocked"
+                else:
+                    outcome = await self.run_step(name)
+                self.history.append((self.clock.now(), name, outcome))
+                if outcome != "ran":
+                    unsuccessful.add(name)
+            # Failed and blocked steps run again with the next pass.
+            self.dirty.update(unsuccessful)
+
+    async def run_step(self, name):
+        """Run one pipeline step and return "ran" or "failed"."""
+        try:
+            result = await self.run_blocking(self.pipeline_steps[name])
+        except Exception:
+            logging.exception("Pipeline step %s failed", name)
+            return "failed"
+        if result is None or result is False:
+            logging.warning("Pipeline step %s failed", name)
+            return "failed"
+        return "ran"
+
+    async def run(self):
+        """Run every source and the pipeline until cancelled."""
+        self.dirty_event = asyncio.Event()
+        tasks = [asyncio.create_task(self.run_source(source), name=f"collect-{source.name}")
+                 for source in self.sources]
+        tasks.append(asyncio.create_task(self.run_pipeline(), name="pipeline"))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def run_daemon():
+    """Start the collection daemon with the default collectors and pipeline steps."""
+    logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(message)s")
+    scheduler = Scheduler(default_sources(), default_pipeline_steps())
+    try:
+        asyncio.run(scheduler.run())
+    except KeyboardInterrupt:
+        print("Scheduler stopped.")
+
+
+if __name__ == "__main__":
+    run_daemon()
@@ -0,0 +1,291 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import ast
+import numpy as np
+import pandas as pd
+from config import QUARANTINE_DIR
+from backend.checkpoints import write_csv
+
+NUMERIC_DTYPES = {"float32", "float64", "int8", "int16", "int32", "int64"}
+
+
+class Column:
+    """
+    Declares one column of a dataset.
+
+    dtype is one of "float32", "float64", "int8".."int64", "category", "string" or
+    "datetime" (UTC, optionally parsed from epoch numbers with `unit`, e.g. "s").
+    Integer columns cannot hold missing values, so `nullable` must be False for them.
+    """
+
+    def __init__(self, name, dtype, nullable=True, min_value=None, max_value=None, unit=None):
+        self.name = name
+        self.dtype = dtype
+        self.nullable = nullable
+        self.min_value = min_value
+        self.max_value = max_value
+        self.unit = unit
+
+
+class Schema:
+    """
+    Declares a dataset: its columns, the columns whose combination must be unique, and an
+    optional `prepare(df)` hook that reshapes the raw frame (e.g. expands nested fields)
+    before the checks run; it may change columns but must keep the rows and their order.
+    Columns not declared in the schema are passed through untouched.
+    """
+
+    def __init__(self, name, columns, unique=None, prepare=None):
+        self.name = name
+        self.columns = columns
+        self.unique = unique or []
+        self.prepare = prepare
+
+
+def non_empty(values):
+    """Boolean mask of entries that are present and not an empty string."""
+    present = values.notna().to_numpy()
+    if pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values):
+        present = present & (values != "").to_numpy(dtype=bool, na_value=False)
+    return present
+
+
+def coerce_column(values, column):
+    """Convert a Series to the column's logical type, turning unparseable entries into NaN/NaT."""
+    if column.dtype in NUMERIC_DTYPES:
+        return pd.to_numeric(values, errors="coerce")
+    if column.dtype == "datetime":
+        if column.unit is not None:
+            return pd.to_datetime(pd.to_numeric(values, errors="coerce"), unit=column.unit, utc=True, errors="coerce")
+        return pd.to_datetime(values, utc=True, errors="coerce", format="ISO8601")
+    # Empty strings are as good as missing for text columns.
+    return values.where(non_empty(values))
+
+
+def downcast(df, schema):
+    """Cast validated columns to their compact declared dtypes."""
+    for column in schema.columns:
+        if column.name not in df.columns or column.dtype == "datetime":
+            continue
+        if column.dtype == "string":
+            df[column.name] = df[column.name].astype("string")
+        else:
+            df[column.name] = df[column.name].astype(column.dtype)
+    return df
+
+
+def validate(df, schema):
+    """
+    Validate a whole frame against `schema` with vectorized checks.
+
+    Every column is coerced to its declared type; rows with unparseable values, missing
+    required values, out-of-range values or duplicate unique keys are moved to a
+    quarantine frame with a `quarantine_reason` column. Returns (clean, quarantined),
+    where `clean` is downcast to the schema's compact dtypes and `quarantined` keeps the
+    rows exactly as they came in, so they can be inspected and replayed.
+    """
+    raw = df
+    if schema.prepare is not None:
+        df = schema.prepare(df)
+
+    missing = [column.name for column in schema.columns if column.name not in df.columns]
+    if missing:
+        raise ValueError(f"{schema.name}: missing columns {missing}")
+
+    # (mask, reason) for every check that rejected at least one row.
+    failed = []
+
+    def flag(mask, reason):
+        if isinstance(mask, pd.Series):
+            mask = mask.fillna(False)
+        mask = np.asarray(mask, dtype=bool)
+        if mask.any():
+            failed.append((mask, reason))
+
+    # Coerced columns go into a shallow copy, so the input frame is left as it was.
+    coerced_df = df.copy(deep=False)
+    for column in schema.columns:
+        original = df[column.name]
+        coerced = coerce_column(original, column)
+        # A column the CSV parser already typed numerically cannot hold unparseable entries.
+        if not (column.dtype in NUMERIC_DTYPES and pd.api.types.is_numeric_dtype(original)):
+            flag(non_empty(original) & coerced.isna().to_numpy(), f"{column.name}: not a valid {column.dtype}")
+        if not column.nullable:
+            flag(coerced.isna(), f"{column.name}: missing")
+        if column.min_value is not None:
+            flag(coerced < column.min_value, f"{column.name}: below {column.min_value}")
+        if column.max_value is not None:
+            flag(coerced > column.max_value, f"{column.name}: above {column.max_value}")
+        coerced_df[column.name] = coerced
+
+    if schema.unique:
+        flag(coerced_df.duplicated(subset=schema.unique, keep="first"), f"duplicate {'/'.join(schema.unique)}")
+
+    bad = np.zeros(len(df), dtype=bool)
+    for mask, _ in failed:
+        bad |= mask
+    rows = np.flatnonzero(bad)
+    # Reasons are only assembled for the rejected rows.
+    reasons = np.full(len(rows), "", dtype=object)
+    for mask, reason in failed:
+        hit = mask[rows]
+        reasons[hit] = reasons[hit] + reason + "; "
+    quarantined = raw.iloc[rows].copy()
+    quarantined["quarantine_reason"] = [text.rstrip("; ") for text in reasons]
+    clean = downcast(coerced_df[~bad].reset_index(drop=True), schema)
+    return clean, quarantined
+
+
+def write_quarantine(quarantined, name, quarantine_dir=None):
+    """
+    Save quarantined rows to QUARANTINE_DIR/<name>_quarantine.csv (removing a stale file
+    when there is nothing to quarantine) and print a short summary.
+    """
+    quarantine_dir = quarantine_dir or QUARANTINE_DIR
+    path = os.path.join(quarantine_dir, f"{name}_quarantine.csv")
+    if quarantined.empty:
+        if os.path.exists(path):
+            os.remove(path)
+        return None
+    os.makedirs(quarantine_dir, exist_ok=True)
+    write_csv(quarantined, path)
+    print(f"Quarantined {len(quarantined)} {name} row(s) to {path}")
+    return path
+
+
+def read_validated(path, schema, usecols=None):
+    """
+    Read a CSV that was written after validation with `schema`, applying the schema's
+    dtypes while parsing so that no coercion pass is needed afterwards.
+    """
+    declared = {column.name: column for column in schema.columns}
+    header = pd.read_csv(path, nrows=0).columns
+    dtypes, dates = {}, []
+    for name in header:
+        if usecols is not None and name not in usecols:
+            continue
+        column = declared.get(name)
+        if column is None:
+            continue
+        if column.dtype == "datetime":
+            dates.append(name)
+        elif column.dtype == "string":
+            dtypes[name] = "string"
+        else:
+            dtypes[name] = column.dtype
+    df = pd.read_csv(path, usecols=usecols, dtype=dtypes)
+    for name in dates:
+        df[name] = pd.to_datetime(df[name], utc=True, format="ISO8601")
+    return df
+
+
+def expand_roi(df):
+    """
+    CoinGecko returns `roi` as a nested object, which lands in the CSV as a stringified
+    dict. Replace it with flat roi_times / roi_currency / roi_percentage columns.
+    """
+    if "roi" not in df.columns:
+        return df
+    df = df.copy()
+    parsed = {}
+    for text in df["roi"].dropna().unique():
+        try:
+            value = ast.literal_eval(text) if isinstance(text, str) else text
+        except (ValueError, SyntaxError):
+            value = None
+        parsed[text] = value if isinstance(value, dict) else {}
+    roi = df["roi"].map(parsed)
+    for field in ("times", "currency", "percentage"):
+        df[f"roi_{field}"] = roi.map(lambda d: d.get(field) if isinstance(d, dict) else None)
+    return df.drop(columns=["roi"])
+
+
+SCHEMAS = {
+    "yahoo": Schema("yahoo", [
+        Column("Date", "datetime", nullable=False),
+        Column("Open", "float64", nullable=False, min_value=0),
+        Column("High", "float64", nullable=False, min_value=0),
+        Column("Low", "float64", nullable=False, min_value=0),
+        Column("Close", "float64", nullable=False, min_value=0),
+        Column("Volume", "float64", nullable=False, min_value=0),
+    ], unique=["Date"]),
+    "fear_greed": Schema("fear_greed", [
+        Column("value", "int8", nullable=False, min_value=0, max_value=100),
+        Column("value_classification", "category", nullable=False),
+        Column("timestamp", "int64", nullable=False, min_value=0),
+        Column("time_until_update", "float32"),
+    ], unique=["timestamp"]),
+    "binance": Schema("binance", [
+        Column("symbol", "string", nullable=False),
+        Column("price", "float64", nullable=False, min_value=0),
+    ], unique=["symbol"]),
+    "coingecko": Schema("coingecko", [
+        Column("id", "string", nullable=False),
+        Column("symbol", "string", nullable=False),
+        Column("name", "string", nullable=False),
+        Column("current_price", "float64", min_value=0),
+        Column("market_cap", "float64", min_value=0),
+        Column("market_cap_rank", "float32", min_value=1),
+        Column("fully_diluted_valuation", "float64", min_value=0),
+        Column("total_volume", "float64", min_value=0),
+        Column("high_24h", "float64", min_value=0),
+        Column("low_24h", "float64", min_value=0),
+        Column("price_change_24h", "float64"),
+        Column("price_change_percentage_24h", "float32"),
+        Column("market_cap_change_24h", "float64"),
+        Column("market_cap_change_percentage_24h", "float32"),
+        Column("circulating_supply", "float64", min_value=0),
+        Column("total_supply", "float64", min_value=0),
+        Column("max_supply", "float64", min_value=0),
+        Column("ath", "float64", min_value=0),
+        Column("ath_change_percentage", "float32"),
+        Column("ath_date", "datetime"),
+        Column("atl", "float64", min_value=0),
+        Column("atl_change_percentage", "float32"),
+        Column("atl_date", "datetime"),
+        Column("roi_times", "float64"),
+        Column("roi_currency", "category"),
+        Column("roi_percentage", "float64"),
+        Column("last_updated", "datetime"),
+    ], unique=["id"], prepare=expand_roi),
+    "news": Schema("news", [
+        Column("source", "category"),
+        Column("title", "string", nullable=False),
+        Column("url", "string", nullable=False),
+        Column("publishedAt", "datetime", nullable=False),
+    ], unique=["url"]),
+    "reddit": Schema("reddit", [
+        Column("keyword", "category", nullable=False),
+        Column("title", "string", nullable=False),
+        Column("score", "int64", nullable=False),
+        Column("url", "string"),
+        Column("num_comments", "int32", nullable=False, min_value=0),
+        Column("created", "datetime", nullable=False, unit="s"),
+        Column("author", "category"),
+        Column("subreddit", "category"),
+    ], unique=["keyword", "url", "created"]),
+    "mentions": Schema("mentions", [
+        Column("bucket", "datetime", nullable=False),
+        Column("asset_id", "category", nullable=False),
+        Column("source", "category", nullable=False),
+        Column("mentions", "int32", nullable=False, min_value=0),
+        Column("sentiment", "float32", min_value=-1, max_value=1),
+    ], unique=["bucket", "asset_id", "source"]),
+    "features": Schema("features", [
+        Column("asset_id", "category", nullable=False),
+        Column("bucket", "datetime", nullable=False),
+        Column("price", "float64", min_value=0),
+        Column("change_24h_pct", "float32"),
+        Column("volume", "float64", min_value=0),
+        Column("market_cap", "float64", min_value=0),
+        Column("log_return", "float64"),
+        Column("fgi_value", "float32", min_value=0, max_value=100),
+        Column("reddit_mentions", "float32", min_value=0),
+        Column("reddit_sentiment", "float32", min_value=-1, max_value=1),
+        Column("news_mentions", "float32", min_value=0),
+        Column("news_sentiment", "float32", min_value=-1, max_value=1),
+    ], unique=["asset_id", "bucket"]),
+}
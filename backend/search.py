@@ -0,0 +1,360 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import re
+import html
+import json
+import argparse
+import sqlite3
+import threading
+import pandas as pd
+import config
+from backend.checkpoints import file_hash
+from backend.dataset_registry import get_dataset, registry
+from backend.mentions import build_automaton, document_text
+
+# Source name -> (registry dataset, time column, title column, body columns) indexed for search.
+SEARCH_SOURCES = {
+    "news": ("news", "publishedAt", "title", ["description", "content"]),
+    "reddit": ("reddit", "created", "title", []),
+}
+
+# Rows read from a processed file per batch while indexing.
+CHUNK_SIZE = 5000
+# Markers wrapped around matched terms in snippets (replaced before they reach a client).
+MATCH_START, MATCH_END = "\x02", "\x03"
+# Title matches weigh more than matches in the description or content.
+TITLE_WEIGHT, BODY_WEIGHT = 4.0, 1.0
+# Document ids are the publication time in epoch seconds shifted left by ID_SHIFT bits plus
+# a sequence number, so id (and FTS5 rowid) order is publication order.
+ID_SHIFT = 20
+# Stored as PRAGMA user_version; an index built by an older layout is rebuilt on update.
+INDEX_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    published INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL,
+    url TEXT,
+    assets TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_published ON documents (published);
+CREATE TABLE IF NOT EXISTS document_assets (
+    asset_id TEXT NOT NULL,
+    published INTEGER NOT NULL,
+    doc_id INTEGER NOT NULL,
+    PRIMARY KEY (asset_id, published, doc_id)
+) WITHOUT ROWID;
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, body, content='documents', content_rowid='id', tokenize='porter unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS indexed_files (
+    source TEXT PRIMARY KEY,
+    hash TEXT NOT NULL
+);
+"""
+
+
+def epoch_seconds(value):
+    timestamp = pd.Timestamp(value)
+    timestamp = timestamp.tz_localize("UTC") if timestamp.tzinfo is None else timestamp.tz_convert("UTC")
+    return int(timestamp.timestamp())
+
+
+def match_expression(query):
+    """
+    Turn free text into an FTS5 MATCH expression: words and "quoted phrases" must all
+    match, a trailing * matches a prefix and OR between two terms matches either. Any
+    other FTS5 syntax is treated as plain text, so user input can never be a syntax error.
+    Returns None when the query has no searchable terms.
+    """
+    terms = []
+    for token in re.findall(r'"[^"]*"|[^\s"]+', query or ""):
+        if token == "OR":
+            if terms and terms[-1] != "OR":
+                terms.append(token)
+            continue
+        prefix = token.endswith("*") and not token.startswith('"')
+        words = re.findall(r"\w+", token)
+        if not words:
+            continue
+        terms.append('"' + " ".join(words) + '"' + ("*" if prefix else ""))
+    if terms and terms[-1] == "OR":
+        terms.pop()
+    return " ".join(terms) or None
+
+
+def snippet_text(snippet):
+    """Snippet as plain text, and as HTML with the matched terms wrapped in <mark>."""
+    plain = snippet.replace(MATCH_START, "").replace(MATCH_END, "")
+    marked = html.escape(snippet).replace(MATCH_START, "<mark>").replace(MATCH_END, "</mark>")
+    return plain, marked
+
+
+class SearchIndex:
+    """
+    Full-text index over the processed news articles and Reddit posts in a SQLite
+    database with an FTS5 table (SEARCH_INDEX in config.py).
+
+    update() appends only the documents it has not seen (keyed by URL and publication
+    time) and skips a source entirely while its processed file is unchanged. Every
+    document is tagged with the assets the mention automaton finds in it, so queries can
+    filter by asset and date through indexes instead of loading the corpus into pandas.
+    Assets listed by CoinGecko after a document was indexed are only tagged after a
+    rebuild (`python backend/search.py --rebuild`).
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def db_path(self):
+        return self.path or config.SEARCH_INDEX
+
+    def connect(self, readonly=False):
+        if readonly:
+            if not os.path.exists(self.db_path()):
+                raise FileNotFoundError(self.db_path())
+            return sqlite3.connect(f"file:{self.db_path()}?mode=ro", uri=True)
+        conn = sqlite3.connect(self.db_path())
+        # WAL lets the web app query while the pipeline is adding documents.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        conn.execute("INSERT INTO documents_fts(documents_fts, rank) VALUES ('rank', ?)",
+                     (f"bm25({TITLE_WEIGHT}, {BODY_WEIGHT})",))
+        conn.commit()
+        return conn
+
+    def version(self):
+        """The INDEX_VERSION the database was built with (0 if it predates versioning)."""
+        conn = self.connect(readonly=True)
+        try:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+        finally:
+            conn.close()
+
+    def update(self, rebuild=False):
+        """
+        Index new documents of every source (all of them with `rebuild`). Returns the
+        number of documents added.
+        """
+        with self.lock:
+            if not rebuild and os.path.exists(self.db_path()) and self.version() != INDEX_VERSION:
+                print(f"Search index {self.db_path()} has an old layout; rebuilding it.")
+                rebuild = True
+            if rebuild and os.path.exists(self.db_path()):
+                for suffix in ("", "-wal", "-shm"):
+                    if os.path.exists(self.db_path() + suffix):
+                        os.remove(self.db_path() + suffix)
+            os.makedirs(os.path.dirname(self.db_path()), exist_ok=True)
+            conn = self.connect()
+            try:
+                conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+                indexed = dict(conn.execute("SELECT source, hash FROM indexed_files"))
+                automaton = None
+                added = 0
+                for source, (dataset, time_column, title_column, body_columns) in SEARCH_SOURCES.items():
+                    signature = file_hash(registry.source_path(dataset))
+                    if signature is None or indexed.get(source) == signature:
+                        continue
+                    if automaton is None:
+                        automaton = self.load_automaton()
+                    for chunk in registry.iter_batches(dataset, [time_column, title_column, "url", *body_columns],
+                                                       CHUNK_SIZE):
+                        added += self.add_documents(conn, source, chunk, time_column, title_column,
+                                                    body_columns, automaton)
+                    conn.execute("INSERT OR REPLACE INTO indexed_files (source, hash) VALUES (?, ?)", (source, signature))
+                    conn.commit()
+                # Fold the write-ahead log back so the database file alone is complete.
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                return added
+            finally:
+                conn.close()
+
+    def load_automaton(self):
+        try:
+            return build_automaton(get_dataset("coingecko"))
+        except FileNotFoundError:
+            print("CoinGecko data not found; documents are indexed without asset tags.")
+            return None
+
+    @staticmethod
+    def next_id(conn, published):
+        """First free document id of the publication second `published`."""
+        base = published << ID_SHIFT
+        last = conn.execute("SELECT max(id) FROM documents WHERE id >= ? AND id < ?",
+                            (base, base + (1 << ID_SHIFT))).fetchone()[0]
+        return base if last is None else last + 1
+
+    def add_documents(self, conn, source, chunk, time_column, title_column, body_columns, automaton):
+        """Insert the documents of `chunk` that are not indexed yet; returns how many were added."""
+        published = pd.to_datetime(chunk[time_column], utc=True, errors="coerce", format="ISO8601")
+        chunk = chunk[published.notna() & chunk[title_column].notna()]
+        published = published[chunk.index]
+        seconds = ((published - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)).tolist()
+        titles = chunk[title_column].astype(str).tolist()
+        bodies = (document_text(chunk, body_columns).tolist() if body_columns else [""] * len(chunk))
+        urls = chunk["url"].astype(object).where(chunk["url"].notna(), None).tolist() if "url" in chunk.columns \
+            else [None] * len(chunk)
+        keys = [f"{source}:{url or title}:{when}" for title, url, when in zip(titles, urls, seconds)]
+        # A changed file is mostly documents indexed before; skip them before the automaton runs.
+        known = {row[0] for row in conn.execute("SELECT key FROM documents WHERE key IN (SELECT value FROM json_each(?))",
+                                                (json.dumps(keys),))}
+        added = 0
+        for key, title, body, url, when in zip(keys, titles, bodies, urls, seconds):
+            if key in known:
+                continue
+            known.add(key)
+            assets = []
+            if automaton is not None:
+                assets = sorted(automaton.asset_ids[i] for i in automaton.scan(title + "\n" + body))
+            doc_id = self.next_id(conn, when)
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO documents (id, key, source, published, title, body, url, assets) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (doc_id, key, source, when, title, body, url, ",".join(assets)))
+            if not cursor.rowcount:
+                continue
+            conn.execute("INSERT INTO documents_fts (rowid, title, body) VALUES (?, ?, ?)", (doc_id, title, body))
+            conn.executemany("INSERT INTO document_assets (asset_id, published, doc_id) VALUES (?, ?, ?)",
+                             [(asset, when, doc_id) for asset in assets])
+            added += 1
+        return added
+
+    def search(self, query=None, assets=None, start=None, end=None, sources=None, limit=20, offset=0):
+        """
+        Documents matching `query`, or the newest documents when there is no query.
+        `assets` (CoinGecko ids), `start`/`end` (inclusive timestamps) and `sources`
+        narrow the results. Returns a list of dicts with source, title, url, published
+        (ISO), assets, snippet and snippet_html.
+
+        Ranking is BM25 with title matches weighted higher, over every document that
+        matches the query and filters; ties go to the newer document. Only the requested
+        page is kept while the matches are scored, and snippets are built for that page
+        alone, so a common word like "bitcoin" costs one score per matching document.
+        """
+        expression = match_expression(query)
+        if query and expression is None:
+            raise ValueError("The query has no searchable terms")
+        unknown = [source for source in sources or [] if source not in SEARCH_SOURCES]
+        if unknown:
+            raise ValueError(f"Unknown sources: {', '.join(unknown)}")
+        params = {"match": expression, "limit": limit, "offset": offset}
+        conditions = []
+        if start is not None:
+            conditions.append("d.published >= :start")
+            params["start"] = epoch_seconds(start)
+        if end is not None:
+            conditions.append("d.published <= :end")
+            params["end"] = epoch_seconds(end)
+        source_condition = None
+        if sources:
+            params.update({f"source{i}": source for i, source in enumerate(sources)})
+            source_condition = f"d.source IN ({', '.join(f':source{i}' for i in range(len(sources)))})"
+            conditions.append(source_condition)
+        asset_list = ""
+        if assets:
+            params.update({f"asset{i}": asset for i, asset in enumerate(assets)})
+            asset_list = ", ".join(f":asset{i}" for i in range(len(assets)))
+        columns = "d.source, d.title, d.url, d.published, d.assets"
+
+        if expression is not None:
+            # Ids carry the publication second, so the date range is a rowid range FTS5
+            # applies while reading the matches and the asset filter is a primary-key lookup
+            # per match in document_assets; only a source filter needs the documents row.
+            ranked = []
+            if start is not None:
+                ranked.append("documents_fts.rowid >= :first_id")
+                params["first_id"] = params["start"] << ID_SHIFT
+            if end is not None:
+                ranked.append("documents_fts.rowid < :after_id")
+                params["after_id"] = (params["end"] + 1) << ID_SHIFT
+            if assets:
+                ranked.append(f"EXISTS (SELECT 1 FROM document_assets a WHERE a.asset_id IN ({asset_list}) "
+                              f"AND a.published = documents_fts.rowid >> {ID_SHIFT} AND a.doc_id = documents_fts.rowid)")
+            if source_condition:
+                ranked.append(source_condition)
+            where = "".join(" AND " + condition for condition in ranked)
+            # Score every match but keep only the requested page: ordering by score and id
+            # is not an order FTS5 produces itself, so SQLite sorts with a bounded sorter
+            # instead of FTS5 materialising all matches in rank order. The CROSS JOINs make
+            # the page drive the snippet lookups (one rowid lookup each) rather than a second
+            # pass over every match.
+            matches = "documents_fts JOIN documents d ON d.id = documents_fts.rowid" if sources else "documents_fts"
+            sql = f"""
+                SELECT {columns}, snippet(documents_fts, -1, '{MATCH_START}', '{MATCH_END}', '…', 24)
+                FROM (SELECT documents_fts.rowid AS id, documents_fts.rank AS score
+                      FROM {matches}
+                      WHERE documents_fts MATCH :match{where}
+                      ORDER BY score, id DESC LIMIT :limit OFFSET :offset) c
+                CROSS JOIN documents d ON d.id = c.id
+                CROSS JOIN documents_fts ON documents_fts.rowid = c.id
+                WHERE documents_fts MATCH :match
+                ORDER BY c.score, c.id DESC"""
+        elif assets:
+            # Read the newest page of each asset backwards along the (asset_id, published)
+            # key instead of scanning documents, then merge the pages.
+            where = "".join(" AND " + condition for condition in conditions).replace("d.published", "a.published")
+            params["window"] = limit + offset
+            newest = " UNION ".join(
+                f"SELECT * FROM (SELECT a.doc_id FROM document_assets a JOIN documents d ON d.id = a.doc_id "
+                f"WHERE a.asset_id = :asset{i}{where} ORDER BY a.published DESC LIMIT :window)"
+                for i in range(len(assets)))
+            sql = f"""
+                SELECT {columns}, substr(d.body, 1, 200) FROM documents d
+                WHERE d.id IN ({newest}) ORDER BY d.published DESC LIMIT :limit OFFSET :offset"""
+        else:
+            where = " AND ".join(conditions) or "1"
+            sql = f"""
+                SELECT {columns}, substr(d.body, 1, 200) FROM documents d
+                WHERE {where} ORDER BY d.published DESC LIMIT :limit OFFSET :offset"""
+
+        conn = self.connect(readonly=True)
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+        results = []
+        for source, title, url, published, tagged, snippet in rows:
+            plain, marked = snippet_text(snippet or "")
+            results.append({
+                "source": source, "title": title, "url": url,
+                "published": pd.Timestamp(published, unit="s", tz="UTC").isoformat(),
+                "assets": tagged.split(",") if tagged else [],
+                "snippet": plain, "snippet_html": marked,
+            })
+        return results
+
+
+# Process-wide index maintained by the pipeline and queried by the web app.
+index = SearchIndex()
+
+
+def update_search_index(rebuild=False):
+    """Add newly collected news articles and Reddit posts to the search index."""
+    try:
+        added = index.update(rebuild)
+    except sqlite3.Error as e:
+        print(f"Error updating the search index: {e}")
+        return False
+    print(f"Search index {index.db_path()} updated ({added} new documents)")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Update or query the news and Reddit search index.")
+    parser.add_argument("--rebuild", action="store_true", help="Re-index every document from scratch.")
+    parser.add_argument("--query", help="Search the index instead of updating it.")
+    parser.add_argument("--assets", nargs="*", help="Only documents mentioning these CoinGecko ids.")
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+    if args.query is None:
+        sys.exit(0 if update_search_index(args.rebuild) else 1)
+    for hit in index.search(args.query, assets=args.assets, limit=args.limit):
+        print(f"{hit['published'][:10]}  [{hit['source']}] {hit['title']}")
+        print(f"    {hit['snippet']}")
@@ -0,0 +1,271 @@
+import hashlib
+from collections import deque
+import numpy as np
+
+
+def stable_hash(value, seed=0, count=1):
+    """
+    Return `count` 64-bit hashes of `value` that are identical in every process (unlike
+    the salted built-in hash()), so sketches built by different workers can be merged.
+    """
+    data = value if isinstance(value, bytes) else str(value).encode("utf-8")
+    digest = hashlib.blake2b(data, digest_size=8 * count, salt=seed.to_bytes(16, "little")).digest()
+    return np.frombuffer(digest, dtype="<u8")
+
+
+class CountMinSketch:
+    """
+    Frequency estimates for an unbounded set of keys in a fixed `depth` x `width` table.
+    Estimates never undercount; with total count N they overcount by at most
+    e * N / width with probability 1 - exp(-depth).
+    """
+
+    def __init__(self, width=2048, depth=4, seed=0):
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+        self.rows = np.arange(depth)
+
+    def columns(self, key):
+        return (stable_hash(key, self.seed, self.depth) % np.uint64(self.width)).astype(np.intp)
+
+    def add(self, key, count=1):
+        self.table[self.rows, self.columns(key)] += count
+        self.total += count
+
+    def estimate(self, key):
+        return int(self.table[self.rows, self.columns(key)].min())
+
+    def merge(self, other):
+        """Add another sketch built with the same width, depth and seed into this one."""
+        if (self.width, self.depth, self.seed) != (other.width, other.depth, other.seed):
+            raise ValueError("Count-Min sketches must share width, depth and seed to be merged")
+        self.table += other.table
+        self.total += other.total
+        return self
+
+
+class HyperLogLog:
+    """
+    Cardinality estimate of a stream of values in 2**precision one-byte registers
+    (standard error about 1.04 / sqrt(2**precision)).
+    """
+
+    def __init__(self, precision=10, seed=0):
+        self.precision = precision
+        self.seed = seed
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, value):
+        h = int(stable_hash(value, self.seed)[0])
+        index = h >> (64 - self.precision)
+        rest = (h << self.precision) & ((1 << 64) - 1)
+        # Position of the leftmost 1-bit in the remaining 64 - precision bits.
+        rank = min(64 - rest.bit_length() + 1, 64 - self.precision + 1)
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities.
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+    def merge(self, other):
+        if (self.precision, self.seed) != (other.precision, other.seed):
+            raise ValueError("HyperLogLogs must share precision and seed to be merged")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+
+class SpaceSaving:
+    """
+    Heavy hitters of a stream in at most `capacity` counters. Any key whose true count
+    exceeds N / capacity is guaranteed to be tracked, and each reported count overstates
+    the true one by at most the key's recorded error.
+    """
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+
+    def add(self, key, count=1):
+        if key in self.counts:
+            self.counts[key] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = count
+            self.errors[key] = 0
+        else:
+            # Replace the smallest counter; the newcomer inherits its count as error.
+            smallest = min(self.counts, key=self.counts.get)
+            floor = self.counts.pop(smallest)
+            self.errors.pop(smallest)
+            self.counts[key] = floor + count
+            self.errors[key] = floor
+
+    def top(self, k):
+        """Return the `k` largest (key, count) pairs, largest first."""
+        return sorted(self.counts.items(), key=lambda item: (-item[1], str(item[0])))[:k]
+
+    def merge(self, other):
+        """Combine two summaries, keeping the `capacity` largest counters."""
+        counts, errors = dict(self.counts), dict(self.errors)
+        for key, count in other.counts.items():
+            counts[key] = counts.get(key, 0) + count
+            errors[key] = errors.get(key, 0) + other.errors[key]
+        keep = sorted(counts, key=lambda key: (-counts[key], str(key)))[:self.capacity]
+        self.counts = {key: counts[key] for key in keep}
+        self.errors = {key: errors[key] for key in keep}
+        return self
+
+
+class MentionBucket:
+    """Mention frequency, heavy hitters and unique authors per asset for one time bucket."""
+
+    def __init__(self, start, settings):
+        self.start = start
+        self.settings = settings
+        self.frequencies = CountMinSketch(settings["cms_width"], settings["cms_depth"])
+        self.heavy_hitters = SpaceSaving(settings["heavy_hitters"])
+        self.authors = {}
+
+    def add(self, asset, author=None, count=1):
+        self.frequencies.add(asset, count)
+        self.heavy_hitters.add(asset, count)
+        if author is not None:
+            hll = self.authors.get(asset)
+            if hll is None:
+                hll = self.authors[asset] = HyperLogLog(self.settings["hll_precision"])
+            hll.add(author)
+
+    def merge(self, other):
+        self.frequencies.merge(other.frequencies)
+        self.heavy_hitters.merge(other.heavy_hitters)
+        for asset, hll in other.authors.items():
+            if asset in self.authors:
+                self.authors[asset].merge(hll)
+            else:
+                merged = self.authors[asset] = HyperLogLog(hll.precision, hll.seed)
+                merged.merge(hll)
+        return self
+
+
+DEFAULT_SETTINGS = {
+    "bucket_seconds": 3600,
+    "window_buckets": 24,
+    "cms_width": 2048,
+    "cms_depth": 4,
+    "heavy_hitters": 256,
+    "hll_precision": 10,
+}
+
+
+class SlidingMentionCounter:
+    """
+    Approximate per-asset mention counts and unique authors over a sliding window of
+    `window_buckets` buckets of `bucket_seconds` each.
+
+    Memory is bounded by the window length: each bucket holds a fixed-size Count-Min
+    sketch, a SpaceSaving summary and one small HyperLogLog per asset seen in it, and
+    buckets are dropped as soon as they slide out of the window. Counters built by
+    different workers over the same settings can be combined with merge().
+
+    The top-k ranking over the window is cached and only recomputed after new mentions
+    arrive or the window slides, so repeated queries from the trending engine cost O(k).
+    """
+
+    def __init__(self, settings=None):
+        self.settings = dict(DEFAULT_SETTINGS, **(settings or {}))
+        self.buckets = deque()
+        self.latest = None
+        self.ranking = None
+
+    def bucket_start(self, timestamp):
+        seconds = self.settings["bucket_seconds"]
+        return int(timestamp // seconds) * seconds
+
+    def window_start(self):
+        return self.latest - (self.settings["window_buckets"] - 1) * self.settings["bucket_seconds"]
+
+    def bucket_for(self, start):
+        """Return the bucket starting at `start`, creating it in order if needed."""
+        for bucket in reversed(self.buckets):
+            if bucket.start == start:
+                return bucket
+            if bucket.start < start:
+                break
+        bucket = MentionBucket(start, self.settings)
+        self.buckets.append(bucket)
+        if len(self.buckets) > 1 and self.buckets[-2].start > start:
+            self.buckets = deque(sorted(self.buckets, key=lambda b: b.start))
+        return bucket
+
+    def expire(self):
+        if self.latest is None:
+            return
+        cutoff = self.window_start()
+        while self.buckets and self.buckets[0].start < cutoff:
+            self.buckets.popleft()
+
+    def add(self, timestamp, asset, author=None, count=1):
+        """Record `count` mentions of `asset` at `timestamp` (epoch seconds) by `author`."""
+        start = self.bucket_start(timestamp)
+        if self.latest is not None and start < self.window_start():
+            return
+        if self.latest is None or start > self.latest:
+            self.latest = start
+            self.expire()
+        self.bucket_for(start).add(asset, author, count)
+        self.ranking = None
+
+    def advance(self, timestamp):
+        """Slide the window forward to `timestamp` without recording anything."""
+        start = self.bucket_start(timestamp)
+        if self.latest is None or start > self.latest:
+            self.latest = start
+            self.expire()
+            self.ranking = None
+
+    def mentions(self, asset):
+        """Estimated mentions of `asset` within the window."""
+        return sum(bucket.frequencies.estimate(asset) for bucket in self.buckets)
+
+    def unique_authors(self, asset):
+        """Estimated number of distinct authors mentioning `asset` within the window."""
+        hlls = [bucket.authors[asset] for bucket in self.buckets if asset in bucket.authors]
+        if not hlls:
+            return 0
+        merged = HyperLogLog(hlls[0].precision, hlls[0].seed)
+        for hll in hlls:
+            merged.merge(hll)
+        return merged.count()
+
+    def top(self, k=10):
+        """Return the `k` most mentioned (asset, estimated mentions) pairs in the window."""
+        if self.ranking is None:
+            summary = SpaceSaving(self.settings["heavy_hitters"])
+            for bucket in self.buckets:
+                summary.merge(bucket.heavy_hitters)
+            # Re-rank candidates by their Count-Min estimate, which sums exactly across buckets.
+            self.ranking = sorted(((asset, self.mentions(asset)) for asset in summary.counts),
+                                  key=lambda item: (-item[1], str(item[0])))
+        return self.ranking[:k]
+
+    def merge(self, other):
+        """Fold another worker's counter (built with the same settings) into this one."""
+        if other.settings != self.settings:
+            raise ValueError("Counters must share settings to be merged")
+        for bucket in other.buckets:
+            self.bucket_for(bucket.start).merge(bucket)
+        if other.latest is not None and (self.latest is None or other.latest > self.latest):
+            self.latest = other.latest
+        self.expire()
+        self.ranking = None
+        return self
@@ -1,36 +1,27 @@
 import os
 import sys
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
 # Add the parent directory to the system path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-# Now import the config module
-try:
-    import config
-except ImportError as e:
-    print("Error importing config module. Ensure that config.py is in the correct directory.")
-    raise e
+from backend.dataset_registry import get_dataset
 
-def load_csv_safe(file_path):
-    """Safely load a CSV file."""
-    print(f"Loading file: {file_path}")  # Debugging statement
-    if os.path.exists(file_path):
-        try:
-            return pd.read_csv(file_path)
-        except Exception as e:
-            print(f"Error reading {file_path}: {e}")
-            return None
-    else:
-        print(f"File not found: {file_path}")
+def load_dataset_safe(name):
+    """Safely load a processed dataset from the shared registry (read-only)."""
+    try:
+        return get_dataset(name)
+    except FileNotFoundError as e:
+        print(f"File not found: {e.filename}")
+        return None
+    except Exception as e:
+        print(f"Error loading {name} data: {e}")
         return None
 
 def plot_coingecko(ax):
     """Plot Top 10 Cryptos by 24h % Change from CoinGecko data."""
-    coingecko_file = os.path.join(config.RAW_DATA_DIR, "coingecko_prices.csv")
-    df = load_csv_safe(coingecko_file)
+    df = load_dataset_safe("coingecko")
     if df is not None and not df.empty:
         df = df.dropna(subset=["price_change_percentage_24h"])
         top10 = df.sort_values(by="price_change_percentage_24h", ascending=False).head(10)
@@ -44,8 +35,7 @@ def plot_coingecko(ax):
 
 def plot_fear_greed(ax):
     """Plot the Fear & Greed Index."""
-    fear_greed_file = os.path.join(config.RAW_DATA_DIR, "fear_greed_index.csv")
-    df = load_csv_safe(fear_greed_file)
+    df = load_dataset_safe("fear_greed")
     if df is not None and not df.empty:
         value = df.iloc[0]["value"]
         classification = df.iloc[0]["value_classification"]
@@ -60,10 +50,9 @@ def plot_fear_greed(ax):
 
 def plot_reddit_keywords(ax):
     """Plot Top 10 Reddit Keywords."""
-    reddit_file = os.path.join(config.RAW_DATA_DIR, "reddit_posts.csv")
-    df = load_csv_safe(reddit_file)
+    df = load_dataset_safe("reddit")
     if df is not None and not df.empty:
-        keyword_freq = df["keyword"].value_counts().reset_index()
+        keyword_freq = df["keyword"].astype(str).value_counts().reset_index()
         keyword_freq.columns = ["keyword", "count"]
         top_keywords = keyword_freq.head(10)
         sns.barplot(data=top_keywords, x="keyword", y="count", palette="magma", ax=ax, hue="keyword")
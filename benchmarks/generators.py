@@ -0,0 +1,231 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Add the project root (parent directory) to sys.path so that config.py can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Coins used as the base vocabulary for synthetic CoinGecko, Reddit and news rows.
+BASE_COINS = [
+    ("bitcoin", "btc", "Bitcoin"),
+    ("ethereum", "eth", "Ethereum"),
+    ("ripple", "xrp", "XRP"),
+    ("litecoin", "ltc", "Litecoin"),
+    ("cardano", "ada", "Cardano"),
+    ("solana", "sol", "Solana"),
+    ("dogecoin", "doge", "Dogecoin"),
+    ("tron", "trx", "TRON"),
+    ("polkadot", "dot", "Polkadot"),
+    ("chainlink", "link", "Chainlink"),
+]
+
+# Daily FGI rows from 2000-01-01 must stay below the pandas Timestamp upper bound (2262).
+MAX_FGI_DAYS = 90_000
+
+WORDS = np.array([
+    "price", "rally", "crash", "market", "bull", "bear", "whale", "etf", "halving",
+    "exchange", "wallet", "defi", "staking", "mining", "pump", "dump", "hodl",
+    "breakout", "support", "resistance", "volume", "trend", "analyst", "report",
+])
+
+
+def _rng(seed):
+    return np.random.default_rng(seed)
+
+
+def _coin_universe(n_coins):
+    """Return (ids, symbols, names) arrays for `n_coins` synthetic coins."""
+    ids, symbols, names = [], [], []
+    for i in range(n_coins):
+        if i < len(BASE_COINS):
+            coin_id, symbol, name = BASE_COINS[i]
+        else:
+            coin_id, symbol, name = f"coin-{i}", f"c{i}", f"Coin {i}"
+        ids.append(coin_id)
+        symbols.append(symbol)
+        names.append(name)
+    return np.array(ids), np.array(symbols), np.array(names)
+
+
+def _sentences(rng, n_rows, n_words, prefix=None):
+    """Build `n_rows` pseudo-random sentences of `n_words` words, optionally prefixed per row."""
+    picks = WORDS[rng.integers(0, len(WORDS), size=(n_rows, n_words))]
+    text = pd.Series(picks[:, 0])
+    for col in range(1, n_words):
+        text = text + " " + picks[:, col]
+    if prefix is not None:
+        text = pd.Series(prefix) + " " + text
+    return text
+
+
+def generate_coingecko(n_rows, seed=0):
+    """
+    Generate a CoinGecko markets table with the same columns as coingecko_prices.csv.
+    """
+    rng = _rng(seed)
+    ids, symbols, names = _coin_universe(n_rows)
+    price = rng.lognormal(mean=0.0, sigma=3.0, size=n_rows)
+    supply = rng.lognormal(mean=18.0, sigma=2.0, size=n_rows)
+    market_cap = price * supply
+    change_pct = rng.normal(0.0, 5.0, size=n_rows)
+    ath = price * rng.uniform(1.0, 10.0, size=n_rows)
+    atl = price * rng.uniform(0.001, 1.0, size=n_rows)
+    roi_times = rng.uniform(1.0, 100.0, size=n_rows)
+    roi = np.where(
+        rng.random(n_rows) < 0.1,
+        pd.Series(roi_times).map(lambda t: str({"times": t, "currency": "usd", "percentage": t * 100})),
+        None,
+    )
+    df = pd.DataFrame({
+        "id": ids,
+        "symbol": symbols,
+        "name": names,
+        "image": "https://coin-images.coingecko.com/coins/images/" + pd.Series(ids) + ".png",
+        "current_price": price,
+        "market_cap": market_cap.round(),
+        "market_cap_rank": (-market_cap).argsort().argsort() + 1,
+        "fully_diluted_valuation": market_cap * rng.uniform(1.0, 2.0, size=n_rows),
+        "total_volume": market_cap * rng.uniform(0.001, 0.2, size=n_rows),
+        "high_24h": price * 1.05,
+        "low_24h": price * 0.95,
+        "price_change_24h": price * change_pct / 100,
+        "price_change_percentage_24h": np.where(rng.random(n_rows) < 0.01, np.nan, change_pct),
+        "market_cap_change_24h": market_cap * change_pct / 100,
+        "market_cap_change_percentage_24h": change_pct,
+        "circulating_supply": supply,
+        "total_supply": supply * 1.1,
+        "max_supply": np.where(rng.random(n_rows) < 0.5, np.nan, supply * 2),
+        "ath": ath,
+        "ath_change_percentage": (price / ath - 1) * 100,
+        "ath_date": "2021-11-10T14:24:19.604Z",
+        "atl": atl,
+        "atl_change_percentage": (price / atl - 1) * 100,
+        "atl_date": "2015-10-20T00:00:00.000Z",
+        "roi": roi,
+        "last_updated": "2025-02-17T16:49:35.123Z",
+    })
+    return df
+
+
+def generate_binance(n_rows, seed=0):
+    """
+    Generate a Binance ticker table (symbol, price) like binance_prices.csv.
+    """
+    rng = _rng(seed)
+    quotes = np.array(["BTC", "ETH", "USDT", "BNB", "FDUSD"])
+    bases = pd.Series(np.arange(n_rows)).map(lambda i: f"SYM{i}")
+    symbols = bases + quotes[rng.integers(0, len(quotes), size=n_rows)]
+    prices = rng.lognormal(mean=0.0, sigma=3.0, size=n_rows)
+    return pd.DataFrame({"symbol": symbols, "price": np.round(prices, 8)})
+
+
+def generate_reddit(n_rows, n_coins=5, seed=0):
+    """
+    Generate Reddit posts shaped like reddit_posts.csv. The `keyword` column draws from the
+    first `n_coins` coin ids so that analysis.get_trending_coins finds matches.
+    """
+    rng = _rng(seed)
+    ids, _, names = _coin_universe(max(n_coins, 1))
+    picks = rng.integers(0, len(ids), size=n_rows)
+    now = 1739750400
+    return pd.DataFrame({
+        "keyword": ids[picks],
+        "title": _sentences(rng, n_rows, 8, prefix=names[picks]),
+        "score": rng.integers(0, 20000, size=n_rows),
+        "url": "https://i.redd.it/" + pd.Series(np.arange(n_rows)).astype(str) + ".png",
+        "num_comments": rng.integers(0, 1000, size=n_rows),
+        "created": (now - rng.integers(0, 3 * 365 * 86400, size=n_rows)).astype(float),
+        "author": "user_" + pd.Series(rng.integers(0, max(n_rows // 10, 1), size=n_rows)).astype(str),
+        "subreddit": "CryptoCurrency",
+    })
+
+
+def generate_news(n_rows, n_coins=10, seed=0):
+    """
+    Generate NewsAPI articles shaped like news_articles.csv.
+    """
+    rng = _rng(seed)
+    _, _, names = _coin_universe(max(n_coins, 1))
+    picks = rng.integers(0, len(names), size=n_rows)
+    now = pd.Timestamp("2025-02-17", tz="UTC")
+    published = now - pd.to_timedelta(rng.integers(0, 30 * 86400, size=n_rows), unit="s")
+    return pd.DataFrame({
+        "source": "{'id': None, 'name': 'Synthetic'}",
+        "author": "author_" + pd.Series(rng.integers(0, 500, size=n_rows)).astype(str),
+        "title": _sentences(rng, n_rows, 8, prefix=names[picks]),
+        "description": _sentences(rng, n_rows, 20),
+        "url": "https://news.example.com/" + pd.Series(np.arange(n_rows)).astype(str),
+        "urlToImage": None,
+        "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "content": _sentences(rng, n_rows, 40),
+    })
+
+
+def generate_yahoo(n_rows, seed=0, ticker="BTC-USD"):
+    """
+    Generate an OHLCV history shaped like yahoo_crypto.csv, including the duplicated
+    ticker header row that yfinance writes below the column names. Bars are one minute
+    apart so that 10M rows still fit inside the pandas timestamp range.
+    """
+    rng = _rng(seed)
+    dates = pd.date_range("2000-01-01", periods=n_rows, freq="min")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, size=n_rows)))
+    open_ = close * (1 + rng.normal(0, 0.01, size=n_rows))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.02, size=n_rows))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.02, size=n_rows))
+    df = pd.DataFrame({
+        "Date": dates.strftime("%Y-%m-%d %H:%M:%S"),
+        "Close": close,
+        "High": high,
+        "Low": low,
+        "Open": open_,
+        "Volume": rng.integers(1_000_000, 100_000_000_000, size=n_rows),
+    })
+    header = pd.DataFrame([["", ticker, ticker, ticker, ticker, ticker]], columns=df.columns)
+    return pd.concat([header, df.astype(object)], ignore_index=True)
+
+
+def generate_fear_greed(n_rows, seed=0):
+    """
+    Generate a daily Fear & Greed Index history shaped like fear_greed_index.csv.
+    The history is capped at MAX_FGI_DAYS so that every timestamp stays parseable.
+    """
+    rng = _rng(seed)
+    n_rows = min(n_rows, MAX_FGI_DAYS)
+    values = rng.integers(0, 101, size=n_rows)
+    labels = pd.cut(values, bins=[-1, 24, 44, 55, 75, 100],
+                    labels=["Extreme Fear", "Fear", "Neutral", "Greed", "Extreme Greed"])
+    start = int(pd.Timestamp("2000-01-01").timestamp())
+    return pd.DataFrame({
+        "value": values,
+        "value_classification": labels.astype(str),
+        "timestamp": start + np.arange(n_rows) * 86400,
+        "time_until_update": 0,
+    })
+
+
+# Raw file name -> generator, matching what the collectors write to RAW_DATA_DIR.
+GENERATORS = {
+    "coingecko_prices.csv": generate_coingecko,
+    "binance_prices.csv": generate_binance,
+    "reddit_posts.csv": generate_reddit,
+    "news_articles.csv": generate_news,
+    "yahoo_crypto.csv": generate_yahoo,
+    "fear_greed_index.csv": generate_fear_greed,
+}
+
+
+def write_raw_datasets(raw_dir, n_rows, seed=0):
+    """
+    Generate every raw dataset at `n_rows` rows and write it to `raw_dir`.
+    Returns a dict mapping file name to the written path.
+    """
+    os.makedirs(raw_dir, exist_ok=True)
+    paths = {}
+    for file_name, generator in GENERATORS.items():
+        df = generator(n_rows, seed=seed)
+        path = os.path.join(raw_dir, file_name)
+        df.to_csv(path, index=False)
+        paths[file_name] = path
+    return paths
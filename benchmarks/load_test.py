@@ -0,0 +1,131 @@
+import os
+import sys
+import time
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+# Add the project root (parent directory) to sys.path so that config.py and frontend/ can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Routes exercised by default. The SSE stream never ends, so it is left out; the alerts
+# page starts the live feed, which the self-hosted server runs on the offline stub.
+DEFAULT_ROUTES = [
+    "/",
+    "/visualize",
+    "/analyze",
+    "/alerts",
+    "/api/datasets",
+    "/api/datasets/yahoo_fgi?limit=500",
+    "/api/datasets/trending?limit=50",
+    "/api/series/yahoo?column=Close&points=1000",
+    "/api/ohlcv/BTC-USD?points=500",
+    "/api/mentions/top?k=10",
+    "/api/features?assets=bitcoin,ethereum",
+    "/api/search?q=bitcoin%20etf",
+    "/api/search?assets=solana&start=2025-01-01",
+    "/api/alerts?limit=100",
+]
+
+
+def start_server(host="127.0.0.1", port=0, threads=True):
+    """
+    Serve create_app() from a threaded WSGI server in a background thread and return
+    (server, base_url). Port 0 picks a free port.
+    """
+    os.environ.setdefault("CRYPTOTREND_LIVE_FEED", "stub")
+    # Per-request access logging would dominate the measurements.
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    from werkzeug.serving import make_server
+    from frontend.app import create_app
+    server = make_server(host, port, create_app(), threaded=threads)
+    threading.Thread(target=server.serve_forever, name="load-test-server", daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+def hit(session, url, timeout):
+    """Issue one GET; returns (latency in seconds, succeeded)."""
+    start = time.perf_counter()
+    try:
+        response = session.get(url, timeout=timeout, headers={"Accept-Encoding": "gzip"})
+        ok = response.status_code < 400
+    except requests.RequestException:
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def load_route(base_url, route, concurrency, requests_per_route, warmup, timeout):
+    """
+    Send `requests_per_route` GETs to one route from `concurrency` client threads (after
+    `warmup` unmeasured requests that fill the server caches). Returns a metrics dict.
+    """
+    url = base_url + route
+    with requests.Session() as session:
+        for _ in range(warmup):
+            hit(session, url, timeout)
+    local = threading.local()
+
+    def worker(_):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        return hit(local.session, url, timeout)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(worker, range(requests_per_route)))
+    elapsed = time.perf_counter() - start
+    latencies = np.array([latency for latency, _ in results]) * 1000
+    errors = sum(1 for _, ok in results if not ok)
+    return {
+        "route": route,
+        "requests": len(results),
+        "errors": errors,
+        "rps": len(results) / elapsed if elapsed > 0 else float("nan"),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "max_ms": float(latencies.max()),
+    }
+
+
+def print_report(results, concurrency):
+    print(f"\nLoad test results ({concurrency} concurrent clients):")
+    print(f"  {'route':<46}{'requests':>9}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for r in results:
+        print(f"  {r['route']:<46}{r['requests']:>9}{r['errors']:>8}{r['rps']:>9.1f}"
+              f"{r['p50_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['max_ms']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the CryptoTrend Analyzer web app route by route.")
+    parser.add_argument("--url", default=None,
+                        help="Base URL of a running server (e.g. http://127.0.0.1:8502). "
+                             "By default the app is served in-process on a free port.")
+    parser.add_argument("--routes", nargs="+", default=DEFAULT_ROUTES, help="Routes (with query strings) to test.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent client threads.")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per route.")
+    parser.add_argument("--warmup", type=int, default=3, help="Unmeasured requests per route before measuring.")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds.")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        server, base_url = start_server()
+        print(f"Serving the app in-process at {base_url}")
+    try:
+        results = [load_route(base_url.rstrip("/"), route, args.concurrency, args.requests, args.warmup, args.timeout)
+                   for route in args.routes]
+    finally:
+        if server is not None:
+            server.shutdown()
+    print_report(results, args.concurrency)
+    if any(r["errors"] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+import os
+import sys
+import io
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import contextlib
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+# Add the project root (parent directory) to sys.path so that config.py and backend/ can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import config
+from backend import preprocess_data, mentions, analysis, visualization, dataset_registry, rollups, search
+from benchmarks.generators import write_raw_datasets
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_SCALES = [10_000]
+# A stage is reported as a regression when it is this many times slower than the baseline.
+DEFAULT_THRESHOLD = 1.5
+# New candles the append_rollups stage folds into an existing rollup state (an hour of
+# the generated one-minute bars).
+ROLLUP_TAIL = 60
+
+
+def point_pipeline_at(work_dir):
+    """
+    Redirect config and every backend module that copied a path out of config at import
+    time to the raw/processed/visualization folders under `work_dir`.
+    """
+    dirs = {
+        "RAW_DATA_DIR": os.path.join(work_dir, "raw"),
+        "PROCESSED_DATA_DIR": os.path.join(work_dir, "processed"),
+        "VISUALIZATION_DIR": os.path.join(work_dir, "visualizations"),
+        "QUARANTINE_DIR": os.path.join(work_dir, "quarantine"),
+        "DATASET_CACHE_DIR": os.path.join(work_dir, "cache"),
+        "ROLLUP_DIR": os.path.join(work_dir, "rollups"),
+    }
+    for path in dirs.values():
+        os.makedirs(path, exist_ok=True)
+    config.SEARCH_INDEX = os.path.join(work_dir, "search.db")
+    for module in (config, preprocess_data, analysis, visualization):
+        for name, path in dirs.items():
+            if hasattr(module, name):
+                setattr(module, name, path)
+    if dataset_registry.registry.arrow_cache_dir is not None:
+        dataset_registry.registry.arrow_cache_dir = dirs["DATASET_CACHE_DIR"]
+    # The rollup store caches its state in memory; start each scale from an empty store.
+    rollups.store.cache.invalidate()
+    return dirs
+
+
+def _render(plot_func):
+    """Draw one visualization.py panel onto a throwaway figure."""
+    fig, ax = plt.subplots(figsize=(10, 5))
+    plot_func(ax)
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def build_stages():
+    """
+    Return the ordered (name, callable) list of stages to time. Order matters:
+    merge_yahoo_fgi reads the files written by the two preprocessing stages before it.
+    A stage may carry a third element, a setup callable run untimed before every repeat
+    so that each repeat starts from the same state.
+    """
+    state = {}
+
+    def yahoo_candles():
+        return dataset_registry.get_dataset("yahoo")
+
+    def rollups_before_tail():
+        # The state left by the previous run: all but the newest candles rolled up.
+        rollups.store.rebuild(config.YAHOO_TICKER, yahoo_candles().iloc[:-ROLLUP_TAIL])
+
+    def trending():
+        state["trending"] = analysis.get_trending_coins()
+
+    def search_queries():
+        for query, filters in [("bitcoin", {}), ('"bull run" OR crash', {}), ("eth*", {"assets": ["ethereum"]}),
+                               (None, {"assets": ["bitcoin"], "start": "2024-06-01"})]:
+            search.index.search(query, **filters)
+
+    def trending_charts():
+        if state.get("trending") is not None:
+            analysis.create_trending_visualizations(state["trending"].copy())
+
+    return [
+        ("preprocess_yahoo", preprocess_data.preprocess_yahoo),
+        ("rebuild_rollups", lambda: rollups.store.rebuild(config.YAHOO_TICKER, yahoo_candles())),
+        ("append_rollups", lambda: rollups.store.append(config.YAHOO_TICKER, yahoo_candles()), rollups_before_tail),
+        ("preprocess_fear_greed", preprocess_data.preprocess_fear_greed),
+        ("merge_yahoo_fgi", preprocess_data.merge_yahoo_fgi),
+        ("preprocess_binance", preprocess_data.preprocess_binance),
+        ("preprocess_coingecko", preprocess_data.preprocess_coingecko),
+        ("preprocess_news", preprocess_data.preprocess_news),
+        ("preprocess_reddit", preprocess_data.preprocess_reddit),
+        ("extract_mention_counts", mentions.extract_mention_counts),
+        ("build_search_index", lambda: search.update_search_index(rebuild=True)),
+        ("search_queries", search_queries),
+        ("get_trending_coins", trending),
+        ("create_trending_visualizations", trending_charts),
+        ("plot_coingecko", lambda: _render(visualization.plot_coingecko)),
+        ("plot_fear_greed", lambda: _render(visualization.plot_fear_greed)),
+        ("plot_reddit_keywords", lambda: _render(visualization.plot_reddit_keywords)),
+    ]
+
+
+def time_stage(func, repeat, setup=None):
+    """
+    Run `func` `repeat` times with stdout silenced and return the best wall time in
+    seconds. `setup`, when given, runs untimed before every repeat.
+    """
+    timings = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_scale(n_rows, repeat, seed=0):
+    """
+    Generate every dataset at `n_rows` rows in a scratch directory and time each stage.
+    Returns a dict mapping stage name to seconds.
+    """
+    work_dir = tempfile.mkdtemp(prefix=f"cryptotrend_bench_{n_rows}_")
+    try:
+        dirs = point_pipeline_at(work_dir)
+        print(f"Generating synthetic datasets with {n_rows:,} rows...")
+        write_raw_datasets(dirs["RAW_DATA_DIR"], n_rows, seed=seed)
+        results = {}
+        for name, func, *setup in build_stages():
+            results[name] = time_stage(func, repeat, *setup)
+            print(f"  {name:<32} {results[name] * 1000:10.1f} ms")
+        return results
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def load_baseline(path=BASELINE_PATH):
+    """Load the stored baseline results, or return None if there is none yet."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    """Store `results` (scale -> stage -> seconds) together with the environment they came from."""
+    payload = {
+        "environment": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"Baseline saved to {path}")
+
+
+def merge_results(stored, results, stages=None):
+    """
+    Merge new `results` (scale -> stage -> seconds) into the `stored` baseline results.
+    With `stages`, only those stages are taken from `results`; every other stored number
+    is kept, so recording a new stage does not silently re-record the old ones.
+    """
+    merged = {scale: dict(timings) for scale, timings in stored.items()}
+    for scale, timings in results.items():
+        if stages is not None:
+            timings = {stage: seconds for stage, seconds in timings.items() if stage in stages}
+        merged.setdefault(scale, {}).update(timings)
+    return merged
+
+
+def compare_to_baseline(results, baseline, threshold):
+    """
+    Print a per-stage comparison against the baseline and return the list of
+    (scale, stage, ratio) tuples that exceed `threshold`.
+    """
+    regressions = []
+    stored = baseline.get("results", {})
+    for scale, stages in results.items():
+        if scale not in stored:
+            print(f"No baseline recorded for {scale} rows; skipping comparison.")
+            continue
+        print(f"\nComparison against baseline ({scale} rows):")
+        for stage, seconds in stages.items():
+            reference = stored[scale].get(stage)
+            if not reference:
+                print(f"  {stage:<32} new stage, no baseline")
+                continue
+            ratio = seconds / reference
+            flag = "REGRESSION" if ratio > threshold else "ok"
+            print(f"  {stage:<32} {ratio:6.2f}x  {flag}")
+            if ratio > threshold:
+                regressions.append((scale, stage, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the CryptoTrend Analyzer pipeline on synthetic data.")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help="Row counts to generate per dataset (e.g. 10000 100000 1000000 10000000).")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage; the best time is kept.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the data generators.")
+    parser.add_argument("--no-csv-sink", action="store_true",
+                        help="Hand stage outputs over in memory and Arrow files only, without writing processed CSVs.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline.")
+    parser.add_argument("--stages", nargs="+", metavar="STAGE",
+                        help="With --save-baseline, only store these stages and keep the baseline of the others. "
+                             "Every stage still runs, since later stages read the outputs of earlier ones.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Slowdown ratio above which a stage counts as a regression.")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Exit with status 1 when any stage regresses against the baseline.")
+    args = parser.parse_args()
+    if args.stages:
+        unknown = sorted(set(args.stages) - {name for name, *_ in build_stages()})
+        if unknown:
+            parser.error(f"unknown stage(s): {', '.join(unknown)}")
+    if args.no_csv_sink:
+        config.PROCESSED_CSV_SINK = False
+
+    results = {}
+    for n_rows in args.scales:
+        results[str(n_rows)] = run_scale(n_rows, args.repeat, seed=args.seed)
+
+    if args.save_baseline:
+        baseline = load_baseline() or {"results": {}}
+        save_baseline(merge_results(baseline.get("results", {}), results, args.stages))
+        return
+
+    baseline = load_baseline()
+    if baseline is None:
+        print("\nNo baseline found. Run with --save-baseline to record one.")
+        return
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} stage(s) slower than {args.threshold}x the baseline.")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,9 +10,25 @@ PROCESSED_DATA_DIR = os.path.join(DATA_DIR, "processed")
 VISUALIZATION_DIR = os.path.join(DATA_DIR, "visualizations")
 COMBINED_DATA_DIR = os.path.join(DATA_DIR, "combined")
 PREPROCESSED_PATH = os.path.join(DATA_DIR, "preprocessed")
+QUARANTINE_DIR = os.path.join(DATA_DIR, "quarantine")
+# Append-only history of collected market snapshots, used for backtesting.
+HISTORY_DIR = os.path.join(DATA_DIR, "history")
+# Precomputed OHLCV rollups (1h/4h/1d/1w/1M) per asset.
+ROLLUP_DIR = os.path.join(DATA_DIR, "rollups")
+# Status, input hashes and output hashes of every pipeline stage, used by `main.py --resume`.
+CHECKPOINT_MANIFEST = os.path.join(DATA_DIR, "pipeline_manifest.json")
+# Memory-mapped Arrow copies of the processed datasets, shared between worker processes.
+DATASET_CACHE_DIR = os.path.join(DATA_DIR, "cache")
+DATASET_ARROW_CACHE = os.environ.get("CRYPTOTREND_ARROW_CACHE", "1") == "1"
+# Whether pipeline stages also persist their outputs as processed CSVs. Stages hand their
+# frames to later stages through memory and the Arrow files above; the CSVs are only a
+# durable, human-readable copy (always written when the Arrow cache is unavailable).
+PROCESSED_CSV_SINK = os.environ.get("CRYPTOTREND_CSV_SINK", "1") == "1"
+# SQLite full-text index over the collected news articles and Reddit posts.
+SEARCH_INDEX = os.path.join(DATA_DIR, "search.db")
 
 # Automatically create directories if they don't exist
-for dir_path in [RAW_DATA_DIR, PROCESSED_DATA_DIR, VISUALIZATION_DIR, COMBINED_DATA_DIR, PREPROCESSED_PATH]:
+for dir_path in [RAW_DATA_DIR, PROCESSED_DATA_DIR, VISUALIZATION_DIR, COMBINED_DATA_DIR, PREPROCESSED_PATH, QUARANTINE_DIR, HISTORY_DIR, ROLLUP_DIR]:
     os.makedirs(dir_path, exist_ok=True)
 
 # API Credentials and Endpoints
@@ -34,6 +50,44 @@ API_ENDPOINTS = {
     "fear_greed": "https://api.alternative.me/fng/"
 }
 
+# Live price feed: "api" polls Binance/CoinGecko, "stub" uses the offline random-walk feed.
+LIVE_FEED_SOURCE = os.environ.get("CRYPTOTREND_LIVE_FEED", "api")
+# Seconds between polls per source (CoinGecko's public API is rate limited).
+LIVE_FEED_INTERVALS = {
+    "binance": 1.0,
+    "coingecko": 30.0
+}
+
+# Collection daemon: seconds between runs per source, random jitter (+/- seconds),
+# first retry delay after a failure (doubling per consecutive failure) and its cap.
+COLLECTION_SCHEDULE = {
+    "binance": {"interval": 60, "jitter": 5},
+    "coingecko": {"interval": 300, "jitter": 30},
+    "fear_greed": {"interval": 6 * 3600, "jitter": 300},
+    "news": {"interval": 900, "jitter": 60},
+    "reddit": {"interval": 900, "jitter": 60},
+    "yahoo": {"interval": 3600, "jitter": 120, "retry_delay": 60, "max_backoff": 6 * 3600}
+}
+
+# Sliding window used for streaming mention counts: bucket length in seconds and the
+# number of buckets kept.
+MENTION_WINDOW = {"bucket_seconds": 3600, "window_buckets": 24 * 7}
+
+# Online anomaly detection: weight of each new observation in the rolling statistics,
+# robust z-score that raises an alert, and observations per asset before alerting.
+ANOMALY_SETTINGS = {"alpha": 0.05, "threshold": 4.0, "warmup": 30}
+
+# Ticker collected from Yahoo Finance; also the asset name of its OHLCV rollups.
+YAHOO_TICKER = "BTC-USD"
+# CoinGecko id of the Yahoo ticker, used to fill its price history in the feature store.
+YAHOO_ASSET_ID = "bitcoin"
+
+# Bucket length of the per-asset feature table in COMBINED_DATA_DIR (a pandas frequency).
+FEATURE_INTERVAL = "D"
+
+# Log level of the web app and collection daemon (DEBUG, INFO, WARNING, ...).
+LOG_LEVEL = os.environ.get("CRYPTOTREND_LOG_LEVEL", "INFO")
+
 # MongoDB Configuration (if applicable)
 MONGO_CONFIG = {
     "uri": "your_mongodb_uri",                # e.g., "mongodb://localhost:27017/"
@@ -0,0 +1,378 @@
+import io
+import os
+import gzip
+import json
+import logging
+import threading
+import numpy as np
+import pandas as pd
+from flask import Blueprint, Response, request
+
+import config
+from backend.live_feed import build_live_feed
+from backend.analysis import get_trending_coins, get_top_mentioned
+from backend.features import features_as_of
+from backend.search import index as search_index
+from backend.anomalies import monitor
+from backend.rollups import store as rollup_store
+from backend.dataset_cache import DatasetCache
+from backend import dataset_registry
+from backend.dataset_registry import DATASETS
+from backend.downsampling import lttb_indices
+
+api = Blueprint("api", __name__, url_prefix="/api")
+
+# Derived datasets are shared by every request and rebuilt only when their inputs change.
+dataset_cache = DatasetCache()
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 10000
+# Responses smaller than this are not worth compressing.
+GZIP_MIN_BYTES = 1024
+# Bounds for the number of points a downsampled series may return.
+DEFAULT_POINTS = 1000
+MAX_POINTS = 5000
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+# The live price poller is created on first use and shared by every streaming client.
+live_feed = None
+live_feed_lock = threading.Lock()
+# Signature of the mentions dataset last fed to the anomaly monitor.
+mention_feed = DatasetCache()
+
+
+def get_live_feed():
+    """
+    Returns the process-wide LivePriceFeed, starting its background poller on first call.
+    """
+    global live_feed
+    with live_feed_lock:
+        if live_feed is None:
+            live_feed = build_live_feed(config.LIVE_FEED_SOURCE)
+            live_feed.add_listener(monitor.on_snapshot)
+            live_feed.start()
+    return live_feed
+
+
+def start_anomaly_monitor():
+    """
+    Feeds the anomaly monitor the mention buckets extracted since the last call (a stat
+    of the mentions dataset when nothing changed) and makes sure the live feed is
+    polling, so price and volume alerts keep arriving.
+    """
+    try:
+        mention_feed.get("mentions", [dataset_registry.registry.source_path("mentions")],
+                         lambda: monitor.observe_mentions(dataset_registry.get_dataset("mentions")))
+    except FileNotFoundError:
+        logging.info("No mention counts yet; alerts cover live prices and volumes only.")
+    get_live_feed()
+
+
+def load_trending():
+    trending = get_trending_coins(top_n=None)
+    if trending is None:
+        raise FileNotFoundError("CoinGecko or Reddit data is missing")
+    return trending.reset_index(drop=True)
+
+
+# Datasets served by the API: name -> time column (None if the dataset is not a time series).
+# Everything except the derived trending ranking comes straight from the shared registry.
+API_DATASETS = {
+    "trending": None,
+    "yahoo": DATASETS["yahoo"].time_column,
+    "yahoo_fgi": DATASETS["yahoo_fgi"].time_column,
+    "reddit": DATASETS["reddit"].time_column,
+    "news": DATASETS["news"].time_column,
+    "mentions": DATASETS["mentions"].time_column,
+    "features": DATASETS["features"].time_column,
+}
+
+
+def trending_paths():
+    """Registry files the trending ranking is derived from."""
+    paths = [dataset_registry.registry.source_path("coingecko"), dataset_registry.registry.source_path("reddit")]
+    mentions = dataset_registry.registry.source_path("mentions")
+    if os.path.exists(mentions):
+        paths.append(mentions)
+    return paths
+
+
+def load_frame(name):
+    """
+    Returns the shared, read-only frame for an API dataset. The trending ranking is
+    recomputed only when one of the registry files it is derived from changes.
+    """
+    if name == "trending":
+        return dataset_cache.get("trending", trending_paths(), load_trending)
+    return dataset_registry.get_dataset(name)
+
+
+def error_response(message, status):
+    return Response(json.dumps({"error": message}), status=status, mimetype="application/json")
+
+
+def maybe_gzip(body, mimetype):
+    """
+    Builds the response, gzip-compressing `body` when the client accepts it and it is large enough.
+    """
+    headers = {"Vary": "Accept-Encoding"}
+    if len(body) >= GZIP_MIN_BYTES and "gzip" in request.headers.get("Accept-Encoding", ""):
+        body = gzip.compress(body, compresslevel=5)
+        headers["Content-Encoding"] = "gzip"
+    return Response(body, mimetype=mimetype, headers=headers)
+
+
+def parse_time_bound(value):
+    timestamp = pd.Timestamp(value)
+    return timestamp.tz_localize("UTC") if timestamp.tzinfo is None else timestamp.tz_convert("UTC")
+
+
+def time_slice(df, time_column, start, end):
+    """
+    Returns the rows of a frame sorted by `time_column` whose time lies in [start, end].
+    """
+    times = df[time_column]
+    lo = 0 if start is None else times.searchsorted(start, side="left")
+    hi = len(df) if end is None else times.searchsorted(end, side="right")
+    return df.iloc[lo:hi]
+
+
+def parse_int(name, default, minimum, maximum=None):
+    value = int(request.args.get(name, default))
+    if value < minimum or (maximum is not None and value > maximum):
+        raise ValueError(f"'{name}' must be between {minimum} and {maximum}")
+    return value
+
+
+def select_rows(name):
+    """
+    Applies the time-range, column, limit and offset query parameters to a cached dataset.
+    Returns (page, total_matching_rows, limit, offset).
+    """
+    time_column = API_DATASETS[name]
+    df = load_frame(name)
+
+    start, end = request.args.get("start"), request.args.get("end")
+    if start or end:
+        if time_column is None:
+            raise ValueError(f"Dataset '{name}' has no time column to filter on")
+        df = time_slice(df, time_column,
+                        parse_time_bound(start) if start else None,
+                        parse_time_bound(end) if end else None)
+
+    columns = request.args.get("columns")
+    if columns:
+        columns = [c.strip() for c in columns.split(",") if c.strip()]
+        unknown = [c for c in columns if c not in df.columns]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        df = df[columns]
+
+    limit = parse_int("limit", DEFAULT_LIMIT, 1, MAX_LIMIT)
+    offset = parse_int("offset", 0, 0)
+    return df.iloc[offset:offset + limit], len(df), limit, offset
+
+
+@api.route("/datasets")
+def list_datasets():
+    """Lists the datasets served by the API with their columns and time column."""
+    listing = {}
+    for name, time_column in API_DATASETS.items():
+        try:
+            df = load_frame(name)
+        except FileNotFoundError:
+            continue
+        listing[name] = {"rows": len(df), "columns": list(df.columns), "time_column": time_column}
+    return maybe_gzip(json.dumps(listing).encode("utf-8"), "application/json")
+
+
+@api.route("/datasets/<name>")
+def get_dataset(name):
+    """
+    Returns one page of a dataset as JSON (default) or as an Arrow IPC stream (`format=arrow`).
+
+    Query parameters: `start`/`end` (ISO timestamps, inclusive), `columns` (comma-separated),
+    `limit` (1-10000, default 100) and `offset`.
+    """
+    if name not in API_DATASETS:
+        return error_response(f"Unknown dataset '{name}'", 404)
+    try:
+        page, total, limit, offset = select_rows(name)
+    except FileNotFoundError:
+        return error_response(f"Dataset '{name}' has not been collected yet", 404)
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+    if request.args.get("format", "json") == "arrow":
+        if pa is None:
+            return error_response("Arrow output requires pyarrow to be installed", 406)
+        sink = io.BytesIO()
+        table = pa.Table.from_pandas(page, preserve_index=False)
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return maybe_gzip(sink.getvalue(), "application/vnd.apache.arrow.stream")
+
+    records = page.to_json(orient="records", date_format="iso")
+    meta = json.dumps({"dataset": name, "total": total, "offset": offset, "limit": limit,
+                       "columns": list(page.columns)})
+    body = meta[:-1] + ', "data": ' + records + "}"
+    return maybe_gzip(body.encode("utf-8"), "application/json")
+
+
+@api.route("/series/<name>")
+def get_series(name):
+    """
+    Returns one numeric column of a time-indexed dataset, downsampled with LTTB so the
+    payload never exceeds `points` points however long the requested range is.
+
+    Query parameters: `column` (required), `start`/`end` (ISO timestamps, inclusive) and
+    `points` (3-5000, default 1000, typically the chart width in pixels). Zooming in is a
+    new request with a narrower range, which returns finer-resolution data.
+    """
+    time_column = API_DATASETS.get(name)
+    if time_column is None:
+        return error_response(f"Unknown time series dataset '{name}'", 404)
+    column = request.args.get("column")
+    try:
+        df = load_frame(name)
+        if column not in df.columns or column == time_column:
+            raise ValueError(f"'column' must be one of the columns of '{name}'")
+        if not pd.api.types.is_numeric_dtype(df[column]):
+            raise ValueError(f"column '{column}' is not numeric")
+        points = parse_int("points", DEFAULT_POINTS, 3, MAX_POINTS)
+        start, end = request.args.get("start"), request.args.get("end")
+        window = time_slice(df, time_column,
+                            parse_time_bound(start) if start else None,
+                            parse_time_bound(end) if end else None)
+        values = window[column].to_numpy(dtype=float, na_value=np.nan)
+    except FileNotFoundError:
+        return error_response(f"Dataset '{name}' has not been collected yet", 404)
+    except (ValueError, TypeError) as e:
+        return error_response(str(e), 400)
+
+    times = window[time_column]
+    # Epoch milliseconds, which is what the browser charting code plots on its x axis.
+    x = times.to_numpy(dtype="datetime64[ms]").astype(np.int64).astype(float)
+    valid = ~np.isnan(values) & times.notna().to_numpy()
+    x, values = x[valid], values[valid]
+    idx = lttb_indices(x, values, points)
+
+    payload = {"dataset": name, "column": column, "total": int(len(x)), "returned": int(len(idx)),
+               "x": x[idx].astype(np.int64).tolist(), "y": values[idx].tolist()}
+    return maybe_gzip(json.dumps(payload).encode("utf-8"), "application/json")
+
+
+@api.route("/ohlcv/<asset>")
+def get_ohlcv(asset):
+    """
+    Returns OHLCV candles of `asset` from the precomputed rollups.
+
+    Query parameters: `start`/`end` (ISO timestamps, inclusive), and either `level`
+    (1h, 4h, 1d, 1w or 1M) or `points` (3-5000, default 1000) to let the server pick the
+    finest level with at most that many candles in the range.
+    """
+    try:
+        start, end = request.args.get("start"), request.args.get("end")
+        points = parse_int("points", DEFAULT_POINTS, 3, MAX_POINTS)
+        level, rows = rollup_store.query(asset,
+                                         parse_time_bound(start) if start else None,
+                                         parse_time_bound(end) if end else None,
+                                         level=request.args.get("level"), max_points=points)
+    except FileNotFoundError:
+        return error_response(f"No rollups for '{asset}'", 404)
+    except ValueError as e:
+        return error_response(str(e), 400)
+    payload = {"asset": asset, "level": level, "total": int(len(rows)),
+               "t": rows["bucket"].to_numpy(dtype="datetime64[ms]").astype(np.int64).tolist()}
+    for column in ["Open", "High", "Low", "Close", "Volume"]:
+        payload[column.lower()] = rows[column].tolist()
+    return maybe_gzip(json.dumps(payload).encode("utf-8"), "application/json")
+
+
+@api.route("/features")
+def point_in_time_features():
+    """
+    Returns the latest complete feature bucket of every asset as known at `as_of` (ISO
+    timestamp, default now). `assets` and `columns` are optional comma-separated lists.
+    """
+    try:
+        as_of = parse_time_bound(request.args.get("as_of") or pd.Timestamp.now(tz="UTC"))
+        assets = request.args.get("assets")
+        columns = request.args.get("columns")
+        rows = features_as_of(as_of, assets=[a.strip() for a in assets.split(",") if a.strip()] if assets else None,
+                              columns=[c.strip() for c in columns.split(",") if c.strip()] if columns else None)
+    except FileNotFoundError:
+        return error_response("The feature table has not been built yet", 404)
+    except ValueError as e:
+        return error_response(str(e), 400)
+    rows = rows.astype({"asset_id": str})
+    rows["bucket"] = rows["bucket"].map(pd.Timestamp.isoformat)
+    payload = {"as_of": as_of.isoformat(), "total": int(len(rows)),
+               "rows": json.loads(rows.to_json(orient="records"))}
+    return maybe_gzip(json.dumps(payload).encode("utf-8"), "application/json")
+
+
+@api.route("/search")
+def search_documents():
+    """
+    Full-text search over the collected news articles and Reddit posts.
+
+    Query parameters: `q` (words, "phrases", prefix* and OR; omit to list the newest
+    documents), `assets` (comma-separated CoinGecko ids), `start`/`end` (ISO timestamps,
+    inclusive), `sources` (news and/or reddit), `limit` (1-100, default 20) and `offset`.
+    Matches are ranked by BM25 relevance, newest first among equal scores.
+    """
+    try:
+        assets = request.args.get("assets")
+        sources = request.args.get("sources")
+        start, end = request.args.get("start"), request.args.get("end")
+        limit = parse_int("limit", 20, 1, 100)
+        offset = parse_int("offset", 0, 0)
+        results = search_index.search(
+            request.args.get("q"),
+            assets=[a.strip() for a in assets.split(",") if a.strip()] if assets else None,
+            start=parse_time_bound(start) if start else None,
+            end=parse_time_bound(end) if end else None,
+            sources=[s.strip() for s in sources.split(",") if s.strip()] if sources else None,
+            limit=limit, offset=offset)
+    except FileNotFoundError:
+        return error_response("The search index has not been built yet", 404)
+    except ValueError as e:
+        return error_response(str(e), 400)
+    payload = {"query": request.args.get("q"), "offset": offset, "limit": limit,
+               "returned": len(results), "results": results}
+    return maybe_gzip(json.dumps(payload).encode("utf-8"), "application/json")
+
+
+@api.route("/mentions/top")
+def top_mentions():
+    """
+    Returns the `k` (1-100, default 10) coins most mentioned on Reddit within the current
+    sliding window, with approximate mention counts and unique authors.
+    """
+    try:
+        k = parse_int("k", 10, 1, 100)
+        top = get_top_mentioned(k)
+    except FileNotFoundError:
+        return error_response("CoinGecko or Reddit data has not been collected yet", 404)
+    except ValueError as e:
+        return error_response(str(e), 400)
+    payload = {"k": k, "assets": top.to_dict(orient="records")}
+    return maybe_gzip(json.dumps(payload).encode("utf-8"), "application/json")
+
+
+@api.route("/alerts")
+def recent_alerts():
+    """Returns the `limit` (1-500, default 100) most recent anomaly alerts, newest first."""
+    try:
+        limit = parse_int("limit", 100, 1, 500)
+    except ValueError as e:
+        return error_response(str(e), 400)
+    start_anomaly_monitor()
+    payload = {"alerts": monitor.recent(limit)}
+    return maybe_gzip(json.dumps(payload).encode("utf-8"), "application/json")
@@ -1,16 +1,14 @@
 import os
 import sys
-import subprocess
+import queue
+import argparse
 import logging
 import base64
-from flask import Flask, render_template_string
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
-from io import BytesIO
-
-# Set up logging.
-logging.basicConfig(level=logging.DEBUG)
+import functools
+import matplotlib
+matplotlib.use("Agg")  # Render off-screen; request threads must never open GUI windows.
+from flask import Blueprint, Flask, Response
+from jinja2 import Environment
 
 # Determine the project root and update sys.path.
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -18,8 +16,19 @@ sys.path.append(project_root)
 
 # Import config (ensure config.py defines RAW_DATA_DIR and VISUALIZATION_DIR)
 import config
+from backend.live_feed import format_sse
+from backend.analysis import render_trending_charts
+from backend.dataset_cache import DatasetCache
+from frontend.api import api, load_frame, trending_paths, get_live_feed, start_anomaly_monitor
+
+pages = Blueprint("pages", __name__)
 
-app = Flask(__name__)
+# Rendered charts, rebuilt only when the files the trending ranking is derived from change.
+chart_cache = DatasetCache()
+
+def png_data_uri(data):
+    """Returns PNG bytes as a base64-encoded data URI."""
+    return f"data:image/png;base64,{base64.b64encode(data).decode('utf-8')}"
 
 def embed_image(image_path):
     """
@@ -28,8 +37,7 @@ def embed_image(image_path):
     """
     if os.path.exists(image_path):
         with open(image_path, "rb") as f:
-            encoded = base64.b64encode(f.read()).decode("utf-8")
-            return f"data:image/png;base64,{encoded}"
+            return png_data_uri(f.read())
     return None
 
 # A common base HTML template with header, navigation, and footer.
@@ -132,6 +140,9 @@ base_template = """
     <a href="/">Home</a>
     <a href="/collect">Collect Data</a>
     <a href="/visualize">Visualize Data</a>
+    <a href="/live">Live Prices</a>
+    <a href="/alerts">Alerts</a>
+    <a href="/search">Search</a>
     <a href="/analyze">Analyze Data</a>
   </nav>
   <div class="container">
@@ -144,7 +155,18 @@ base_template = """
 </html>
 """
 
-@app.route("/")
+# Compiled once at import; every page renders through the same template object.
+BASE_TEMPLATE = Environment(autoescape=True).from_string(base_template)
+
+def render_page(title, content):
+    return BASE_TEMPLATE.render(title=title, content=content)
+
+@functools.lru_cache(maxsize=None)
+def static_page(title, content):
+    """Renders a page whose content never changes once and serves the cached HTML afterwards."""
+    return render_page(title, content)
+
+@pages.route("/")
 def index():
     # Updated homepage text with more detailed and professional information.
     content = """
@@ -159,9 +181,9 @@ def index():
     </ul>
     <p>Our mission is to empower you with the tools and insights needed to make informed decisions in the ever-evolving world of cryptocurrencies. Use the navigation above to begin collecting data, generating visualizations, or performing in-depth analyses.</p>
     """
-    return render_template_string(base_template, title="Home - CryptoTrend Analyzer", content=content)
+    return static_page("Home - CryptoTrend Analyzer", content)
 
-@app.route("/collect")
+@pages.route("/collect")
 def collect():
     # Placeholder for data collection functionality.
     content = """
@@ -170,56 +192,100 @@ def collect():
     <p>Our system continuously gathers data from various crypto sources to ensure you have the latest information available.
     Please refer to the server logs for details on the data collection status.</p>
     """
-    return render_template_string(base_template, title="Collect Data - CryptoTrend Analyzer", content=content)
+    return static_page("Collect Data - CryptoTrend Analyzer", content)
 
-@app.route("/visualize")
+@pages.route("/visualize")
 def visualize():
-    # Create an in-memory sample visualization.
-    data = {'x': [1, 2, 3, 4, 5], 'y': [5, 15, 8, 20, 12]}
-    df = pd.DataFrame(data)
-    plt.figure(figsize=(8, 5))
-    sns.lineplot(data=df, x="x", y="y", marker="o", color="#4A90E2")
-    plt.title("Sample Crypto Trend Visualization")
-    plt.xlabel("Time Interval")
-    plt.ylabel("Metric Value")
-    img_buf = BytesIO()
-    plt.savefig(img_buf, format="png", bbox_inches="tight")
-    plt.close()
-    img_buf.seek(0)
-    encoded_img = base64.b64encode(img_buf.getvalue()).decode("utf-8")
-    img_data = f"data:image/png;base64,{encoded_img}"
-    
-    content = f"""
+    """
+    Interactive price chart rendered in the browser. The page asks /api/series for a
+    series downsampled to the chart width; dragging across the chart zooms in by
+    requesting the selected range again, which returns finer-resolution points.
+    """
+    content = """
     <h2>Interactive Visualization</h2>
-    <p>This sample visualization demonstrates the dynamic trends observed in our crypto market data.
-    The graph updates in real-time as new data is collected.</p>
-    <div class="flex-container">
-      <div class="flex-item">
-        <img src="{img_data}" alt="Sample Visualization">
-      </div>
+    <p>Bitcoin daily history from Yahoo Finance. Drag across the chart to zoom into a range; the
+    server returns at most one point per pixel, so long histories stay fast to load.</p>
+    <p>
+      Series:
+      <select id="series-column">
+        <option value="Close" selected>Close</option>
+        <option value="Open">Open</option>
+        <option value="High">High</option>
+        <option value="Low">Low</option>
+        <option value="Volume">Volume</option>
+      </select>
+      <button id="reset-zoom">Reset zoom</button>
+      <span id="series-info"></span>
+    </p>
+    <div style="position: relative; height: 420px;">
+      <canvas id="series-chart"></canvas>
     </div>
+    <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.min.js"></script>
+    <script>
+      const canvas = document.getElementById("series-chart");
+      const info = document.getElementById("series-info");
+      const columnSelect = document.getElementById("series-column");
+      let range = { start: null, end: null };
+
+      const chart = new Chart(canvas, {
+        type: "line",
+        data: { datasets: [{ data: [], borderColor: "#4A90E2", borderWidth: 1, pointRadius: 0 }] },
+        options: {
+          animation: false,
+          parsing: false,
+          maintainAspectRatio: false,
+          plugins: { legend: { display: false } },
+          scales: {
+            x: { type: "linear", ticks: { callback: (v) => new Date(v).toISOString().slice(0, 10) } }
+          }
+        }
+      });
+
+      async function loadSeries() {
+        const params = new URLSearchParams({ column: columnSelect.value, points: Math.max(100, canvas.clientWidth) });
+        if (range.start !== null) params.set("start", new Date(range.start).toISOString());
+        if (range.end !== null) params.set("end", new Date(range.end).toISOString());
+        const response = await fetch("/api/series/yahoo?" + params);
+        const series = await response.json();
+        if (!response.ok) { info.textContent = series.error; return; }
+        chart.data.datasets[0].data = series.x.map((x, i) => ({ x: x, y: series.y[i] }));
+        chart.update();
+        info.textContent = `${series.returned} of ${series.total} points`;
+      }
+
+      // Drag-to-zoom: the selected pixel range is converted to timestamps and re-requested.
+      let dragStart = null;
+      canvas.addEventListener("mousedown", (e) => { dragStart = e.offsetX; });
+      canvas.addEventListener("mouseup", (e) => {
+        if (dragStart === null) return;
+        const [a, b] = [dragStart, e.offsetX].sort((p, q) => p - q);
+        dragStart = null;
+        if (b - a < 5) return;
+        range = { start: chart.scales.x.getValueForPixel(a), end: chart.scales.x.getValueForPixel(b) };
+        loadSeries();
+      });
+      document.getElementById("reset-zoom").addEventListener("click", () => { range = { start: null, end: null }; loadSeries(); });
+      columnSelect.addEventListener("change", loadSeries);
+      loadSeries();
+    </script>
     """
-    return render_template_string(base_template, title="Visualize Data - CryptoTrend Analyzer", content=content)
+    return static_page("Visualize Data - CryptoTrend Analyzer", content)
 
-@app.route("/analyze")
+@pages.route("/analyze")
 def analyze():
     """
-    Executes the external analysis script (analysis.py) and displays the generated visualizations.
-    The analysis script must write its output images to config.VISUALIZATION_DIR.
+    Runs the trending analysis in-process and displays its charts. The datasets come
+    from the shared registry and the charts are rendered in memory and cached until the
+    data changes, so repeated requests neither parse CSVs nor redraw figures.
     """
-    script_path = os.path.join(project_root, "backend", "analysis.py")
-    success = run_script(script_path, project_root)
-    
-    # Define the image file paths.
-    trending_bar_path = os.path.join(config.VISUALIZATION_DIR, "trending_coins_bar.png")
-    reddit_pie_path = os.path.join(config.VISUALIZATION_DIR, "trending_coins_reddit_pie.png")
-    comprehensive_path = os.path.join(config.VISUALIZATION_DIR, "comprehensive_trends.png")
-    
-    # Attempt to embed the images.
-    trending_bar_img = embed_image(trending_bar_path)
-    reddit_pie_img = embed_image(reddit_pie_path)
-    comprehensive_img = embed_image(comprehensive_path)
-    
+    charts = run_analysis()
+    success = charts is not None
+
+    # Embed the rendered charts, plus the comprehensive trends image if one was produced.
+    trending_bar_img = png_data_uri(charts["trending_coins_bar.png"]) if success else None
+    reddit_pie_img = png_data_uri(charts["trending_coins_reddit_pie.png"]) if success and "trending_coins_reddit_pie.png" in charts else None
+    comprehensive_img = embed_image(os.path.join(config.VISUALIZATION_DIR, "comprehensive_trends.png"))
+
     if success and (trending_bar_img or reddit_pie_img or comprehensive_img):
         visuals_html = "<h2>Analysis Visualizations</h2><div class='flex-container'>"
         if trending_bar_img:
@@ -248,38 +314,244 @@ def analyze():
     else:
         content = "<h2>Analysis Error</h2><p>There was an error executing the analysis script or generating visualizations. Please check the logs for details.</p>"
     
-    return render_template_string(base_template, title="Analyze Data - CryptoTrend Analyzer", content=content)
+    return render_page("Analyze Data - CryptoTrend Analyzer", content)
+
+@pages.route("/live")
+def live():
+    """
+    Live price page. The browser subscribes to /stream/prices and applies the
+    deltas pushed by the background poller to the tables in place.
+    """
+    content = """
+    <h2>Live Prices</h2>
+    <p>Prices stream from the background poller as they change. Status: <strong id="live-status">connecting...</strong></p>
+    <div class="flex-container">
+      <div class="flex-item">
+        <h3>CoinGecko (top by market cap)</h3>
+        <table id="coingecko-table" style="width:100%; text-align:right;">
+          <thead><tr><th style="text-align:left;">Coin</th><th>Price (USD)</th><th>24h %</th></tr></thead>
+          <tbody></tbody>
+        </table>
+      </div>
+      <div class="flex-item">
+        <h3>Binance</h3>
+        <p>Filter: <input id="binance-filter" value="USDT" size="10"></p>
+        <table id="binance-table" style="width:100%; text-align:right;">
+          <thead><tr><th style="text-align:left;">Symbol</th><th>Price</th></tr></thead>
+          <tbody></tbody>
+        </table>
+      </div>
+    </div>
+    <script>
+      const state = { version: 0, sources: { binance: {}, coingecko: {} } };
+      const ROWS = 25;
+
+      function renderCoingecko() {
+        const coins = Object.entries(state.sources.coingecko)
+          .sort((a, b) => (b[1].market_cap || 0) - (a[1].market_cap || 0))
+          .slice(0, ROWS);
+        document.querySelector("#coingecko-table tbody").innerHTML = coins.map(([id, c]) =>
+          `<tr><td style="text-align:left;">${id}</td><td>${c.current_price ?? "-"}</td>` +
+          `<td>${c.price_change_percentage_24h == null ? "-" : c.price_change_percentage_24h.toFixed(2)}</td></tr>`
+        ).join("");
+      }
+
+      function renderBinance() {
+        const filter = document.getElementById("binance-filter").value.toUpperCase();
+        const rows = Object.entries(state.sources.binance)
+          .filter(([symbol]) => symbol.includes(filter))
+          .slice(0, ROWS);
+        document.querySelector("#binance-table tbody").innerHTML = rows.map(([symbol, price]) =>
+          `<tr><td style="text-align:left;">${symbol}</td><td>${price}</td></tr>`
+        ).join("");
+      }
+
+      function render() { renderCoingecko(); renderBinance(); }
+
+      const source = new EventSource("/stream/prices");
+      source.addEventListener("snapshot", (e) => {
+        const msg = JSON.parse(e.data);
+        state.version = msg.version;
+        state.sources = Object.assign({ binance: {}, coingecko: {} }, msg.sources);
+        render();
+      });
+      source.addEventListener("delta", (e) => {
+        const msg = JSON.parse(e.data);
+        if (msg.version <= state.version) return;
+        state.version = msg.version;
+        const target = state.sources[msg.source] || (state.sources[msg.source] = {});
+        Object.assign(target, msg.changed);
+        msg.removed.forEach((key) => delete target[key]);
+        if (msg.source === "coingecko") renderCoingecko(); else renderBinance();
+      });
+      source.onopen = () => { document.getElementById("live-status").textContent = "live"; };
+      source.onerror = () => { document.getElementById("live-status").textContent = "reconnecting..."; };
+      document.getElementById("binance-filter").addEventListener("input", renderBinance);
+    </script>
+    """
+    return static_page("Live Prices - CryptoTrend Analyzer", content)
+
+@pages.route("/alerts")
+def alerts():
+    """
+    Anomaly alerts page. Lists the most recent price, volume and mention spikes raised by
+    the anomaly monitor and refreshes the list from /api/alerts every 10 seconds.
+    """
+    start_anomaly_monitor()
+    content = """
+    <h2>Alerts</h2>
+    <p>Unusual moves flagged by the online anomaly detector (robust z-score over each asset's rolling history).</p>
+    <table id="alerts-table" style="width:100%; text-align:left;">
+      <thead><tr><th>Time (UTC)</th><th>Metric</th><th>Asset</th><th>Value</th><th>Robust z</th><th></th></tr></thead>
+      <tbody></tbody>
+    </table>
+    <script>
+      async function refreshAlerts() {
+        const response = await fetch("/api/alerts?limit=200");
+        const payload = await response.json();
+        document.querySelector("#alerts-table tbody").innerHTML = payload.alerts.map((a) =>
+          `<tr><td>${a.time.slice(0, 19).replace("T", " ")}</td><td>${a.metric}</td><td>${a.asset}</td>` +
+          `<td>${a.value.toPrecision(6)}</td><td>${a.robust_z.toFixed(1)}</td><td>${a.direction}</td></tr>`
+        ).join("") || "<tr><td colspan='6'>No alerts yet.</td></tr>";
+      }
+      refreshAlerts();
+      setInterval(refreshAlerts, 10000);
+    </script>
+    """
+    return static_page("Alerts - CryptoTrend Analyzer", content)
+
+@pages.route("/search")
+def search():
+    """
+    Search page for the collected news articles and Reddit posts. The form queries
+    /api/search, which answers from the SQLite full-text index built by the pipeline.
+    """
+    content = """
+    <h2>Search News &amp; Reddit</h2>
+    <p>Words must all appear; use "quoted phrases", <code>prefix*</code> and <code>OR</code>. Leave the query empty to list the newest posts for an asset or date range.</p>
+    <form id="search-form">
+      <input id="search-q" type="search" placeholder="e.g. ETF approval" size="32">
+      <input id="search-assets" type="text" placeholder="assets (e.g. bitcoin,solana)" size="24">
+      <input id="search-start" type="date"> to <input id="search-end" type="date">
+      <select id="search-sources">
+        <option value="">All sources</option>
+        <option value="news">News</option>
+        <option value="reddit">Reddit</option>
+      </select>
+      <button type="submit">Search</button>
+    </form>
+    <p id="search-info"></p>
+    <div id="search-results"></div>
+    <button id="search-more" style="display:none;">More results</button>
+    <script>
+      const PAGE_SIZE = 20;
+      const results = document.getElementById("search-results");
+      const info = document.getElementById("search-info");
+      const more = document.getElementById("search-more");
+      let params = null;
+      let offset = 0;
+
+      const escapeHtml = (text) => String(text ?? "").replace(/[&<>"']/g,
+        (c) => ({ "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;" })[c]);
+
+      async function runSearch(append) {
+        params.set("offset", offset);
+        const started = performance.now();
+        const response = await fetch("/api/search?" + params);
+        const payload = await response.json();
+        if (!response.ok) { info.textContent = payload.error; results.innerHTML = ""; more.style.display = "none"; return; }
+        // snippet_html is escaped by the server; only its <mark> tags are markup.
+        const html = payload.results.map((r) =>
+          `<div class="search-hit"><h3><a href="${escapeHtml(r.url)}" target="_blank" rel="noopener">${escapeHtml(r.title)}</a></h3>` +
+          `<p><small>${r.published.slice(0, 10)} &middot; ${escapeHtml(r.source)}` +
+          `${r.assets.length ? " &middot; " + r.assets.map(escapeHtml).join(", ") : ""}</small></p>` +
+          `<p>${r.snippet_html}</p></div>`).join("");
+        results.innerHTML = append ? results.innerHTML + html : (html || "<p>No matching documents.</p>");
+        offset += payload.returned;
+        info.textContent = `${offset} result(s) in ${Math.round(performance.now() - started)} ms`;
+        more.style.display = payload.returned === PAGE_SIZE ? "inline" : "none";
+      }
+
+      document.getElementById("search-form").addEventListener("submit", (e) => {
+        e.preventDefault();
+        params = new URLSearchParams({ limit: PAGE_SIZE });
+        const fields = { q: "search-q", assets: "search-assets", start: "search-start", sources: "search-sources" };
+        for (const [name, id] of Object.entries(fields)) {
+          const value = document.getElementById(id).value.trim();
+          if (value) params.set(name, value);
+        }
+        const end = document.getElementById("search-end").value;
+        if (end) params.set("end", end + "T23:59:59Z");
+        offset = 0;
+        runSearch(false);
+      });
+      more.addEventListener("click", () => runSearch(true));
+    </script>
+    """
+    return static_page("Search - CryptoTrend Analyzer", content)
 
-def run_script(script_path, root_path):
+@pages.route("/stream/prices")
+def stream_prices():
     """
-    Runs a Python script using subprocess.
-    Returns True if the script executed successfully (exit code 0); otherwise, returns False.
+    Server-Sent Events stream of live prices: one full snapshot, then a delta per poll
+    that changed anything. A comment line is sent every 15 seconds to keep proxies open.
     """
-    if not os.path.exists(script_path):
-        logging.error("Script not found: %s", script_path)
-        return False
+    feed = get_live_feed()
 
-    env = os.environ.copy()
-    current_pythonpath = env.get("PYTHONPATH", "")
-    env["PYTHONPATH"] = root_path + (os.pathsep + current_pythonpath if current_pythonpath else "")
+    def events():
+        # Subscribe before taking the snapshot so no delta falls between the two;
+        # the client discards deltas whose version is not newer than the snapshot.
+        q = feed.subscribe()
+        try:
+            snapshot = feed.snapshot()
+            yield format_sse({"type": "snapshot", **snapshot}, event="snapshot", event_id=snapshot["version"])
+            while True:
+                try:
+                    event = q.get(timeout=15)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event, event=event["type"], event_id=event["version"])
+        finally:
+            feed.unsubscribe(q)
 
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return Response(events(), mimetype="text/event-stream", headers=headers)
+
+def load_trending_charts():
+    trending_coins = load_frame("trending").head(5)
+    if trending_coins.empty:
+        raise ValueError("No trending coins data available.")
+    return render_trending_charts(trending_coins)
+
+def run_analysis():
+    """
+    Returns the trending charts as {file name: PNG bytes}, rendering them only when the
+    underlying data changed. Returns None (and logs the error) on failure.
+    """
     try:
-        result = subprocess.run(
-            [sys.executable, script_path],
-            capture_output=True,
-            text=True,
-            cwd=root_path,
-            env=env
-        )
+        return chart_cache.get("trending", trending_paths(), load_trending_charts)
     except Exception as e:
-        logging.exception("Error running script %s: %s", script_path, e)
-        return False
+        logging.exception("Error running analysis: %s", e)
+        return None
 
-    if result.returncode != 0:
-        logging.error("Script %s failed: %s", script_path, result.stderr)
-        return False
-
-    return True
+def create_app(settings=None):
+    """
+    Application factory: builds the Flask app with the API and page blueprints.
+    `settings` (a dict) is applied to app.config. Each WSGI worker process calls this
+    once; every request handler is safe to run from several threads at a time.
+    """
+    app = Flask(__name__)
+    app.config.update(settings or {})
+    app.register_blueprint(api)
+    app.register_blueprint(pages)
+    return app
 
 if __name__ == "__main__":
-    app.run(debug=True, port=8502)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the CryptoTrend Analyzer web app with the development server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--debug", action="store_true", help="Enable the debugger, reloader and DEBUG logging.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.debug else config.LOG_LEVEL)
+    create_app().run(host=args.host, port=args.port, debug=args.debug, threaded=True)
@@ -0,0 +1,24 @@
+"""
+WSGI entry point for serving the web app, for example:
+
+    gunicorn --worker-class gevent --workers 1 --worker-connections 1000 --bind 0.0.0.0:8502 frontend.wsgi:app
+
+The live price poller and the anomaly monitor live in the serving process, so the live
+routes (/live, /stream/prices, /alerts, /api/alerts) must be served by a single worker.
+Use an async worker, because each Server-Sent Events client keeps its connection open.
+Other routes can be scaled out with a second, multi-worker pool behind a reverse proxy
+(see the README).
+"""
+import os
+import sys
+import logging
+
+# Add the project root (parent directory) to sys.path so that config.py can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import config
+from frontend.app import create_app
+
+logging.basicConfig(level=config.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+
+app = create_app()
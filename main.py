@@ -1,13 +1,71 @@
 import os
 import sys
+import argparse
 import subprocess
 import config  # Import configuration variables from config.py
+from backend.checkpoints import CheckpointManifest
+from backend.dataset_registry import registry
+from backend.scheduler import COLLECTORS
 
-def run_script(script_path, project_root):
+class Stage:
+    """
+    One pipeline step: a backend script (plus arguments) together with the files it
+    reads and the files it writes. A stage depends on every stage that writes one of
+    its inputs.
+    """
+
+    def __init__(self, name, command, inputs=(), outputs=()):
+        self.name = name
+        self.command = command
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+
+def raw(name):
+    return os.path.join(config.RAW_DATA_DIR, name)
+
+def dataset(name):
+    """The file a stage publishes registry dataset `name` to (its CSV, or its Arrow file without the CSV sink)."""
+    return registry.published_path(name)
+
+def pipeline_stages():
+    """Return every stage of the pipeline in the order it runs."""
+    stages = [Stage(f"collect_{source}", [script], outputs=[raw(output) for output in outputs])
+              for source, (script, outputs) in COLLECTORS.items()]
+
+    # Preprocessing step -> (raw or published inputs, published outputs).
+    preprocessing = {
+        "preprocess_yahoo": ([raw("yahoo_crypto.csv")], [dataset("yahoo")]),
+        "rollups": ([dataset("yahoo")], [os.path.join(config.ROLLUP_DIR, "rollups.json")]),
+        "preprocess_fear_greed": ([raw("fear_greed_index.csv")], [dataset("fear_greed")]),
+        "merge_yahoo_fgi": ([dataset("yahoo"), dataset("fear_greed")], [dataset("yahoo_fgi")]),
+        "preprocess_binance": ([raw("binance_prices.csv")], [dataset("binance")]),
+        "preprocess_coingecko": ([raw("coingecko_prices.csv")], [dataset("coingecko")]),
+        "preprocess_news": ([raw("news_articles.csv")], [dataset("news")]),
+        "preprocess_reddit": ([raw("reddit_posts.csv")], [dataset("reddit")]),
+        "mentions": ([dataset("coingecko"), dataset("news"), dataset("reddit")], [dataset("mentions")]),
+    }
+    for step, (inputs, outputs) in preprocessing.items():
+        stages.append(Stage(step, ["preprocess_data.py", step], inputs, outputs))
+
+    stages.append(Stage("features", ["features.py"],
+                        [os.path.join(config.HISTORY_DIR, "coingecko_history.csv"), dataset("yahoo"),
+                         dataset("fear_greed"), dataset("mentions")],
+                        [os.path.join(config.COMBINED_DATA_DIR, "crypto_combined.csv")]))
+    stages.append(Stage("search", ["search.py"],
+                        [dataset("news"), dataset("reddit")], [config.SEARCH_INDEX]))
+    stages.append(Stage("visualization", ["visualization.py"],
+                        [dataset("coingecko"), dataset("fear_greed"), dataset("reddit")]))
+    stages.append(Stage("analysis", ["analysis.py"],
+                        [dataset("coingecko"), dataset("reddit"), dataset("mentions")],
+                        [os.path.join(config.VISUALIZATION_DIR, "trending_coins_bar.png")]))
+    return stages
+
+def run_script(script_path, project_root, args=()):
     """
     Executes a Python script using a modified environment that includes the project root in PYTHONPATH.
+    Returns (succeeded, error message).
     """
-    print(f"Running: {script_path}")
+    print(f"Running: {script_path} {' '.join(args)}".rstrip())
 
     # Copy the current environment and ensure that the project root is in PYTHONPATH.
     env = os.environ.copy()
@@ -19,7 +77,7 @@ def run_script(script_path, project_root):
 
     # Run the script with the working directory set to the project root.
     result = subprocess.run(
-        [sys.executable, script_path],
+        [sys.executable, script_path, *args],
         capture_output=True,
         text=True,
         cwd=project_root,
@@ -28,66 +86,77 @@ def run_script(script_path, project_root):
     if result.returncode == 0:
         print(result.stdout)
         print(f"{script_path} completed successfully.\n")
-    else:
-        print(f"Error in {script_path}:")
-        print(result.stderr)
+        return True, None
+    print(f"Error in {script_path}:")
+    print(result.stdout)
+    print(result.stderr)
+    lines = (result.stderr or result.stdout).strip().splitlines()
+    return False, lines[-1] if lines else f"exited with status {result.returncode}"
+
+def run_pipeline(stages, manifest, project_root, resume=False):
+    """
+    Run `stages` in order, recording each one in the checkpoint manifest. A stage whose
+    upstream failed (or was itself blocked) in this run is marked blocked instead of
+    running on stale inputs. With `resume`, completed stages whose inputs and outputs
+    are unchanged since they last ran are skipped. Returns the names of the stages that
+    failed or were blocked.
+    """
+    scripts_dir = os.path.join(project_root, "backend")
+    producers = {path: stage.name for stage in stages for path in stage.outputs}
+    unsuccessful = []
+    for stage in stages:
+        upstream = sorted({producers[path] for path in stage.inputs if path in producers} & set(unsuccessful))
+        if upstream:
+            print(f"Skipping {stage.name}: blocked by {', '.join(upstream)}\n")
+            manifest.fail(stage.name, f"blocked by {', '.join(upstream)}", status="blocked")
+            unsuccessful.append(stage.name)
+            continue
+        if resume and manifest.is_fresh(stage.name, stage.inputs, stage.outputs):
+            print(f"Skipping {stage.name}: up to date\n")
+            continue
+        manifest.start(stage.name, stage.inputs)
+        script, *args = stage.command
+        succeeded, error = run_script(os.path.join(scripts_dir, script), project_root, args)
+        if succeeded:
+            manifest.complete(stage.name, stage.outputs)
+        else:
+            manifest.fail(stage.name, error)
+            unsuccessful.append(stage.name)
+    return unsuccessful
 
-def main():
+def main(resume=False):
     # Print the configuration from config.py for verification.
     print("Configuration:")
     print("BASE_DIR:", config.BASE_DIR)
     print("Raw Data Directory:", config.RAW_DATA_DIR)
     print("Processed Data Directory:", config.PROCESSED_DATA_DIR)
     print("Visualization Directory:", config.VISUALIZATION_DIR)
+    print("Checkpoint Manifest:", config.CHECKPOINT_MANIFEST)
     print()
 
     # Define the project root (where main.py and config.py reside)
     project_root = os.path.dirname(os.path.abspath(__file__))
-    # The backend folder is a subdirectory of the project root.
-    scripts_dir = os.path.join(project_root, "backend")
+    manifest = CheckpointManifest(config.CHECKPOINT_MANIFEST)
 
-    # List of extraction scripts.
-    extraction_scripts = [
-        "collect_binance.py",
-        "collect_coingecko.py",
-        "collect_fear_greed.py",
-        "collect_news.py",
-        "collect_reddit.py",
-        "collect_yahoo.py"
-    ]
-    
-    # List of preprocessing, visualization, and analysis backend.
-    preprocessing_scripts = [
-        "preprocess_data.py"
-    ]
-    visualization_scripts = [
-        "visualization.py"
-    ]
-    analysis_scripts = [
-        "analysis.py"
-    ]
-    
-    print("----- Starting Extraction Phase -----")
-    for script in extraction_scripts:
-        script_path = os.path.join(scripts_dir, script)
-        run_script(script_path, project_root)
-    
-    print("----- Starting Preprocessing Phase -----")
-    for script in preprocessing_scripts:
-        script_path = os.path.join(scripts_dir, script)
-        run_script(script_path, project_root)
-    
-    print("----- Starting Visualization Phase -----")
-    for script in visualization_scripts:
-        script_path = os.path.join(scripts_dir, script)
-        run_script(script_path, project_root)
-    
-    print("----- Starting Analysis Phase -----")
-    for script in analysis_scripts:
-        script_path = os.path.join(scripts_dir, script)
-        run_script(script_path, project_root)
-    
+    print(f"----- Starting Pipeline{' (resuming)' if resume else ''} -----")
+    unsuccessful = run_pipeline(pipeline_stages(), manifest, project_root, resume)
+    if unsuccessful:
+        for name in unsuccessful:
+            print(f"{name}: {manifest.status(name)} ({manifest.stages[name].get('error')})")
+        print("----- Pipeline Finished With Errors (rerun with --resume to retry) -----")
+        return False
     print("----- Pipeline Execution Complete -----")
+    return True
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the CryptoTrend Analyzer pipeline.")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Run continuously, collecting each source on its own schedule (see COLLECTION_SCHEDULE in config.py).")
+    parser.add_argument("--resume", action="store_true",
+                        help="Only rerun stages that failed, were blocked or whose inputs or outputs changed since they completed.")
+    args = parser.parse_args()
+    if args.daemon:
+        from backend.scheduler import run_daemon
+        run_daemon()
+    else:
+        sys.exit(0 if main(resume=args.resume) else 1)
@@ -0,0 +1,125 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py and backend/ can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import logging
+import numpy as np
+import pandas as pd
+from backend.anomalies import AnomalyMonitor, StreamDetector
+
+SETTINGS = {"alpha": 0.05, "threshold": 4.0, "warmup": 30}
+
+
+def feed(detector, values, key="bitcoin"):
+    """Feed `values` one at a time and return the step of every alert."""
+    return [step for step, value in enumerate(values) if detector.update([key], [value], step)]
+
+
+def test_alerts_only_after_warmup():
+    rng = np.random.default_rng(0)
+    values = 100 + rng.normal(0, 1, size=80)
+    values[10] = 200.0
+    values[60] = 200.0
+    values[70] = 0.0
+    detector = StreamDetector("volume", warmup=30)
+    assert feed(detector, values) == [60, 70]
+    alert = detector.update(["bitcoin"], [300.0], "2024-01-01T00:00")[0]
+    assert (alert["metric"], alert["asset"], alert["value"], alert["direction"]) == ("volume", "bitcoin", 300.0, "spike")
+    assert alert["time"] == "2024-01-01T00:00:00+00:00"
+
+
+def test_an_earlier_spike_does_not_mask_the_next_one():
+    rng = np.random.default_rng(1)
+    values = 100 + rng.normal(0, 1, size=60)
+    detector = StreamDetector("volume")
+    feed(detector, values)
+    first = detector.update(["bitcoin"], [150.0])[0]
+    second = detector.update(["bitcoin"], [150.0])
+    assert second and second[0]["robust_z"] > 0.8 * first["robust_z"]
+    # The classic z-score is inflated by the first spike, the robust one is not.
+    assert second[0]["zscore"] < 0.5 * first["zscore"]
+
+
+def test_log_return_transform_scores_moves_not_levels():
+    detector = StreamDetector("price", transform="log_return", min_scale=0.001)
+    rng = np.random.default_rng(2)
+    prices = 100 * np.exp(np.cumsum(0.01 + rng.normal(0, 0.002, size=60)))
+    # A steady 1% climb is the norm for this asset; a 10% jump is not.
+    assert feed(detector, prices) == []
+    assert detector.update(["bitcoin"], [prices[-1] * 1.1])[0]["direction"] == "spike"
+    # Missing or non-positive prices are skipped without touching the state.
+    count = detector.count[detector.index["bitcoin"]]
+    assert detector.update(["bitcoin"], [0.0]) == [] and detector.update(["bitcoin"], [np.nan]) == []
+    assert detector.count[detector.index["bitcoin"]] == count
+
+
+def test_min_scale_keeps_flat_series_quiet():
+    flat = StreamDetector("volume", transform="log", min_scale=0.01)
+    feed(flat, np.full(40, 1e6), key="tether")
+    assert flat.update(["tether"], [1.005e6]) == []
+    assert flat.update(["tether"], [2e6])[0]["asset"] == "tether"
+
+
+def test_snapshots_match_per_asset_updates():
+    rng = np.random.default_rng(3)
+    keys = [f"coin-{i}" for i in range(150)]
+    steps = rng.lognormal(0, 1, size=(50, len(keys)))
+    steps[45, 7] = 1e4
+    whole = StreamDetector("volume", transform="log", warmup=10)
+    one_by_one = StreamDetector("volume", transform="log", warmup=10)
+    alerts = [a for t, row in enumerate(steps) for a in whole.update(keys, row, t)]
+    single = [a for t, row in enumerate(steps) for key, value in zip(keys, row)
+              for a in one_by_one.update([key], [value], t)]
+    assert alerts == single
+    assert ("coin-7", pd.Timestamp(45, unit="s", tz="UTC").isoformat()) in [(a["asset"], a["time"]) for a in alerts]
+    assert len(whole.assets) == 150 and len(whole.count) >= 150
+    for name in ("count", "mean", "var", "location", "mad"):
+        np.testing.assert_array_equal(getattr(whole, name)[:150], getattr(one_by_one, name)[:150])
+
+
+def mention_rows(days, spike_day=None):
+    rows = []
+    for day in range(days):
+        bucket = pd.Timestamp("2024-01-01", tz="UTC") + pd.Timedelta(days=day)
+        rows.append((bucket, "bitcoin", "reddit", 50 if day == spike_day else 5 + day % 3))
+        rows.append((bucket, "ethereum", "reddit", 3 + day % 2))
+    return pd.DataFrame(rows, columns=["bucket", "asset_id", "source", "mentions"])
+
+
+def test_mentions_are_fed_once_and_the_newest_bucket_waits(caplog):
+    monitor = AnomalyMonitor(SETTINGS)
+    detector = monitor.detectors["reddit_mentions"]
+    assert monitor.observe_mentions(mention_rows(40)) == []
+    # The 40th bucket may still be filling up.
+    assert detector.count[detector.index["bitcoin"]] == 39
+
+    # Re-extracted counts: only the buckets after the last one fed are observed.
+    with caplog.at_level(logging.WARNING, logger="cryptotrend.anomalies"):
+        alerts = monitor.observe_mentions(mention_rows(43, spike_day=41))
+    assert detector.count[detector.index["bitcoin"]] == 42
+    assert [(a["asset"], a["time"][:10]) for a in alerts] == [("bitcoin", "2024-02-11")]
+    assert "reddit_mentions spike of bitcoin" in caplog.text
+    assert monitor.observe_mentions(mention_rows(43, spike_day=41)) == []
+
+
+def test_monitor_routes_live_snapshots_and_serves_recent_alerts(monkeypatch):
+    from frontend import api
+    from frontend.app import create_app
+
+    monitor = AnomalyMonitor(dict(SETTINGS, warmup=5))
+    for price in (100.0, 100.1, 100.0, 100.1, 100.0, 100.1, 100.0):
+        monitor.on_snapshot("coingecko", {"bitcoin": {"current_price": price, "total_volume": 1e9},
+                                          "dust": {"current_price": None}})
+        monitor.on_snapshot("binance", {"BTCUSDT": price})
+    monitor.on_snapshot("binance", {"BTCUSDT": 150.0})
+    monitor.on_snapshot("coingecko", {"bitcoin": {"current_price": 150.0, "total_volume": 5e9}})
+    assert [a["metric"] for a in monitor.recent()] == ["coingecko_volume", "coingecko_price", "binance_price"]
+    assert "dust" not in monitor.detectors["coingecko_price"].index
+
+    monkeypatch.setattr(api, "monitor", monitor)
+    monkeypatch.setattr(api, "start_anomaly_monitor", lambda: None)
+    client = create_app().test_client()
+    assert [a["metric"] for a in client.get("/api/alerts?limit=2").get_json()["alerts"]] == [
+        "coingecko_volume", "coingecko_price"]
+    assert client.get("/api/alerts?limit=0").status_code == 400
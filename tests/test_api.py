@@ -0,0 +1,125 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py and backend/ can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import io
+import gzip
+import json
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+import config
+from backend import dataset_registry
+from backend.checkpoints import write_csv
+from backend.dataset_registry import DatasetRegistry
+from frontend.app import create_app
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    """Test client whose registry serves a 500-row Yahoo history from `tmp_path`."""
+    monkeypatch.setattr(config, "PROCESSED_DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(dataset_registry, "registry", DatasetRegistry())
+    dates = pd.date_range("2024-01-01", periods=500, freq="D", tz="UTC")
+    write_csv(pd.DataFrame({"Date": dates, "Open": np.arange(500.0), "High": np.arange(500.0) + 2,
+                            "Low": np.arange(500.0) - 1, "Close": np.arange(500.0) + 1, "Volume": 1e9,
+                            "Date_only": dates.date}),
+              os.path.join(str(tmp_path), "yahoo_crypto_cleaned.csv"))
+    return create_app().test_client()
+
+
+def test_pages_are_sliced_and_projected(client):
+    body = client.get("/api/datasets/yahoo?limit=3&offset=10&columns=Date,Close").get_json()
+    assert (body["total"], body["offset"], body["limit"], body["columns"]) == (500, 10, 3, ["Date", "Close"])
+    assert [row["Close"] for row in body["data"]] == [11.0, 12.0, 13.0]
+    assert body["data"][0]["Date"].startswith("2024-01-11T00:00:00")
+
+
+def test_time_range_is_inclusive(client):
+    body = client.get("/api/datasets/yahoo?start=2024-02-01&end=2024-02-10&columns=Open&limit=100").get_json()
+    assert body["total"] == 10
+    assert [row["Open"] for row in body["data"]] == list(np.arange(31.0, 41.0))
+
+
+@pytest.mark.parametrize("query, status", [
+    ("/api/datasets/nope", 404),
+    ("/api/datasets/news", 404),
+    ("/api/datasets/yahoo?columns=Close,nope", 400),
+    ("/api/datasets/yahoo?limit=0", 400),
+    ("/api/datasets/yahoo?limit=10001", 400),
+    ("/api/datasets/yahoo?offset=-1", 400),
+    ("/api/datasets/trending", 404),
+])
+def test_bad_requests_are_rejected(client, query, status):
+    response = client.get(query)
+    assert response.status_code == status
+    assert "error" in response.get_json()
+
+
+def test_large_responses_are_gzipped_when_accepted(client):
+    plain = client.get("/api/datasets/yahoo?limit=200")
+    zipped = client.get("/api/datasets/yahoo?limit=200", headers={"Accept-Encoding": "gzip, deflate"})
+    assert "Content-Encoding" not in plain.headers
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert zipped.headers["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(zipped.data) == plain.data
+    # Small bodies are not worth compressing.
+    small = client.get("/api/datasets/yahoo?limit=1&columns=Open", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+
+
+def test_arrow_stream_holds_the_same_page(client):
+    response = client.get("/api/datasets/yahoo?format=arrow&limit=5&offset=2&columns=Date,Close")
+    assert response.mimetype == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(io.BytesIO(response.data)).read_all()
+    assert table.column_names == ["Date", "Close"]
+    assert table.column("Close").to_pylist() == [3.0, 4.0, 5.0, 6.0, 7.0]
+
+
+def test_listing_skips_datasets_that_are_not_collected(client):
+    listing = json.loads(client.get("/api/datasets").data)
+    assert listing["yahoo"]["rows"] == 500
+    assert listing["yahoo"]["time_column"] == "Date"
+    assert "news" not in listing
+
+
+def test_datasets_are_parsed_once_until_their_file_changes(client, monkeypatch, tmp_path):
+    parsed = []
+    load_csv = dataset_registry.load_csv
+    monkeypatch.setattr(dataset_registry, "load_csv", lambda spec: parsed.append(spec.name) or load_csv(spec))
+    for _ in range(3):
+        assert client.get("/api/datasets/yahoo?limit=1").get_json()["total"] == 500
+    assert parsed == ["yahoo"]
+
+    path = os.path.join(str(tmp_path), "yahoo_crypto_cleaned.csv")
+    df = pd.read_csv(path).head(10)
+    write_csv(df, path)
+    assert client.get("/api/datasets/yahoo?limit=1").get_json()["total"] == 10
+    assert parsed == ["yahoo", "yahoo"]
+
+
+def test_series_is_downsampled_to_the_requested_points(client):
+    body = client.get("/api/series/yahoo?column=Close&points=50").get_json()
+    assert (body["total"], body["returned"]) == (500, 50)
+    assert body["x"][0] == pd.Timestamp("2024-01-01", tz="UTC").value // 10**6
+    assert body["y"][0] == 1.0 and body["y"][-1] == 500.0
+    assert body["x"] == sorted(body["x"])
+
+
+def test_zooming_in_returns_finer_data(client):
+    body = client.get("/api/series/yahoo?column=Close&points=50&start=2024-03-01&end=2024-03-30").get_json()
+    assert (body["total"], body["returned"]) == (30, 30)
+    assert body["y"] == list(np.arange(61.0, 91.0))
+
+
+@pytest.mark.parametrize("query", [
+    "/api/series/yahoo",
+    "/api/series/yahoo?column=Date",
+    "/api/series/yahoo?column=Date_only",
+    "/api/series/yahoo?column=Close&points=2",
+    "/api/series/yahoo?column=Close&points=5001",
+])
+def test_series_rejects_bad_parameters(client, query):
+    assert client.get(query).status_code == 400
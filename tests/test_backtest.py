@@ -0,0 +1,127 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py and backend/ can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+import pytest
+from backend.analysis import normalize
+from backend.backtest import (MarketHistory, composite_scores, evaluate, forward_returns, load_history,
+                              rebalance_steps, run_backtest, social_matrix, sweep, top_k_mask)
+
+
+def hourly_history(price, change=None, start="2024-01-01"):
+    """MarketHistory with one snapshot per hour for the rows of `price`."""
+    price = np.asarray(price, dtype=float)
+    times = pd.date_range(start, periods=len(price), freq="h").to_numpy(dtype="datetime64[ns]")
+    change = np.ones_like(price) if change is None else np.asarray(change, dtype=float)
+    return MarketHistory(times, [f"coin-{i}" for i in range(price.shape[1])], price, change)
+
+
+def test_history_is_pivoted_into_aligned_matrices(tmp_path):
+    path = tmp_path / "history.csv"
+    pd.DataFrame({
+        "snapshot_time": ["2024-01-01T00:00:00+00:00", "2024-01-01T00:00:00+00:00", "2024-01-01T01:00:00+00:00",
+                          "2024-01-01T01:00:00+00:00", "2024-01-01T01:00:00+00:00"],
+        "id": ["bitcoin", "ethereum", "bitcoin", "bitcoin", "solana"],
+        "current_price": [100.0, 10.0, 101.0, 102.0, 5.0],
+        "price_change_percentage_24h": [1.0, -2.0, 1.5, 2.0, 3.0],
+    }).to_csv(path, index=False)
+    history = load_history(str(path))
+    assert history.assets == ["bitcoin", "ethereum", "solana"]
+    assert len(history.times) == 2 and history.times[0] < history.times[1]
+    # The last of two rows for the same snapshot and asset wins; absent assets are NaN.
+    np.testing.assert_array_equal(history.price, [[100.0, 10.0, np.nan], [102.0, np.nan, 5.0]])
+    np.testing.assert_array_equal(history.change, [[1.0, -2.0, np.nan], [2.0, np.nan, 3.0]])
+
+
+def test_scores_match_the_trending_composite_at_every_step():
+    rng = np.random.default_rng(0)
+    change = rng.normal(size=(30, 12))
+    change[3, :] = -1.0
+    change[5, :6] = 2.0
+    change[7, 4] = np.nan
+    social = rng.poisson(3.0, size=(30, 12)).astype(float)
+    scores = composite_scores(change, social)
+    for t in range(len(change)):
+        eligible = np.isfinite(change[t]) & (change[t] > 0)
+        assert np.all(scores[t, ~eligible] == -np.inf)
+        if not eligible.any():
+            continue
+        # What get_trending_coins computes for one snapshot.
+        expected = (normalize(pd.Series(change[t, eligible])) + normalize(pd.Series(social[t, eligible]))).to_numpy()
+        np.testing.assert_allclose(scores[t, eligible], expected)
+
+
+def test_top_k_never_picks_ineligible_assets():
+    scores = np.array([[3.0, 1.0, 2.0, -np.inf], [-np.inf, -np.inf, 5.0, -np.inf], [-np.inf] * 4])
+    mask = top_k_mask(scores, 2)
+    assert mask.tolist() == [[True, False, True, False], [False, False, True, False], [False] * 4]
+    assert top_k_mask(scores, 10).sum(axis=1).tolist() == [3, 1, 0]
+
+
+def test_social_counts_only_use_buckets_that_have_ended():
+    history = hourly_history(np.ones((4, 2)), start="2024-01-02")
+    history.times = np.array(["2024-01-02T00", "2024-01-02T12", "2024-01-03T00", "2024-01-04T06"],
+                             dtype="datetime64[ns]")
+    mentions = pd.DataFrame({
+        "bucket": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-02", "2024-01-03"], utc=True),
+        "asset_id": ["coin-0", "coin-0", "coin-1", "unknown"],
+        "mentions": [4, 7, 2, 9],
+    })
+    counts = social_matrix(history, mentions)
+    # The 01-02 bucket ends at 01-03 00:00, so the 12:00 snapshot still only sees 01-01.
+    assert counts.tolist() == [[4.0, 0.0], [4.0, 0.0], [7.0, 2.0], [0.0, 0.0]]
+    assert social_matrix(history, mentions, window=pd.Timedelta(days=2))[2].tolist() == [11.0, 2.0]
+    assert not social_matrix(history, mentions.iloc[:0]).any()
+
+
+def test_forward_returns_and_rebalance_steps():
+    history = hourly_history([[100.0, 10.0], [110.0, np.nan], [99.0, 12.0], [121.0, 15.0]])
+    returns = forward_returns(history, pd.Timedelta(hours=2))
+    np.testing.assert_allclose(returns[:2], [[-0.01, 0.2], [0.1, np.nan]])
+    assert np.isnan(returns[2:]).all()
+    # Snapshots are irregular: each step is the first snapshot at or after the grid point.
+    times = np.array(["2024-01-01T00", "2024-01-01T00:40", "2024-01-01T02:10", "2024-01-01T02:20"],
+                     dtype="datetime64[ns]")
+    assert rebalance_steps(times, pd.Timedelta(hours=1)).tolist() == [0, 2]
+    assert rebalance_steps(times[:0], pd.Timedelta(hours=1)).tolist() == []
+
+
+def test_metrics_on_a_hand_checked_example():
+    picks = np.array([[True, True, False, False], [True, False, True, False], [False, False, False, False]])
+    returns = np.array([[0.1, -0.1, 0.0, 0.2], [0.3, np.nan, 0.1, 0.0], [0.0, 0.0, 0.0, 0.0]])
+    metrics = evaluate(picks, returns)
+    assert metrics["steps"] == 2
+    assert metrics["mean_return"] == pytest.approx((0.0 + 0.2) / 2)
+    assert metrics["universe_return"] == pytest.approx((0.05 + 0.4 / 3) / 2)
+    # Beating the median (0.05, then 0.1): coin 0 at both steps, out of four picks.
+    assert metrics["hit_rate"] == pytest.approx(0.5)
+    # One of two picks replaced, then an empty step that is not counted.
+    assert metrics["turnover"] == pytest.approx(0.5)
+
+
+def test_backtest_picks_the_assets_that_trend():
+    # coin-0 always has the highest change and the best next-hour return.
+    price = np.cumprod(np.tile([1.02, 1.0, 0.99], (48, 1)), axis=0)
+    change = np.tile([5.0, 1.0, 2.0], (48, 1))
+    result = run_backtest(hourly_history(price, change), np.zeros_like(price), top_k=1,
+                          horizon=pd.Timedelta(hours=1))
+    assert result["steps"] == 47
+    assert result["mean_return"] == pytest.approx(0.02)
+    assert result["hit_rate"] == 1.0 and result["turnover"] == 0.0
+    assert result["excess_return"] == pytest.approx(0.02 - (0.02 + 0.0 - 0.01) / 3)
+
+
+def test_parallel_sweep_matches_the_serial_one():
+    rng = np.random.default_rng(1)
+    price = np.cumprod(1 + rng.normal(0, 0.02, size=(200, 40)), axis=0)
+    history = hourly_history(price, rng.normal(size=(200, 40)))
+    social = rng.poisson(2.0, size=(200, 40)).astype(float)
+    grid = [(1.0, 0.0), (0.0, 1.0), (1.0, 1.0), (0.5, 2.0)]
+    options = dict(top_k=3, horizon=pd.Timedelta(hours=4))
+    serial = sweep(history, social, grid, processes=1, **options)
+    parallel = sweep(history, social, grid, processes=2, **options)
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert len(serial) == 4 and serial["excess_return"].is_monotonic_decreasing
@@ -0,0 +1,64 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py and backend/ can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import time
+import pandas as pd
+from benchmarks.generators import GENERATORS, write_raw_datasets
+from benchmarks.run_benchmarks import compare_to_baseline, load_baseline, merge_results, save_baseline, time_stage
+
+RAW_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "raw")
+
+
+def test_generators_match_the_collected_files(tmp_path):
+    paths = write_raw_datasets(str(tmp_path), 50, seed=3)
+    for file_name, path in paths.items():
+        generated = pd.read_csv(path)
+        collected = pd.read_csv(os.path.join(RAW_DIR, file_name), nrows=0)
+        assert list(generated.columns) == list(collected.columns)
+        # yfinance writes the ticker row below the header; the Yahoo generator does too.
+        assert len(generated) == (51 if file_name == "yahoo_crypto.csv" else 50)
+
+
+def test_generators_are_seeded():
+    for generator in GENERATORS.values():
+        assert generator(20, seed=1).equals(generator(20, seed=1))
+        assert not generator(20, seed=1).equals(generator(20, seed=2))
+
+
+def test_time_stage_keeps_the_best_run(capsys):
+    durations = iter([0.05, 0.01, 0.03])
+
+    def stage():
+        print("silenced")
+        time.sleep(next(durations))
+
+    assert 0.01 <= time_stage(stage, 3) < 0.03
+    assert capsys.readouterr().out == ""
+
+
+def test_regressions_are_flagged_above_the_threshold(capsys):
+    baseline = {"results": {"100": {"fast": 1.0, "slow": 1.0}}}
+    results = {"100": {"fast": 1.4, "slow": 1.6, "new": 5.0}, "200": {"fast": 9.0}}
+    assert compare_to_baseline(results, baseline, 1.5) == [("100", "slow", 1.6)]
+    out = capsys.readouterr().out
+    assert "new stage, no baseline" in out
+    assert "No baseline recorded for 200 rows" in out
+
+
+def test_saving_selected_stages_keeps_the_others():
+    stored = {"100": {"a": 1.0, "b": 2.0}}
+    results = {"100": {"a": 9.0, "b": 9.0, "c": 3.0}, "200": {"a": 4.0, "c": 5.0}}
+    assert merge_results(stored, results, ["c"]) == {"100": {"a": 1.0, "b": 2.0, "c": 3.0}, "200": {"c": 5.0}}
+    assert merge_results(stored, results) == {"100": {"a": 9.0, "b": 9.0, "c": 3.0}, "200": {"a": 4.0, "c": 5.0}}
+    assert stored == {"100": {"a": 1.0, "b": 2.0}}
+
+
+def test_baseline_round_trip(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    assert load_baseline(path) is None
+    save_baseline({"100": {"a": 0.5}}, path)
+    assert load_baseline(path)["results"] == {"100": {"a": 0.5}}
+    with open(path) as f:
+        assert f.read().endswith("}\n")
@@ -0,0 +1,59 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py and backend/ can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+import pytest
+from backend.checkpoints import write_csv
+
+
+def test_csv_is_what_pandas_writes(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 20_000
+    # Every float64 bit pattern, including NaN and infinities, plus the usual price magnitudes.
+    bits = np.frombuffer(rng.bytes(8 * n), dtype=np.float64)
+    special = [0.0, -0.0, 1.0, 1e-5, 1e-4, 0.1, 100.0, 1e15, 9999999999999998.0, 1e16, 1e22, 5e-324, np.nan, np.inf, -np.inf]
+    df = pd.DataFrame({
+        "bits": np.concatenate([bits[:n - len(special)], special]),
+        "price": np.round(rng.lognormal(3, 3, size=n), 2),
+        "volume": np.round(rng.uniform(0, 1e12, size=n)),
+        "small": rng.normal(size=n).astype(np.float32),
+        "time": pd.Timestamp("2024-01-01", tz="UTC") + pd.to_timedelta(rng.integers(0, 10**15, size=n), unit="us"),
+        "text": "a,b",
+    })
+    df.loc[::7, "time"] = pd.NaT
+    path = str(tmp_path / "frame.csv")
+    write_csv(df, path)
+    with open(path) as f:
+        assert f.read() == df.to_csv(index=False)
+    write_csv(df, path, na_rep="NA", index=True)
+    with open(path) as f:
+        assert f.read() == df.to_csv(na_rep="NA")
+
+
+def test_history_append_never_leaves_a_torn_file(monkeypatch, tmp_path):
+    from backend import collect_coingecko
+
+    monkeypatch.setattr(collect_coingecko, "HISTORY_DIR", str(tmp_path))
+    path = tmp_path / "coingecko_history.csv"
+    coins = pd.DataFrame({"id": ["bitcoin", "ethereum"], "current_price": [60000.0, 3000.0], "symbol": ["btc", "eth"]})
+    collect_coingecko.append_snapshot_history(coins, pd.Timestamp("2024-01-01", tz="UTC"))
+    collect_coingecko.append_snapshot_history(coins.iloc[:1], pd.Timestamp("2024-01-02", tz="UTC"))
+    history = pd.read_csv(path)
+    assert list(history.columns) == ["snapshot_time"] + collect_coingecko.HISTORY_FIELDS
+    assert history["id"].tolist() == ["bitcoin", "ethereum", "bitcoin"]
+    assert history["snapshot_time"].iloc[-1] == "2024-01-02T00:00:00+00:00"
+
+    # A crash while copying the history leaves the previous file as it was.
+    before = path.read_bytes()
+
+    def crash(source, target, length=0):
+        target.write(source.read(10))
+        raise OSError("disk full")
+    monkeypatch.setattr(collect_coingecko.shutil, "copyfileobj", crash)
+    with pytest.raises(OSError):
+        collect_coingecko.append_snapshot_history(coins, pd.Timestamp("2024-01-03", tz="UTC"))
+    assert path.read_bytes() == before
+    assert os.listdir(tmp_path) == ["coingecko_history.csv"]
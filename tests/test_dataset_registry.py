@@ -0,0 +1,203 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py and backend/ can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import subprocess
+import numpy as np
+import pandas as pd
+import pytest
+import config
+from backend import dataset_registry
+from backend.checkpoints import write_csv
+from backend.dataset_registry import DatasetRegistry
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Loads dataset `name` in a fresh interpreter with CSV parsing disabled, so it can only
+# succeed by memory-mapping the Arrow file, and prints a summary of what it got.
+CHILD = """
+import sys, json
+sys.path.insert(0, {root!r})
+import config
+config.PROCESSED_DATA_DIR = {processed!r}
+from backend import dataset_registry
+def no_parse(spec):
+    raise AssertionError("parsed " + spec.path())
+dataset_registry.load_csv = no_parse
+registry = dataset_registry.DatasetRegistry(arrow_cache_dir={cache!r})
+df = registry.get({name!r})
+print(json.dumps({{"source": registry.source_path({name!r}), "rows": len(df),
+                  "close": df["Close"].tolist(), "dtypes": {{c: str(t) for c, t in df.dtypes.items()}}}}))
+"""
+
+
+def load_in_other_process(processed, cache, name="yahoo"):
+    code = CHILD.format(root=ROOT, processed=str(processed), cache=str(cache), name=name)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def yahoo_frame(n=50):
+    dates = pd.date_range("2024-01-01", periods=n, freq="D", tz="UTC")
+    return pd.DataFrame({"Date": dates, "Open": np.arange(float(n)), "High": np.arange(float(n)) + 2,
+                         "Low": np.arange(float(n)), "Close": np.arange(float(n)) + 1, "Volume": 1e6,
+                         "Date_only": dates.date.astype(str)})
+
+
+@pytest.fixture
+def processed(monkeypatch, tmp_path):
+    directory = tmp_path / "processed"
+    directory.mkdir()
+    monkeypatch.setattr(config, "PROCESSED_DATA_DIR", str(directory))
+    return directory
+
+
+def test_datasets_load_once_in_compact_form(processed, monkeypatch):
+    write_csv(yahoo_frame(), str(processed / "yahoo_crypto_cleaned.csv"))
+    registry = DatasetRegistry()
+    first = registry.get("yahoo")
+    assert registry.get("yahoo") is first
+    assert str(first["Date"].dtype) == "datetime64[us, UTC]"
+    # Declared columns keep their schema dtype; undeclared low-cardinality text becomes a
+    # category and floats that survive float32 are narrowed.
+    assert str(first["Volume"].dtype) == "float64"
+    frame = pd.DataFrame({"kind": ["a", "b"] * 10, "score": np.arange(20.0)})
+    compact = dataset_registry.compact_frame(frame.copy())
+    assert str(compact["kind"].dtype) == "category"
+    assert str(compact["score"].dtype) == "float32"
+    assert registry.memory_usage()["yahoo"] > 0
+
+
+def test_arrow_cache_is_memory_mapped_by_other_processes(processed, tmp_path):
+    cache = tmp_path / "cache"
+    write_csv(yahoo_frame(), str(processed / "yahoo_crypto_cleaned.csv"))
+    expected = DatasetRegistry(arrow_cache_dir=str(cache)).get("yahoo")
+    assert (cache / "yahoo.arrow").exists()
+
+    child = load_in_other_process(processed, cache)
+    # The CSV is still the source of truth; the Arrow file is its cached, parsed copy.
+    assert child["source"] == str(processed / "yahoo_crypto_cleaned.csv")
+    assert child["close"] == expected["Close"].tolist()
+    assert child["dtypes"] == {name: str(dtype) for name, dtype in expected.dtypes.items()}
+
+
+def test_arrow_cache_is_rebuilt_when_the_csv_changes(processed, tmp_path, monkeypatch):
+    cache = str(tmp_path / "cache")
+    path = str(processed / "yahoo_crypto_cleaned.csv")
+    write_csv(yahoo_frame(), path)
+    DatasetRegistry(arrow_cache_dir=cache).get("yahoo")
+    write_csv(yahoo_frame(10), path)
+
+    parsed = []
+    load_csv = dataset_registry.load_csv
+    monkeypatch.setattr(dataset_registry, "load_csv", lambda spec: parsed.append(spec.name) or load_csv(spec))
+    assert len(DatasetRegistry(arrow_cache_dir=cache).get("yahoo")) == 10
+    assert parsed == ["yahoo"]
+    assert len(DatasetRegistry(arrow_cache_dir=cache).get("yahoo")) == 10
+    assert parsed == ["yahoo"]
+
+
+def test_unreadable_arrow_cache_falls_back_to_the_csv(processed, tmp_path):
+    cache = tmp_path / "cache"
+    cache.mkdir()
+    (cache / "yahoo.arrow").write_bytes(b"not an arrow file")
+    write_csv(yahoo_frame(), str(processed / "yahoo_crypto_cleaned.csv"))
+    assert len(DatasetRegistry(arrow_cache_dir=str(cache)).get("yahoo")) == 50
+
+
+def test_arrow_cache_can_be_switched_off():
+    code = "from backend.dataset_registry import registry; print(registry.arrow_cache_dir)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=ROOT,
+                            env=dict(os.environ, CRYPTOTREND_ARROW_CACHE="0", PYTHONPATH=ROOT))
+    assert result.stdout.strip() == "None"
+
+
+def test_publish_hands_the_frame_over_without_a_parse(processed, tmp_path, monkeypatch):
+    registry = DatasetRegistry(arrow_cache_dir=str(tmp_path / "cache"))
+    monkeypatch.setattr(dataset_registry, "load_csv", lambda spec: pytest.fail("parsed " + spec.path()))
+    published = registry.publish("yahoo", yahoo_frame(), sink=True)
+    assert registry.get("yahoo") is published
+    # The sink writes the CSV and an Arrow copy keyed to it, which other processes map.
+    assert registry.source_path("yahoo") == str(processed / "yahoo_crypto_cleaned.csv")
+    assert load_in_other_process(processed, tmp_path / "cache")["close"] == published["Close"].tolist()
+
+
+def test_publish_without_the_sink_leaves_only_the_arrow_file(processed, tmp_path):
+    cache = tmp_path / "cache"
+    csv_path = processed / "yahoo_crypto_cleaned.csv"
+    write_csv(yahoo_frame(), str(csv_path))
+    registry = DatasetRegistry(arrow_cache_dir=str(cache))
+    published = registry.publish("yahoo", yahoo_frame(20), sink=False)
+    # The stale CSV is gone, so nothing can load the previous version.
+    assert not csv_path.exists()
+    assert registry.source_path("yahoo") == str(cache / "yahoo.arrow")
+    assert registry.get("yahoo") is published
+
+    child = load_in_other_process(processed, cache)
+    assert child["source"] == str(cache / "yahoo.arrow")
+    assert child["close"] == published["Close"].tolist()
+    assert child["dtypes"] == {name: str(dtype) for name, dtype in published.dtypes.items()}
+
+
+def test_published_path_follows_the_sink(processed, tmp_path, monkeypatch):
+    csv_path, arrow_path = str(processed / "yahoo_crypto_cleaned.csv"), str(tmp_path / "cache" / "yahoo.arrow")
+    registry = DatasetRegistry(arrow_cache_dir=str(tmp_path / "cache"))
+    assert registry.published_path("yahoo", sink=True) == csv_path
+    assert registry.published_path("yahoo", sink=False) == arrow_path
+    monkeypatch.setattr(config, "PROCESSED_CSV_SINK", False)
+    assert registry.published_path("yahoo") == arrow_path
+    # Without an Arrow cache publish() always writes the CSV.
+    assert DatasetRegistry().published_path("yahoo", sink=False) == csv_path
+
+
+# Pipeline step for the resume test: `publish.py PROCESSED CACHE ROWS` publishes a
+# Yahoo frame of ROWS rows without the CSV sink and logs that it ran.
+PUBLISH_STEP = """
+import sys
+sys.path.insert(0, {root!r})
+import pandas as pd
+import config
+from backend.dataset_registry import DatasetRegistry
+processed, cache, rows = sys.argv[1], sys.argv[2], int(sys.argv[3])
+config.PROCESSED_DATA_DIR = processed
+close = [float(i) for i in range(rows)]
+DatasetRegistry(arrow_cache_dir=cache).publish("yahoo", pd.DataFrame({{
+    "Date": pd.date_range("2024-01-01", periods=rows, freq="D", tz="UTC"),
+    "Open": close, "High": close, "Low": close, "Close": close, "Volume": 1e6}}), sink=False)
+with open("runs.log", "a") as log:
+    log.write("publish\\n")
+"""
+
+
+def test_resume_hashes_the_published_arrow_files(processed, tmp_path, monkeypatch):
+    import main
+    from backend.checkpoints import CheckpointManifest
+
+    cache = tmp_path / "cache"
+    monkeypatch.setattr(config, "PROCESSED_CSV_SINK", False)
+    monkeypatch.setattr(main, "registry", DatasetRegistry(arrow_cache_dir=str(cache)))
+    (tmp_path / "backend").mkdir()
+    (tmp_path / "backend" / "publish.py").write_text(PUBLISH_STEP.format(root=ROOT))
+    outputs = [main.dataset("yahoo")]
+    assert outputs == [str(cache / "yahoo.arrow")]
+
+    def run(rows, resume=True):
+        log = tmp_path / "runs.log"
+        if log.exists():
+            log.unlink()
+        stage = main.Stage("preprocess_yahoo", ["publish.py", str(processed), str(cache), str(rows)], [], outputs)
+        manifest = CheckpointManifest(str(tmp_path / "manifest.json"))
+        assert main.run_pipeline([stage], manifest, str(tmp_path), resume=resume) == []
+        return log.exists()
+
+    assert run(50, resume=False)
+    assert not (processed / "yahoo_crypto_cleaned.csv").exists()
+    assert not run(50)
+    # Another publish changes the Arrow file, so the stage is no longer up to date.
+    DatasetRegistry(arrow_cache_dir=str(cache)).publish("yahoo", yahoo_frame(10), sink=False)
+    assert run(50)
+    assert not run(50)
+    (cache / "yahoo.arrow").unlink()
+    assert run(50)
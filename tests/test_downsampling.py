@@ -0,0 +1,58 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py and backend/ can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+from backend.downsampling import lttb, lttb_indices
+
+
+def reference_lttb(x, y, n_out):
+    """Point-by-point LTTB as originally described by Steinarsson, for comparison."""
+    n = len(x)
+    every = (n - 2) / (n_out - 2)
+    selected, a = [0], 0
+    for i in range(n_out - 2):
+        start, end = int(np.floor(i * every)) + 1, int(np.floor((i + 1) * every)) + 1
+        next_start, next_end = end, min(int(np.floor((i + 2) * every)) + 1, n)
+        avg_x, avg_y = np.mean(x[next_start:next_end]), np.mean(y[next_start:next_end])
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return np.array(selected)
+
+
+def test_matches_the_reference_algorithm():
+    rng = np.random.default_rng(0)
+    for n, n_out in [(1000, 100), (997, 13), (50, 49), (10, 3)]:
+        x = np.sort(rng.uniform(0, 1000, size=n))
+        y = np.cumsum(rng.normal(size=n))
+        assert np.array_equal(lttb_indices(x, y, n_out), reference_lttb(x, y, n_out))
+
+
+def test_keeps_endpoints_and_spikes():
+    x = np.arange(10_000, dtype=float)
+    y = np.zeros(10_000)
+    y[4321] = 50.0
+    y[7000] = -20.0
+    idx = lttb_indices(x, y, 100)
+    assert len(idx) == 100
+    assert idx[0] == 0 and idx[-1] == 9_999
+    assert np.all(np.diff(idx) > 0)
+    assert {4321, 7000} <= set(idx.tolist())
+
+
+def test_short_series_and_tiny_budgets():
+    x, y = np.arange(5.0), np.arange(5.0)
+    assert lttb_indices(x, y, 5).tolist() == [0, 1, 2, 3, 4]
+    assert lttb_indices(x, y, 50).tolist() == [0, 1, 2, 3, 4]
+    assert lttb_indices(x, y, 2).tolist() == [0, 4]
+    assert lttb_indices(x, y, 0).tolist() == []
+    sx, sy = lttb(x, y * 2, 3)
+    assert sx.tolist()[0] == 0 and sx.tolist()[-1] == 4
+    assert sy.tolist() == [v * 2 for v in sx.tolist()]
@@ -0,0 +1,99 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py and backend/ can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+import pytest
+import config
+from backend import dataset_registry, features
+from backend.checkpoints import write_csv
+from backend.dataset_registry import DatasetRegistry
+from backend.features import FeatureStore, features_as_of
+
+
+@pytest.fixture
+def sources(monkeypatch, tmp_path):
+    """Snapshot history, Fear & Greed and mention counts for two assets over three days."""
+    for name in ("PROCESSED_DATA_DIR", "HISTORY_DIR", "COMBINED_DATA_DIR"):
+        (tmp_path / name).mkdir()
+        monkeypatch.setattr(config, name, str(tmp_path / name))
+    registry = DatasetRegistry()
+    monkeypatch.setattr(dataset_registry, "registry", registry)
+    monkeypatch.setattr(features, "registry", registry)
+
+    snapshots = ["2024-01-01T06:00:00+00:00", "2024-01-02T06:00:00+00:00", "2024-01-02T18:00:00+00:00",
+                 "2024-01-02T23:00:00+00:00", "2024-01-03T06:00:00+00:00"]
+    write_csv(pd.DataFrame({
+        "snapshot_time": np.repeat(snapshots, 2),
+        "id": ["bitcoin", "ethereum"] * 5,
+        "current_price": [100.0, 10.0, 110.0, 11.0, 120.0, 12.0, 300.0, 30.0, 130.0, 13.0],
+        "price_change_percentage_24h": 1.0, "total_volume": 1e9, "market_cap": 1e12,
+    }), str(tmp_path / "HISTORY_DIR" / "coingecko_history.csv"))
+    write_fear_greed([40, 60, 80])
+    registry.publish("mentions", pd.DataFrame({
+        "bucket": pd.to_datetime(["2024-01-01", "2024-01-01", "2024-01-02"], utc=True),
+        "asset_id": ["bitcoin", "ethereum", "bitcoin"], "source": "reddit", "mentions": [5, 2, 7],
+        "sentiment": [0.5, -0.25, np.nan],
+    }), sink=True)
+    return tmp_path
+
+
+def write_fear_greed(values):
+    timestamps = pd.date_range("2024-01-01 12:00", periods=len(values), freq="D", tz="UTC")
+    dataset_registry.registry.publish("fear_greed", pd.DataFrame({
+        "value": values, "value_classification": "Neutral", "timestamp": timestamps.as_unit("s").asi8,
+        "time_until_update": np.nan,
+    }), sink=True)
+
+
+def test_only_parts_whose_inputs_changed_are_rebuilt(sources):
+    store = FeatureStore()
+    assert store.update() == ["prices", "fear_greed", "mentions"]
+    parts = {group.name: os.stat(store.part_path(group)).st_mtime_ns for group in features.GROUPS}
+    assert store.update() == []
+
+    write_fear_greed([40, 60, 90])
+    assert store.update() == ["fear_greed"]
+    assert {group.name: os.stat(store.part_path(group)).st_mtime_ns for group in features.GROUPS
+            if group.name != "fear_greed"} == {name: mtime for name, mtime in parts.items() if name != "fear_greed"}
+    table = pd.read_csv(store.table_path())
+    assert table.loc[table["bucket"].str.startswith("2024-01-03"), "fgi_value"].tolist() == [90, 90]
+
+    # A changed interval or --force rebuilds everything; a deleted part is rebuilt too.
+    assert FeatureStore(interval="12h").update() == ["prices", "fear_greed", "mentions"]
+    assert store.update() == ["prices", "fear_greed", "mentions"]
+    os.remove(store.part_path(features.GROUPS[2]))
+    assert store.update() == ["mentions"]
+    assert store.update(force=True) == ["prices", "fear_greed", "mentions"]
+
+
+def test_table_joins_every_source(sources):
+    FeatureStore().update()
+    table = dataset_registry.get_dataset("features")
+    assert list(table.columns) == features.COLUMNS
+    day2 = table[table["bucket"] == pd.Timestamp("2024-01-02", tz="UTC")].set_index("asset_id")
+    # The last snapshot of the bucket, its log return against the previous day, the
+    # market-wide FGI on every asset, and zero mentions for an asset reddit skipped.
+    assert day2.loc["bitcoin", "price"] == 300.0
+    assert day2.loc["bitcoin", "log_return"] == pytest.approx(np.log(300 / 100))
+    assert day2["fgi_value"].tolist() == [60, 60]
+    assert day2["reddit_mentions"].tolist() == [7, 0]
+    assert day2["reddit_sentiment"].isna().all()
+    day1 = table[table["bucket"] == pd.Timestamp("2024-01-01", tz="UTC")].set_index("asset_id")
+    assert day1.loc["ethereum", "reddit_sentiment"] == pytest.approx(-0.25)
+
+
+def test_lookups_never_see_later_values_of_the_same_bucket(sources):
+    FeatureStore().update()
+    # At 20:00 on the 2nd, that day's bucket would already hold the 23:00 price.
+    early = features_as_of("2024-01-02T20:00:00Z", columns=["price"])
+    assert early["bucket"].tolist() == [pd.Timestamp("2024-01-01", tz="UTC")] * 2
+    assert early["price"].tolist() == [100.0, 10.0]
+    # Once the bucket has ended it is complete and visible.
+    closed = features_as_of("2024-01-03", assets=["ethereum"])
+    assert (closed["asset_id"].tolist(), closed["price"].tolist()) == (["ethereum"], [30.0])
+    assert features_as_of("2024-01-01T23:59:59").empty
+    with pytest.raises(ValueError):
+        features_as_of("2024-01-03", columns=["nope"])
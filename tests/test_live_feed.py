@@ -0,0 +1,105 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py and backend/ can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+from backend import live_feed
+from backend.live_feed import LivePriceFeed, StubPriceFeed, diff_snapshot, format_sse
+
+
+def test_stub_walks_from_the_collected_prices_and_is_seeded():
+    first, second = StubPriceFeed(seed=7, max_symbols=20), StubPriceFeed(seed=7, max_symbols=20)
+    start = dict(first.binance_prices)
+    assert len(start) == 20
+    assert first.binance() == second.binance()
+    moved = first.binance()
+    assert moved.keys() == start.keys()
+    assert all(price >= 0 for price in moved.values())
+    assert moved != start
+    coins = first.coingecko()
+    assert all(set(fields) == set(live_feed.COINGECKO_LIVE_FIELDS) for fields in coins.values())
+
+
+def test_stub_falls_back_to_built_in_prices(monkeypatch, tmp_path):
+    monkeypatch.setattr(live_feed, "RAW_DATA_DIR", str(tmp_path))
+    stub = StubPriceFeed()
+    assert "BTCUSDT" in stub.binance()
+    assert "bitcoin" in stub.coingecko()
+
+
+def test_diff_and_sse_format():
+    assert diff_snapshot({"a": 1, "b": 2, "c": 3}, {"a": 1, "b": 5, "d": 4}) == ({"b": 5, "d": 4}, ["c"])
+    assert format_sse({"x": 1}, event="delta", event_id=3) == 'id: 3\nevent: delta\ndata: {"x":1}\n\n'
+    assert format_sse([1, 2]) == "data: [1,2]\n\n"
+
+
+def scripted(*snapshots):
+    """Fetch function returning `snapshots` in turn; an exception instance is raised instead."""
+    items = iter(snapshots)
+
+    def fetch():
+        item = next(items)
+        if isinstance(item, Exception):
+            raise item
+        return item
+    return fetch
+
+
+def test_polls_publish_deltas_and_notify_listeners():
+    feed = LivePriceFeed({"binance": (scripted({"BTC": 1.0, "ETH": 2.0}, {"BTC": 1.0, "ETH": 2.0},
+                                               RuntimeError("down"), {"BTC": 1.5}), 1)})
+    q = feed.subscribe()
+    seen = []
+    feed.add_listener(lambda source, snapshot, timestamp: seen.append((source, snapshot)))
+
+    assert feed.poll_source("binance") == 2
+    event = q.get_nowait()
+    assert (event["type"], event["version"], event["changed"], event["removed"]) == (
+        "delta", 1, {"BTC": 1.0, "ETH": 2.0}, [])
+
+    # An unchanged poll publishes nothing; a failed one keeps the last snapshot.
+    assert feed.poll_source("binance") == 0
+    assert feed.poll_source("binance") is None
+    assert q.empty()
+    assert feed.snapshot() == {"version": 1, "sources": {"binance": {"BTC": 1.0, "ETH": 2.0}}}
+
+    assert feed.poll_source("binance") == 2
+    event = q.get_nowait()
+    assert (event["version"], event["changed"], event["removed"]) == (2, {"BTC": 1.5}, ["ETH"])
+    assert [snapshot for _, snapshot in seen] == [{"BTC": 1.0, "ETH": 2.0}, {"BTC": 1.0, "ETH": 2.0}, {"BTC": 1.5}]
+
+
+def test_slow_subscriber_is_resynced_with_a_snapshot():
+    feed = LivePriceFeed({"binance": (scripted(*({"BTC": float(i)} for i in range(5))), 1)}, queue_size=2)
+    q = feed.subscribe()
+    for _ in range(5):
+        feed.poll_source("binance")
+    # The delta that overflowed the queue is folded into the snapshot that replaces the backlog.
+    assert [q.get_nowait() for _ in range(q.qsize())] == [
+        {"type": "snapshot", "version": 5, "sources": {"binance": {"BTC": 4.0}}}]
+
+
+def test_stream_sends_a_snapshot_then_deltas(monkeypatch):
+    from frontend import api
+    from frontend.app import create_app
+
+    feed = LivePriceFeed({"binance": (scripted({"BTC": 1.0, "ETH": 2.0}, {"BTC": 1.5, "ETH": 2.0}), 60)})
+    feed.poll_source("binance")
+    # An existing feed is used as is, so no poller thread or network access is involved.
+    monkeypatch.setattr(api, "live_feed", feed)
+
+    response = create_app().test_client().get("/stream/prices", buffered=False)
+    assert response.mimetype == "text/event-stream"
+    chunks = iter(response.response)
+    lines = next(chunks).decode().splitlines()
+    assert lines[:2] == ["id: 1", "event: snapshot"]
+    snapshot = json.loads(lines[2][len("data: "):])
+    assert snapshot["sources"]["binance"] == {"BTC": 1.0, "ETH": 2.0}
+
+    feed.poll_source("binance")
+    lines = next(chunks).decode().splitlines()
+    assert lines[:2] == ["id: 2", "event: delta"]
+    assert json.loads(lines[2][len("data: "):])["changed"] == {"BTC": 1.5}
+    response.close()
+    assert feed.subscribers == []
@@ -0,0 +1,38 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py and backend/ can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+from backend.mentions import build_automaton
+
+COINS = pd.DataFrame({
+    "id": ["bitcoin", "ethereum", "would", "status", "aethir", "apenft", "flow"],
+    "name": ["Bitcoin", "Ethereum", "would", "Status", "Aethir", "APENFT", "Flow"],
+    "symbol": ["btc", "eth", "would", "snt", "ath", "nft", "flow"],
+    "market_cap_rank": [1, 2, 300, 400, 250, 170, 120],
+})
+
+
+def mentioned(text):
+    automaton = build_automaton(COINS)
+    return {automaton.asset_ids[index] for index in automaton.scan(text)}
+
+
+def test_ordinary_words_are_not_mentions():
+    text = ("Would BTC hit a new ATH? In this status update: the NFT market is in a holding pattern, "
+            "traders would rather wait for cash flow to return.")
+    assert mentioned(text) == {"bitcoin"}
+
+
+def test_dictionary_names_need_a_capital_or_cashtag():
+    assert mentioned("status report on the order flow") == set()
+    assert mentioned("Status (SNT) and Flow rallied") == {"status", "flow"}
+    assert mentioned("loading up on $status and $flow") == {"status", "flow"}
+
+
+def test_regular_names_and_tickers_still_match():
+    assert mentioned("bitcoin and Ethereum both dipped") == {"bitcoin", "ethereum"}
+    assert mentioned("ETH/BTC ratio, plus $eth") == {"bitcoin", "ethereum"}
+    assert mentioned("Aethir is a GPU network") == {"aethir"}
+    assert mentioned("bitcoins and ethereumx are not names") == set()
@@ -0,0 +1,98 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py and backend/ can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+from backend.checkpoints import CheckpointManifest
+from main import Stage, run_pipeline
+
+# Fake pipeline step: `step.py NAME OUTPUT [INPUT...]` logs its run, fails while a
+# `fail_NAME` file exists, and otherwise writes its inputs plus its name to OUTPUT.
+STEP = """
+import os, sys
+name, output, inputs = sys.argv[1], sys.argv[2], sys.argv[3:]
+with open("runs.log", "a") as log:
+    log.write(name + "\\n")
+if os.path.exists("fail_" + name):
+    sys.exit(name + " could not fetch its data")
+text = "".join(open(path).read() for path in inputs)
+with open(output, "w") as f:
+    f.write(text + name + "\\n")
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    """A project root whose backend/ holds the fake step script."""
+    (tmp_path / "backend").mkdir()
+    (tmp_path / "backend" / "step.py").write_text(STEP)
+    (tmp_path / "source.txt").write_text("raw\n")
+    return tmp_path
+
+
+def stages(root):
+    def stage(name, inputs):
+        output = str(root / f"{name}.txt")
+        return Stage(name, ["step.py", name, output, *inputs], inputs, [output])
+    source, a, b = str(root / "source.txt"), str(root / "a.txt"), str(root / "b.txt")
+    # a <- source, b <- a, c <- b, d <- source
+    return [stage("a", [source]), stage("b", [a]), stage("c", [b]), stage("d", [source])]
+
+
+def run(root, resume):
+    manifest = CheckpointManifest(str(root / "manifest.json"))
+    log = root / "runs.log"
+    if log.exists():
+        log.unlink()
+    unsuccessful = run_pipeline(stages(root), manifest, str(root), resume=resume)
+    ran = log.read_text().split() if log.exists() else []
+    return ran, unsuccessful, manifest
+
+
+def test_resume_skips_stages_that_are_up_to_date(project):
+    assert run(project, resume=False)[:2] == (["a", "b", "c", "d"], [])
+    assert run(project, resume=True)[:2] == ([], [])
+    # Without --resume everything runs again.
+    assert run(project, resume=False)[0] == ["a", "b", "c", "d"]
+
+
+def test_resume_reruns_stages_whose_inputs_or_outputs_changed(project):
+    run(project, resume=False)
+    (project / "b.txt").write_text("edited by hand\n")
+    # b's output no longer matches what it wrote. Rerunning b restores the content c
+    # read, so c stays up to date.
+    assert run(project, resume=True)[0] == ["b"]
+    (project / "source.txt").write_text("new raw\n")
+    assert run(project, resume=True)[0] == ["a", "b", "c", "d"]
+    (project / "d.txt").unlink()
+    assert run(project, resume=True)[0] == ["d"]
+
+
+def test_failures_block_downstream_stages_until_resumed(project):
+    (project / "fail_b").write_text("")
+    ran, unsuccessful, manifest = run(project, resume=False)
+    assert ran == ["a", "b", "d"]
+    assert unsuccessful == ["b", "c"]
+    assert (manifest.status("b"), manifest.stages["b"]["error"]) == ("failed", "b could not fetch its data")
+    assert (manifest.status("c"), manifest.stages["c"]["error"]) == ("blocked", "blocked by b")
+    assert manifest.status("a") == manifest.status("d") == "completed"
+
+    # A resumed run retries the failed and blocked stages only.
+    assert run(project, resume=True)[:2] == (["b"], ["b", "c"])
+    (project / "fail_b").unlink()
+    ran, unsuccessful, manifest = run(project, resume=True)
+    assert (ran, unsuccessful) == (["b", "c"], [])
+    assert (project / "c.txt").read_text() == "raw\na\nb\nc\n"
+    assert all(manifest.status(name) == "completed" for name in "abcd")
+    assert "error" not in manifest.stages["b"]
+
+
+def test_manifest_survives_a_new_process(project):
+    run(project, resume=False)
+    manifest = CheckpointManifest(str(project / "manifest.json"))
+    stage = stages(project)[1]
+    assert manifest.is_fresh(stage.name, stage.inputs, stage.outputs)
+    assert not manifest.is_fresh("unknown", [], [])
+    # An output the stage did not record is not vouched for.
+    assert not manifest.is_fresh(stage.name, stage.inputs, stage.outputs + [str(project / "d.txt")])
@@ -0,0 +1,51 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py and backend/ can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+from backend.backtest import MarketHistory
+from backend.portfolio import ledoit_wolf, pairwise_covariance, returns_matrix
+
+
+def test_missing_snapshots_leave_gaps_instead_of_zero_returns():
+    times = np.array(["2024-01-01T00", "2024-01-02T00", "2024-01-02T12", "2024-01-05T00", "2024-01-06T00"],
+                     dtype="datetime64[ns]")
+    price = np.array([[100.0, 10.0], [110.0, np.nan], [121.0, 11.0], [100.0, 12.0], [50.0, 12.0]])
+    history = MarketHistory(times, ["bitcoin", "ethereum"], price, np.zeros_like(price))
+    grid, assets, returns = returns_matrix(history, ["ethereum", "bitcoin", "unknown"])
+    assert assets == ["ethereum", "bitcoin"]
+    assert grid.tolist() == pd.date_range("2024-01-02", "2024-01-06", freq="D").as_unit("ns").to_numpy().tolist()
+    expected = np.log([[np.nan, 110 / 100], [np.nan, np.nan], [np.nan, np.nan], [np.nan, np.nan], [1.0, 50 / 100]])
+    # 01-03 samples the 12:00 snapshot. 01-04 has none of its own, so neither it nor
+    # 01-05 becomes a return against that stale price.
+    expected[1, 1] = np.log(121 / 110)
+    np.testing.assert_allclose(returns, expected)
+
+
+def test_pairwise_covariance_matches_pandas():
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0, 0.02, size=(500, 12)) + rng.normal(0, 0.02, size=(500, 1))
+    returns[rng.random(returns.shape) < 0.2] = np.nan
+    returns[:480, 11] = np.nan
+    cov, corr, n = pairwise_covariance(returns, min_periods=30, block_rows=64)
+    frame = pd.DataFrame(returns)
+    np.testing.assert_allclose(cov, frame.cov(min_periods=30).to_numpy(), rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(corr, frame.corr(min_periods=30).to_numpy(), rtol=1e-9, equal_nan=True)
+    assert n[0, 11] == frame[[0, 11]].dropna().shape[0]
+    assert np.isnan(corr[11, 11]) and np.isnan(cov[0, 11])
+
+
+def test_shrinkage_pulls_a_noisy_estimate_towards_the_identity():
+    rng = np.random.default_rng(1)
+    returns = rng.normal(0, 0.02, size=(40, 100))
+    cov, _, _ = pairwise_covariance(returns, min_periods=2)
+    shrunk, intensity = ledoit_wolf(returns, cov)
+    assert 0.5 < intensity <= 1.0
+    # The true covariance is diagonal; shrinking moves the estimate closer to it.
+    truth = np.eye(100) * 0.02 ** 2
+    assert np.linalg.norm(shrunk - truth) < np.linalg.norm(cov - truth)
+    # 40 observations of 100 assets give a singular estimate; the shrunk one is invertible.
+    assert np.linalg.matrix_rank(cov) < 100
+    assert np.linalg.eigvalsh(shrunk).min() > 0
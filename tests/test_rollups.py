@@ -0,0 +1,81 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py and backend/ can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+import pytest
+from backend.checkpoints import write_csv
+from backend.rollups import RollupStore, replace_tail
+
+
+def candles(n, start="2024-01-29", freq="h", seed=0):
+    """`n` base OHLCV candles `freq` apart, like a cleaned Yahoo history."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, size=n)))
+    return pd.DataFrame({"Date": pd.date_range(start, periods=n, freq=freq, tz="UTC"),
+                         "Open": close * (1 + rng.normal(0, 0.005, size=n)), "High": close * 1.01,
+                         "Low": close * 0.99, "Close": close, "Volume": rng.uniform(1e6, 1e9, size=n)})
+
+
+@pytest.mark.parametrize("removed", [0, 1, 3, 2_000])
+def test_replace_tail_matches_rewriting_the_file(tmp_path, removed):
+    df = candles(3_000).rename(columns={"Date": "bucket"})
+    tail = candles(5, start="2025-01-01").rename(columns={"Date": "bucket"})
+    path, expected = str(tmp_path / "level.csv"), str(tmp_path / "expected.csv")
+    write_csv(df, path)
+    # 2,000 rows span several of the 64 KiB blocks read from the end of the file.
+    replace_tail(path, removed, tail)
+    write_csv(pd.concat([df.iloc[:len(df) - removed], tail], ignore_index=True), expected)
+    with open(path, "rb") as f, open(expected, "rb") as g:
+        assert f.read() == g.read()
+
+
+def test_replace_tail_can_drop_every_row(tmp_path):
+    df = candles(4).rename(columns={"Date": "bucket"})
+    path = str(tmp_path / "level.csv")
+    write_csv(df, path)
+    replace_tail(path, 4, df.iloc[:1])
+    assert pd.read_csv(path)["Close"].tolist() == df["Close"].iloc[:1].tolist()
+
+
+def assert_same_rollups(store, reference, asset):
+    assert store.levels(asset) == reference.levels(asset)
+    for level in reference.levels(asset):
+        with open(store.level_path(asset, level), "rb") as f, open(reference.level_path(asset, level), "rb") as g:
+            assert f.read() == g.read(), level
+        pd.testing.assert_frame_equal(store.frame(asset, level), reference.frame(asset, level))
+        # The in-memory frames are what a fresh process reads back from the files.
+        pd.testing.assert_frame_equal(RollupStore(store.directory).frame(asset, level), store.frame(asset, level))
+
+
+def test_incremental_appends_match_a_full_rebuild(tmp_path):
+    # Three months of hourly candles, appended in batches that end mid-bucket at every level.
+    history = candles(24 * 92 + 7)
+    store = RollupStore(str(tmp_path / "incremental"))
+    store.rebuild("BTC-USD", history.iloc[:500])
+    for end in (501, 503, 777, 1_500, 1_500, 2_000, len(history)):
+        store.append("BTC-USD", history.iloc[:end])
+    reference = RollupStore(str(tmp_path / "rebuilt"))
+    reference.rebuild("BTC-USD", history)
+
+    assert store.levels("BTC-USD") == ["1h", "4h", "1d", "1w", "1M"]
+    assert_same_rollups(store, reference, "BTC-USD")
+    monthly = reference.frame("BTC-USD", "1M")
+    assert monthly["count"].sum() == len(history)
+    assert monthly["High"].iloc[0] == history["High"].iloc[:24 * 3].max()
+
+
+def test_append_skips_folded_candles_and_rebuilds_unknown_assets(tmp_path):
+    daily = candles(400, freq="D")
+    store = RollupStore(str(tmp_path))
+    assert store.append("BTC-USD", daily.iloc[:300]) == 300
+    # Daily candles only get the daily and coarser levels.
+    assert store.levels("BTC-USD") == ["1d", "1w", "1M"]
+    assert store.append("BTC-USD", daily.iloc[:300]) == 0
+    assert store.append("BTC-USD", daily) == 100
+    reference = RollupStore(str(tmp_path / "rebuilt"))
+    reference.rebuild("BTC-USD", daily)
+    assert_same_rollups(store, reference, "BTC-USD")
+    assert store.load_state()["BTC-USD"]["last_time"] == daily["Date"].iloc[-1].isoformat()
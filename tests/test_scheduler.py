@@ -0,0 +1,134 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py and backend/ can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import asyncio
+import itertools
+from backend.scheduler import FakeClock, Scheduler, Source
+
+
+def simulate(scheduler, clock, seconds):
+    """Run `scheduler` on `clock` for `seconds` of simulated time, then stop it."""
+    async def main():
+        task = asyncio.create_task(scheduler.run())
+        await clock.advance(seconds)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    asyncio.run(main())
+
+
+def run_times(scheduler, name):
+    return [when for when, event, _ in scheduler.history if event == name]
+
+
+async def succeed():
+    pass
+
+
+async def fail():
+    raise RuntimeError("upstream unavailable")
+
+
+def changing():
+    """Fingerprint that differs on every call, i.e. every collection brings new data."""
+    counter = itertools.count()
+    return lambda: next(counter)
+
+
+def test_sources_run_on_their_interval():
+    clock = FakeClock()
+    source = Source("prices", succeed, interval=60, fingerprint=lambda: "same")
+    scheduler = Scheduler([source], {}, downstream={}, clock=clock, offload=False)
+    simulate(scheduler, clock, 180)
+    assert run_times(scheduler, "prices") == [0, 60, 120, 180]
+
+
+def test_jitter_stays_within_bounds_and_is_seeded():
+    def times(seed):
+        clock = FakeClock()
+        source = Source("prices", succeed, interval=60, jitter=10, fingerprint=lambda: "same")
+        scheduler = Scheduler([source], {}, downstream={}, clock=clock, seed=seed, offload=False)
+        simulate(scheduler, clock, 600)
+        return run_times(scheduler, "prices")
+
+    first = times(seed=1)
+    gaps = [later - earlier for earlier, later in zip(first, first[1:])]
+    assert len(gaps) >= 8
+    assert all(50 <= gap <= 70 for gap in gaps)
+    assert len(set(gaps)) > 1
+    assert times(seed=1) == first
+
+
+def test_failures_back_off_exponentially_up_to_the_cap():
+    clock = FakeClock()
+    source = Source("news", fail, interval=600, retry_delay=10, max_backoff=40, fingerprint=lambda: "same")
+    scheduler = Scheduler([source], {}, downstream={}, clock=clock, offload=False)
+    simulate(scheduler, clock, 150)
+    assert run_times(scheduler, "news") == [0, 10, 30, 70, 110, 150]
+    assert source.failures == 6
+
+
+def test_backoff_resets_after_a_success():
+    clock = FakeClock()
+    outcomes = iter([fail, fail, succeed])
+
+    async def collect():
+        await next(outcomes, succeed)()
+
+    source = Source("news", collect, interval=100, retry_delay=10, fingerprint=lambda: "same")
+    scheduler = Scheduler([source], {}, downstream={}, clock=clock, offload=False)
+    simulate(scheduler, clock, 130)
+    assert run_times(scheduler, "news") == [0, 10, 30, 130]
+    assert source.failures == 0
+
+
+def test_changes_are_coalesced_into_one_pass_in_pipeline_order():
+    clock = FakeClock()
+    calls = []
+    steps = {name: (lambda name=name: calls.append(name) or True) for name in ["clean_a", "clean_b", "combine"]}
+    sources = [
+        Source("a", succeed, interval=100, fingerprint=changing()),
+        Source("b", succeed, interval=100, fingerprint=changing()),
+        Source("c", succeed, interval=100, fingerprint=lambda: "same"),
+    ]
+    downstream = {"a": ["combine", "clean_a"], "b": ["clean_b", "combine"], "c": ["clean_a"]}
+    scheduler = Scheduler(sources, steps, downstream=downstream, dependencies={}, clock=clock, offload=False)
+    simulate(scheduler, clock, 0)
+    # Both changes arrived before the pipeline ran, so "combine" runs once, after both cleans.
+    assert calls == ["clean_a", "clean_b", "combine"]
+
+    # On the next run only "b" brings new data; "c" is still unchanged.
+    calls.clear()
+    sources[0].fingerprint = lambda: scheduler.fingerprints["a"]
+    scheduler.clock = clock = FakeClock()
+    simulate(scheduler, clock, 0)
+    assert calls == ["clean_b", "combine"]
+
+
+def test_failed_step_blocks_its_downstream_until_the_next_pass():
+    clock = FakeClock()
+    results = iter([None, True])
+    calls = []
+
+    def clean():
+        calls.append("clean")
+        return next(results)
+
+    def combine():
+        calls.append("combine")
+        return True
+
+    source = Source("a", succeed, interval=100, fingerprint=changing())
+    scheduler = Scheduler([source], {"clean": clean, "combine": combine}, downstream={"a": ["clean", "combine"]},
+                          dependencies={"combine": ["clean"]}, clock=clock, offload=False)
+    simulate(scheduler, clock, 0)
+    assert calls == ["clean"]
+    assert [(name, outcome) for _, name, outcome in scheduler.history if name != "a"] == [
+        ("clean", "failed"), ("combine", "blocked")]
+    assert scheduler.dirty == {"clean", "combine"}
+
+    scheduler.clock = clock = FakeClock()
+    simulate(scheduler, clock, 0)
+    assert calls == ["clean", "clean", "combine"]
+    assert scheduler.dirty == set()
@@ -0,0 +1,67 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py and backend/ can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+from backend.schema import SCHEMAS, Column, Schema, validate, write_quarantine
+
+PRICES = Schema("prices", [
+    Column("symbol", "string", nullable=False),
+    Column("price", "float64", nullable=False, min_value=0),
+    Column("rank", "int32", nullable=False, min_value=1, max_value=100),
+    Column("listed", "datetime", unit="s"),
+], unique=["symbol"])
+
+
+def test_columns_are_coerced_and_downcast():
+    raw = pd.DataFrame({"symbol": ["BTC", "ETH"], "price": ["65000.5", "3200"], "rank": ["1", "2"],
+                        "listed": [1230940800, 1438214400], "extra": ["kept", "as is"]})
+    clean, quarantined = validate(raw, PRICES)
+    assert quarantined.empty
+    assert clean["price"].tolist() == [65000.5, 3200.0]
+    assert str(clean["rank"].dtype) == "int32"
+    assert str(clean["symbol"].dtype) == "string"
+    assert clean["listed"].tolist() == [pd.Timestamp("2009-01-03", tz="UTC"), pd.Timestamp("2015-07-30", tz="UTC")]
+    assert clean["extra"].tolist() == ["kept", "as is"]
+
+
+def test_invalid_rows_are_quarantined_with_every_reason():
+    raw = pd.DataFrame({"symbol": ["BTC", "ETH", "BTC", "", "SOL"],
+                        "price": ["1", "-5", "2", "3", "cheap"],
+                        "rank": ["1", "101", "3", "4", "5"],
+                        "listed": [None] * 5})
+    clean, quarantined = validate(raw, PRICES)
+    assert clean["symbol"].tolist() == ["BTC"]
+    reasons = dict(zip(quarantined.index, quarantined["quarantine_reason"]))
+    assert reasons == {
+        1: "price: below 0; rank: above 100",
+        2: "duplicate symbol",
+        3: "symbol: missing",
+        4: "price: not a valid float64; price: missing",
+    }
+
+
+def test_quarantine_keeps_the_raw_input():
+    # yfinance writes a ticker row under the header; it must stay inspectable and replayable.
+    raw = pd.DataFrame({"Date": [None, "2024-01-01", "2024-01-02"],
+                        "Open": ["BTC-USD", "42000.1", "44000"], "High": ["BTC-USD", "43000", "45000"],
+                        "Low": ["BTC-USD", "41000", "43000"], "Close": ["BTC-USD", "42500", "44500"],
+                        "Volume": ["BTC-USD", "1e9", "2e9"]})
+    clean, quarantined = validate(raw, SCHEMAS["yahoo"])
+    assert len(clean) == 2
+    assert quarantined.drop(columns="quarantine_reason").equals(raw.iloc[[0]])
+    assert quarantined["quarantine_reason"].iloc[0].startswith("Date: missing; Open: not a valid float64")
+    # The input frame itself is left untouched.
+    assert raw["Open"].tolist() == ["BTC-USD", "42000.1", "44000"]
+
+
+def test_write_quarantine_saves_and_clears_the_file(tmp_path):
+    raw = pd.DataFrame({"symbol": ["BTC", "ETH"], "price": ["1", "-1"], "rank": ["1", "2"], "listed": ["", "x"]})
+    _, quarantined = validate(raw, PRICES)
+    path = write_quarantine(quarantined, "prices", str(tmp_path))
+    saved = pd.read_csv(path, dtype=str)
+    assert saved.to_dict("records") == [{"symbol": "ETH", "price": "-1", "rank": "2", "listed": "x",
+                                         "quarantine_reason": "price: below 0; listed: not a valid datetime"}]
+    assert write_quarantine(quarantined.iloc[:0], "prices", str(tmp_path)) is None
+    assert not os.path.exists(path)
@@ -0,0 +1,105 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py and backend/ can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+import pytest
+import config
+from backend import dataset_registry, search
+from backend.dataset_registry import DatasetRegistry
+from backend.search import SearchIndex
+
+COINS = pd.DataFrame({
+    "id": ["bitcoin", "ethereum"], "symbol": ["btc", "eth"], "name": ["Bitcoin", "Ethereum"],
+    "market_cap_rank": [1.0, 2.0],
+})
+
+
+@pytest.fixture
+def index(monkeypatch, tmp_path):
+    """An empty index over a registry holding the CoinGecko listing and no documents yet."""
+    monkeypatch.setattr(config, "PROCESSED_DATA_DIR", str(tmp_path))
+    registry = DatasetRegistry()
+    monkeypatch.setattr(dataset_registry, "registry", registry)
+    monkeypatch.setattr(search, "registry", registry)
+    registry.publish("coingecko", COINS, sink=True)
+    return SearchIndex(str(tmp_path / "search.db"))
+
+
+def publish_news(articles):
+    """Publish (title, description, published) articles as the processed news dataset."""
+    titles, descriptions, published = zip(*articles)
+    dataset_registry.registry.publish("news", pd.DataFrame({
+        "source": "Wire", "title": titles, "url": [f"https://news.example/{i}" for i in range(len(titles))],
+        "publishedAt": pd.to_datetime(published, utc=True, format="ISO8601"), "description": descriptions,
+        "content": "",
+    }), sink=True)
+
+
+def publish_reddit(posts):
+    titles, created = zip(*posts)
+    dataset_registry.registry.publish("reddit", pd.DataFrame({
+        "keyword": "crypto", "title": titles, "score": 1, "url": [f"https://reddit.example/{i}" for i in range(len(titles))],
+        "num_comments": 0, "created": pd.to_datetime(created, utc=True, format="ISO8601"), "author": "someone",
+        "subreddit": "crypto",
+    }), sink=True)
+
+
+def titles(hits):
+    return [hit["title"] for hit in hits]
+
+
+def test_relevance_outranks_recency(index):
+    # The best match is older than 1,500 documents that barely mention the term.
+    newer = [(f"Market update {i}", "analysts mention staking in passing",
+              (pd.Timestamp("2024-03-01") + pd.Timedelta(minutes=i)).isoformat()) for i in range(1_500)]
+    publish_news([("Staking staking: a staking guide", "How staking works", "2023-01-01")] + newer)
+    index.update()
+    hits = index.search("staking", limit=3)
+    assert titles(hits) == ["Staking staking: a staking guide", "Market update 1499", "Market update 1498"]
+    assert hits[0]["snippet_html"].count("<mark>") >= 2
+    # Every match can be paged to, the oldest weak match last.
+    assert titles(index.search("staking", limit=5, offset=1_500)) == ["Market update 0"]
+    assert index.search("staking", offset=1_501) == []
+
+
+def test_filters_narrow_results(index):
+    publish_news([("Bitcoin ETF approved", "Spot bitcoin funds open", "2024-01-10"),
+                  ("Ethereum upgrade ships", "ETH staking changes", "2024-02-10"),
+                  ("BTC and ETH rally together", "Both assets rise", "2024-03-10")])
+    publish_reddit([("Is bitcoin a buy?", "2024-02-20"), ("Ethereum gas fees", "2024-03-20")])
+    index.update()
+    assert titles(index.search()) == ["Ethereum gas fees", "BTC and ETH rally together", "Is bitcoin a buy?",
+                                      "Ethereum upgrade ships", "Bitcoin ETF approved"]
+    assert set(titles(index.search(assets=["ethereum"]))) == \
+        {"Ethereum gas fees", "BTC and ETH rally together", "Ethereum upgrade ships"}
+    assert titles(index.search("bitcoin OR ethereum", sources=["reddit"])) == ["Ethereum gas fees", "Is bitcoin a buy?"]
+    assert titles(index.search("bitcoin", start="2024-02-01", end="2024-02-28")) == ["Is bitcoin a buy?"]
+    assert titles(index.search("bitcoin", start="2024-02-20", end="2024-02-20")) == ["Is bitcoin a buy?"]
+    assert titles(index.search("bitcoin", start="2024-02-20T00:00:01")) == []
+    assert titles(index.search(assets=["bitcoin"], start="2024-02-21")) == ["BTC and ETH rally together"]
+    assert titles(index.search("rally", assets=["bitcoin"], end="2024-03-01")) == []
+    assert index.search("etf")[0]["assets"] == ["bitcoin"]
+    with pytest.raises(ValueError):
+        index.search("!!!")
+    with pytest.raises(ValueError):
+        index.search(sources=["twitter"])
+
+
+def test_update_indexes_only_new_documents(index, monkeypatch):
+    articles = [("Bitcoin halving", "Supply drops", "2024-04-20"), ("Ether ETF filed", "", "2024-05-01")]
+    read = []
+    iter_batches = dataset_registry.registry.iter_batches
+    monkeypatch.setattr(dataset_registry.registry, "iter_batches", lambda name, *args: read.append(name) or
+                        iter_batches(name, *args))
+    publish_news(articles[:1])
+    assert (index.update(), read) == (1, ["news"])
+    # An unchanged file is not read again.
+    assert (index.update(), read) == (0, ["news"])
+
+    publish_news(articles)
+    assert index.update() == 1
+    assert titles(index.search()) == ["Ether ETF filed", "Bitcoin halving"]
+    assert index.update(rebuild=True) == 2
+    assert len(index.search()) == 2
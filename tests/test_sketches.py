@@ -0,0 +1,132 @@
+import sys
+import os
+# Add the project root (parent directory) to sys.path so that config.py and backend/ can be found.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import math
+from collections import Counter
+import numpy as np
+import pytest
+from backend.sketches import CountMinSketch, HyperLogLog, SlidingMentionCounter, SpaceSaving
+
+HOUR = 3600
+
+
+def zipf_stream(n, n_keys, seed=0):
+    """`n` keys drawn from a Zipf-like distribution over `n_keys` coins."""
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, n_keys + 1)
+    return [f"coin-{i}" for i in rng.choice(n_keys, size=n, p=weights / weights.sum())]
+
+
+def test_count_min_never_undercounts_and_stays_within_its_bound():
+    stream = zipf_stream(50_000, 5_000)
+    sketch = CountMinSketch(width=512, depth=4)
+    for key in stream:
+        sketch.add(key)
+    truth = Counter(stream)
+    errors = np.array([sketch.estimate(key) - count for key, count in truth.items()])
+    assert errors.min() >= 0
+    bound = math.e * len(stream) / sketch.width
+    # The bound holds for each key with probability 1 - exp(-depth).
+    assert np.mean(errors > bound) <= math.exp(-sketch.depth)
+    assert sketch.estimate("never-seen") <= bound
+
+
+def test_count_min_merge_equals_one_sketch_over_both_streams():
+    first, second = zipf_stream(5_000, 300, seed=1), zipf_stream(5_000, 300, seed=2)
+    a, b, both = CountMinSketch(256, 3), CountMinSketch(256, 3), CountMinSketch(256, 3)
+    for key in first:
+        a.add(key)
+        both.add(key)
+    for key in second:
+        b.add(key)
+        both.add(key)
+    a.merge(b)
+    assert np.array_equal(a.table, both.table) and a.total == both.total == 10_000
+    with pytest.raises(ValueError):
+        a.merge(CountMinSketch(256, 3, seed=1))
+
+
+@pytest.mark.parametrize("n", [50, 1_000, 50_000])
+def test_hyperloglog_error_is_within_three_standard_errors(n):
+    hll = HyperLogLog(precision=10)
+    for i in range(n):
+        hll.add(f"user_{i}")
+        hll.add(f"user_{i // 2}")
+    standard_error = 1.04 / math.sqrt(1 << 10)
+    assert abs(hll.count() - n) <= 3 * standard_error * n + 1
+
+
+def test_hyperloglog_merge_counts_the_union():
+    a, b, union = HyperLogLog(), HyperLogLog(), HyperLogLog()
+    for i in range(3_000):
+        a.add(i)
+        union.add(i)
+    for i in range(2_000, 6_000):
+        b.add(i)
+        union.add(i)
+    a.merge(b)
+    assert np.array_equal(a.registers, union.registers)
+    assert abs(a.count() - 6_000) <= 0.1 * 6_000
+    with pytest.raises(ValueError):
+        a.merge(HyperLogLog(precision=12))
+
+
+def test_space_saving_tracks_every_heavy_hitter():
+    stream = zipf_stream(20_000, 2_000, seed=3)
+    summary = SpaceSaving(capacity=50)
+    for key in stream:
+        summary.add(key)
+    truth = Counter(stream)
+    heavy = {key for key, count in truth.items() if count > len(stream) / summary.capacity}
+    assert heavy and heavy <= set(summary.counts)
+    for key, count in summary.counts.items():
+        assert count - summary.errors[key] <= truth[key] <= count
+    assert [key for key, _ in summary.top(3)] == [key for key, _ in truth.most_common(3)]
+
+
+def test_window_slides_and_drops_expired_buckets():
+    counter = SlidingMentionCounter({"bucket_seconds": HOUR, "window_buckets": 3})
+    counter.add(0, "bitcoin", "alice")
+    counter.add(HOUR + 5, "bitcoin", "bob", count=2)
+    counter.add(2 * HOUR, "ethereum", "alice")
+    assert counter.mentions("bitcoin") == 3
+    assert counter.unique_authors("bitcoin") == 2
+    assert counter.top(1) == [("bitcoin", 3)]
+
+    # The first hour slides out of the window; mentions older than the window are ignored.
+    counter.advance(3 * HOUR)
+    counter.add(10, "bitcoin", "carol")
+    assert [bucket.start for bucket in counter.buckets] == [HOUR, 2 * HOUR]
+    assert counter.mentions("bitcoin") == 2
+    assert counter.unique_authors("bitcoin") == 1
+    # Late data still inside the window lands in its own bucket.
+    counter.add(2 * HOUR + 1, "bitcoin")
+    assert counter.top(2) == [("bitcoin", 3), ("ethereum", 1)]
+
+    counter.advance(10 * HOUR)
+    assert not counter.buckets
+    assert counter.top() == [] and counter.unique_authors("bitcoin") == 0
+
+
+def test_merged_workers_match_a_single_counter():
+    settings = {"bucket_seconds": HOUR, "window_buckets": 4}
+    rng = np.random.default_rng(5)
+    events = [(int(t), key, f"user_{u}") for t, key, u in
+              zip(rng.integers(0, 6 * HOUR, size=4_000), zipf_stream(4_000, 40, seed=5), rng.integers(0, 300, size=4_000))]
+    single, first, second = (SlidingMentionCounter(settings) for _ in range(3))
+    for timestamp, key, author in sorted(events):
+        single.add(timestamp, key, author)
+    # Each worker sees half of the events, out of time order.
+    for i, (timestamp, key, author) in enumerate(events):
+        (first if i % 2 else second).add(timestamp, key, author)
+
+    first.merge(second)
+    assert [b.start for b in first.buckets] == [b.start for b in single.buckets]
+    assert first.top(10) == single.top(10)
+    for key in ("coin-0", "coin-1", "coin-39"):
+        assert first.mentions(key) == single.mentions(key)
+        assert first.unique_authors(key) == single.unique_authors(key)
+    with pytest.raises(ValueError):
+        first.merge(SlidingMentionCounter({"bucket_seconds": 60}))